@@ -2,6 +2,10 @@
 from app.agents.base_agent import BaseAgent, AgentRequest, AgentResponse, ConfidenceScore
 from app.core.api_clients import groq_client
 from app.core.streaming import streaming_service
+from app.core.forecast_cache import forecast_cache
+from app.core.fast_forecast import fast_forecast
+from app.core.reconciliation import reconcile, summing_matrix
+from app.core.seasonality import detect_seasonality
 from app.config import get_settings
 import pandas as pd
 import numpy as np
@@ -9,14 +13,250 @@ from prophet import Prophet
 from prophet.plot import plot_plotly
 import holidays
 import json
-from typing import Dict, List
+from collections import Counter
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
-import scipy.stats as stats
 from loguru import logger
 
 settings = get_settings()
 
 
+def _holiday_frame(start_date, end_date, context_locale: str = "US") -> pd.DataFrame:
+    """Create locale-aware holiday dataframe"""
+    try:
+        import holidays
+        try:
+            country_holidays = holidays.country_holidays(context_locale, years=range(start_date.year, end_date.year + 2))
+        except NotImplementedError:
+            # Fallback to US if context locale is not supported
+            country_holidays = holidays.country_holidays("US", years=range(start_date.year, end_date.year + 2))
+            
+        holiday_list = []
+        for date, name in country_holidays.items():
+            if start_date <= pd.Timestamp(date) <= end_date + pd.Timedelta(days=365):
+                holiday_list.append({
+                    'ds': pd.Timestamp(date),
+                    'holiday': name
+                })
+        return pd.DataFrame(holiday_list) if holiday_list else pd.DataFrame(columns=['ds', 'holiday'])
+    except ImportError:
+        return pd.DataFrame(columns=['ds', 'holiday'])
+
+
+LOCALE_NAMES = {"india": "IN", "uk": "UK", "united kingdom": "UK", "australia": "AU", "usa": "US", "united states": "US"}
+
+
+def _resolve_locale(df: pd.DataFrame, query: str = "") -> str:
+    """
+    Holiday locale for a forecast: named in the query, else the dataset's
+    most common country/locale value, else US. Upload-time pre-fitting has
+    no query, so it resolves the same locale as a plain request on the data.
+    """
+    query_lower = query.lower()
+    if "india" in query_lower or " in " in query_lower:
+        if "india" in query_lower: return "IN"
+        elif "uk" in query_lower: return "UK"
+        elif "australia" in query_lower: return "AU"
+    column = next((c for c in df.columns if c.lower() in ("country", "country_code", "locale")), None)
+    if column is not None and df[column].notna().any():
+        value = str(df[column].mode().iloc[0]).strip()
+        if value.lower() in LOCALE_NAMES:
+            return LOCALE_NAMES[value.lower()]
+        if len(value) == 2 and value.isalpha():
+            return value.upper()
+    return "US"
+
+
+def _weekly_pattern(forecast: pd.DataFrame) -> Dict:
+    """Extract weekly seasonality pattern"""
+    if 'weekly' in forecast.columns:
+        weekly = forecast['weekly'].values
+        return {
+            "pattern": "weekly",
+            "peak_day": int(np.argmax(weekly[:7])),
+            "low_day": int(np.argmin(weekly[:7])),
+            "average_effect": float(np.mean(np.abs(weekly)))
+        }
+    return {}
+
+
+def _yearly_pattern(forecast: pd.DataFrame) -> Dict:
+    """Extract yearly seasonality pattern"""
+    if 'yearly' in forecast.columns:
+        yearly = forecast['yearly'].values
+        return {
+            "pattern": "yearly",
+            "peak_month": int(np.argmax(yearly[:12]) + 1),
+            "low_month": int(np.argmin(yearly[:12]) + 1),
+            "average_effect": float(np.mean(np.abs(yearly)))
+        }
+    return {}
+
+
+def _choose_growth(prophet_df: pd.DataFrame) -> str:
+    """Decide growth model: if variance is low and data seems bounded, use logistic"""
+    cv = prophet_df['y'].std() / prophet_df['y'].mean() if prophet_df['y'].mean() > 0 else 1.0
+    return 'logistic' if cv < 0.3 and len(prophet_df) > 30 else 'linear'
+
+
+def _summarize_forecast(prophet_df: pd.DataFrame, forecast: pd.DataFrame, periods: int, growth: str) -> Dict:
+    """Per-series payload (predictions, seasonality, confidence, metrics) from a forecast frame"""
+    # Extract forecast data (only future periods)
+    future_forecast = forecast.tail(periods)
+    
+    # Format predictions for frontend
+    predictions = [
+        {
+            "date": ds.strftime('%Y-%m-%d'),
+            "value": float(yhat),
+            "lower": float(lower),
+            "upper": float(upper)
+        }
+        for ds, yhat, lower, upper in zip(
+            future_forecast['ds'], future_forecast['yhat'],
+            future_forecast['yhat_lower'], future_forecast['yhat_upper']
+        )
+    ]
+    
+    # Extract seasonality components
+    seasonality = {
+        "weekly": _weekly_pattern(forecast),
+        "yearly": _yearly_pattern(forecast)
+    }
+    
+    # Calculate metrics
+    # Use the AGGREGATED actuals vs predicted
+    historical_actual = prophet_df['y'].values
+    historical_predicted = forecast.head(len(prophet_df))['yhat'].values
+    
+    # Avoid division by zero
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mape = np.mean(np.abs((historical_actual - historical_predicted) / historical_actual)) * 100
+        if np.isnan(mape) or np.isinf(mape):
+            mape = 0.0
+    
+    return {
+        "predictions": predictions,
+        "seasonality": seasonality,
+        "confidence_score": float(1 - (mape / 100)) if mape < 100 else 0.0,
+        "metrics": {
+            "mape": float(mape),
+            "trend": "increasing" if predictions[-1]["value"] > predictions[0]["value"] else "decreasing",
+            "volatility": float(np.std([p["value"] for p in predictions])),
+            "growth": growth,
+            "model": "prophet"
+        }
+    }
+
+
+def _fit_prophet_worker(
+    prophet_df: pd.DataFrame,
+    periods: int,
+    seasonalities: Dict[str, bool],
+    locale: str = "US",
+    growth: Optional[str] = None,
+    serialize: bool = False
+) -> Dict:
+    """
+    Fit, predict and summarize one series, entirely inside a pool process.
+    
+    `prophet_df` has the aggregated 'ds' / 'y' history. Stan fitting and
+    pandas post-processing run outside the event loop's process, so series
+    fit in parallel instead of contending for one GIL. Returns the
+    per-series forecast payload; with `serialize`, the fitted model and
+    forecast frame are attached as JSON under "cache_entry" for
+    app.core.forecast_cache.
+    """
+    import logging
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    prophet_df = prophet_df.copy()
+    growth = growth or _choose_growth(prophet_df)
+    if growth == 'logistic':
+        prophet_df['cap'] = prophet_df['y'].max() * 1.5
+        prophet_df['floor'] = max(0, prophet_df['y'].min() * 0.5)
+        
+    model = Prophet(
+        growth=growth,
+        yearly_seasonality=seasonalities.get("yearly_seasonality", False),
+        weekly_seasonality=seasonalities.get("weekly_seasonality", False),
+        daily_seasonality=False,
+        holidays=_holiday_frame(prophet_df['ds'].min(), prophet_df['ds'].max(), locale),
+        interval_width=0.95
+    )
+    model.fit(prophet_df)
+    
+    # Create future dataframe
+    future = model.make_future_dataframe(periods=periods)
+    if growth == 'logistic':
+        future['cap'] = prophet_df['y'].max() * 1.5
+        future['floor'] = max(0, prophet_df['y'].min() * 0.5)
+    
+    # Generate forecast
+    forecast = model.predict(future)
+    result = _summarize_forecast(prophet_df, forecast, periods, growth)
+    if serialize:
+        from prophet.serialize import model_to_json
+        result["cache_entry"] = {
+            "model": model_to_json(model),
+            "forecast": forecast.to_json(orient="split", date_format="iso", double_precision=15),
+            "growth": growth
+        }
+    return result
+
+
+def _forecast_from_cache(prophet_df: pd.DataFrame, entry: Dict, periods: int) -> Dict:
+    """Rebuild a series payload from a cached forecast frame"""
+    import io
+    forecast = pd.read_json(io.StringIO(entry["forecast"]), orient="split")
+    forecast['ds'] = pd.to_datetime(forecast['ds']).dt.tz_localize(None)
+    return _summarize_forecast(prophet_df, forecast, periods, entry["growth"])
+
+
+def _is_daily(prophet_df: pd.DataFrame) -> bool:
+    """True when the history is one row per consecutive day (what the fast tier assumes)"""
+    steps = pd.to_datetime(prophet_df['ds']).diff().dropna()
+    return bool((steps == pd.Timedelta(days=1)).all())
+
+
+def _fast_summary(prophet_df: pd.DataFrame, fit: Dict, periods: int) -> Dict:
+    """Per-series payload, in _summarize_forecast's schema, from a fast_forecast result"""
+    dates = pd.date_range(pd.to_datetime(prophet_df['ds']).max() + timedelta(days=1), periods=periods)
+    predictions = [
+        {
+            "date": ds.strftime('%Y-%m-%d'),
+            "value": float(yhat),
+            "lower": float(lower),
+            "upper": float(upper)
+        }
+        for ds, yhat, lower, upper in zip(dates, fit["forecast"], fit["lower"], fit["upper"])
+    ]
+    
+    # Seasonal indices are phased from the first history day, like Prophet's weekly column
+    weekly = {}
+    if fit["season"] is not None:
+        weekly = {
+            "pattern": "weekly",
+            "peak_day": int(np.argmax(fit["season"])),
+            "low_day": int(np.argmin(fit["season"])),
+            "average_effect": float(np.mean(np.abs(fit["season"])))
+        }
+    
+    mape = fit["mape"]
+    return {
+        "predictions": predictions,
+        "seasonality": {"weekly": weekly, "yearly": {}},
+        "confidence_score": float(1 - (mape / 100)) if mape < 100 else 0.0,
+        "metrics": {
+            "mape": float(mape),
+            "trend": "increasing" if predictions[-1]["value"] > predictions[0]["value"] else "decreasing",
+            "volatility": float(np.std([p["value"] for p in predictions])),
+            "growth": "linear",
+            "model": fit["model"],
+            "backtest_mase": fit["backtest_mase"]
+        }
+    }
+
+
 class ForecasterAgent(BaseAgent):
     """
     Advanced forecasting using Facebook Prophet.
@@ -34,6 +274,22 @@ class ForecasterAgent(BaseAgent):
             model=settings.FORECASTER_MODEL,
             api_client=groq_client
         )
+        # Dedicated pool for Prophet fits, started on first use (see pool / shutdown)
+        self._pool = None
+    
+    @property
+    def pool(self):
+        """Process pool for Prophet fits; FORECAST_POOL_WORKERS None → one worker per core"""
+        if self._pool is None:
+            import concurrent.futures
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=settings.FORECAST_POOL_WORKERS)
+        return self._pool
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool's worker processes; a later forecast starts a fresh pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
     
     def get_system_prompt(self) -> str:
         """BUG-6 fix: Domain-specific system prompt for Forecaster."""
@@ -145,25 +401,49 @@ class ForecasterAgent(BaseAgent):
             # Prepare data for Prophet
             df[date_col] = pd.to_datetime(df[date_col])
             
-            # Generate forecasts for each numeric column
-            forecasts_data = {}
+            # Extract locale from the query or the dataset
+            locale = _resolve_locale(df, request.query)
             
-            # Extract locale from context or query
-            locale = "US"
-            query_lower = request.query.lower()
-            if "india" in query_lower or " in " in query_lower:
-                if "india" in query_lower: locale = "IN"
-                elif "uk" in query_lower: locale = "UK"
-                elif "australia" in query_lower: locale = "AU"
+            # Every requested series is fitted in the forecasting pool at once
+            max_columns = settings.FORECAST_MAX_COLUMNS
+            forecast_cols = value_cols if max_columns is None else value_cols[:max_columns]
+            series = {col: self._prepare_series(df, date_col, col) for col in forecast_cols}
             
-            for col in value_cols[:3]:  # Limit to 3 columns for performance
-                logger.info(f"Forecasting column: {col}")
-                forecast_result = await self._forecast_column(
-                    df, date_col, col, forecast_periods,
-                    session_id=request.session_id,
-                    locale=locale
+            # Optional per-SKU forecasts of the primary column: reconciled over the
+            # SKU → category → total hierarchy, or fitted as independent series
+            hierarchy = None
+            sku_col = None
+            if request.parameters.get("hierarchical"):
+                sku_col, category_col = self._detect_hierarchy_columns(df)
+                if sku_col:
+                    hierarchy = await self._forecast_hierarchy(
+                        df, date_col, forecast_cols[0], sku_col, category_col, forecast_periods,
+                        method=request.parameters.get("reconciliation", settings.FORECAST_RECONCILIATION)
+                    )
+            elif request.parameters.get("per_sku"):
+                sku_col = self._detect_sku_column(df)
+            if sku_col and not hierarchy:
+                for sku, sku_df in df.groupby(sku_col):
+                    series[(sku_col, sku)] = self._prepare_series(sku_df, date_col, forecast_cols[0])
+            
+            logger.info(f"Forecasting {len(series)} series: {len(forecast_cols)} columns" + (f", per {sku_col}" if sku_col else ""))
+            results = await self._forecast_series(
+                series, forecast_periods, session_id=request.session_id, locale=locale,
+                use_cache=request.parameters.get("use_cache", True),
+                tier=request.parameters.get("forecast_tier")
+            )
+            forecasts_data = {col: results[col] for col in forecast_cols if col in results}
+            sku_forecasts = hierarchy["skus"] if hierarchy else {
+                key[1]: result for key, result in results.items() if isinstance(key, tuple)
+            }
+            if not forecasts_data:
+                return AgentResponse(
+                    agent_name=self.name,
+                    success=False,
+                    error="Forecasting failed for every column"
                 )
-                forecasts_data[col] = forecast_result
+            
+            model_usage = dict(Counter(r["metrics"]["model"] for r in results.values()))
             
             # Get upstream TrendAnalyst findings for enriched interpretation
             trend_findings = await self.get_upstream_findings(
@@ -180,10 +460,22 @@ class ForecasterAgent(BaseAgent):
                 "forecast_periods": forecast_periods,
                 "forecasts": forecasts_data,
                 "interpretation": interpretation,
+                **({"sku_forecasts": {str(sku): data for sku, data in sku_forecasts.items()}} if sku_col else {}),
+                **({"hierarchy": {
+                    "method": hierarchy["method"],
+                    "category_column": hierarchy["category_column"],
+                    "base_incoherence": hierarchy["incoherence"],
+                    "total": hierarchy["total"],
+                    "categories": {str(c): data for c, data in hierarchy["categories"].items()}
+                }} if hierarchy else {}),
                 "metadata": {
                     "date_column": date_col,
-                    "forecasted_columns": value_cols[:3],
-                    "model": "Facebook Prophet",
+                    "forecasted_columns": list(forecasts_data),
+                    "sku_column": sku_col,
+                    "forecasted_skus": len(sku_forecasts),
+                    "reconciliation": hierarchy["method"] if hierarchy else None,
+                    "model": "Facebook Prophet" if set(model_usage) == {"prophet"} else "Holt-Winters / Facebook Prophet",
+                    "model_usage": model_usage,
                     "includes_holidays": True,
                     "generated_at": datetime.utcnow().isoformat(),
                     "enriched_with_trends": bool(trend_findings)
@@ -196,7 +488,8 @@ class ForecasterAgent(BaseAgent):
                 "confidence_scores": {},
                 "overall_trend": "stable"
             }
-            for col, data in forecasts_data.items():
+            # Per-SKU entries are keyed by SKU so the optimizer can scale each SKU's demand
+            for col, data in list(forecasts_data.items()) + list(sku_forecasts.items()):
                 preds = data.get("predictions", [])
                 if preds:
                     forecast_findings["predictions_summary"][col] = {
@@ -207,8 +500,17 @@ class ForecasterAgent(BaseAgent):
                 forecast_findings["confidence_scores"][col] = round(
                     data.get("confidence_score", 0), 2
                 )
-            # Determine overall trend
-            trends = [v.get("trend", "stable") for v in forecast_findings["predictions_summary"].values()]
+            # Full per-SKU prediction arrays, so the optimizer needs no rescaling heuristics
+            if sku_forecasts:
+                forecast_findings["sku_predictions"] = {
+                    str(sku): [round(p["value"], 4) for p in data["predictions"]]
+                    for sku, data in sku_forecasts.items()
+                }
+            # Determine overall trend from the column forecasts
+            trends = [
+                forecast_findings["predictions_summary"][col].get("trend", "stable")
+                for col in forecasts_data if col in forecast_findings["predictions_summary"]
+            ]
             if trends:
                 forecast_findings["overall_trend"] = max(set(trends), key=trends.count)
             
@@ -261,233 +563,247 @@ class ForecasterAgent(BaseAgent):
 
         return date_col, value_cols
     
-    async def _forecast_column(
-        self, 
-        df: pd.DataFrame, 
-        date_col: str, 
-        value_col: str, 
+    def _detect_sku_column(self, df: pd.DataFrame) -> Optional[str]:
+        """Detect column representing product, category, or SKU"""
+        sku_cols = ['product_category', 'product', 'sku', 'item', 'category', 'product_id']
+        for col in sku_cols:
+            matching = [c for c in df.columns if col.lower() in c.lower()]
+            if matching:
+                return matching[0]
+        return None
+    
+    def _detect_hierarchy_columns(self, df: pd.DataFrame) -> tuple:
+        """SKU column and, when every SKU sits in a single category, the category column above it"""
+        category_col = next((c for c in df.columns if 'category' in c.lower()), None)
+        sku_col = next(
+            (c for key in ['sku', 'product_id', 'item', 'product'] for c in df.columns
+             if key in c.lower() and c != category_col),
+            None
+        )
+        if sku_col is None:
+            return category_col, None  # Categories are the bottom level
+        if category_col and df.groupby(sku_col)[category_col].nunique().max() > 1:
+            category_col = None
+        return sku_col, category_col
+    
+    async def _forecast_hierarchy(
+        self,
+        df: pd.DataFrame,
+        date_col: str,
+        value_col: str,
+        sku_col: str,
+        category_col: Optional[str],
         periods: int,
-        session_id: str = None,
-        locale: str = "US"
-    ) -> Dict:
-        """Generate Prophet forecast for a single column with streaming progress"""
+        method: str = "mint_shrink"
+    ) -> Optional[Dict]:
+        """
+        Forecast every SKU, category total and the grand total, then reconcile.
+        
+        SKU histories are pivoted onto one daily index, so every node is
+        fitted by the fast tier in a single batch; its in-sample residuals
+        feed app.core.reconciliation. Bounds are shifted with their point
+        forecasts. Returns per-node payloads in the usual schema under
+        "total", "categories" and "skus", or None when the dates are not
+        consecutive days (weekly or irregular data would be zero-filled into
+        a daily series), so the caller forecasts each SKU on its own.
+        """
+        import asyncio
+        import functools
+        pivot = df.groupby([date_col, sku_col])[value_col].sum().unstack(fill_value=0.0).sort_index()
+        if not _is_daily(pd.DataFrame({'ds': pivot.index})):
+            logger.info(f"{date_col} is not daily; skipping reconciliation and forecasting each {sku_col} separately")
+            return None
+        skus = list(pivot.columns)
+        categories = None
+        if category_col:
+            sku_category = df.groupby(sku_col)[category_col].first()
+            categories = [sku_category[sku] for sku in skus]
+        S, labels = summing_matrix(categories, n_bottom=len(skus))
+        history = S @ pivot.to_numpy(dtype=float).T
         
-        # Notify start of forecasting
-        if session_id:
-            await streaming_service.publish_agent_progress(
-                session_id,
-                self.name,
-                10,
-                f"Preparing data for {value_col}",
-                {"column": value_col}
+        loop = asyncio.get_event_loop()
+        fits = await loop.run_in_executor(None, functools.partial(fast_forecast, list(history), periods))
+        base = np.vstack([fit["forecast"] for fit in fits])
+        reconciled = reconcile(base, S, method, residuals=np.vstack([fit["residuals"] for fit in fits]))
+        shift = reconciled["forecast"] - base
+        
+        payloads = [
+            _fast_summary(
+                pd.DataFrame({'ds': pivot.index, 'y': history[i]}),
+                {**fit, "forecast": reconciled["forecast"][i], "lower": fit["lower"] + shift[i], "upper": fit["upper"] + shift[i]},
+                periods
             )
-        
+            for i, fit in enumerate(fits)
+        ]
+        logger.info(
+            f"Reconciled {len(S)} hierarchy nodes ({len(skus)} {sku_col}, {len(labels)} categories) "
+            f"with {reconciled['method']}, base incoherence {reconciled['incoherence']:.2f}"
+        )
+        return {
+            "method": reconciled["method"],
+            "incoherence": reconciled["incoherence"],
+            "category_column": category_col,
+            "total": payloads[0],
+            "categories": dict(zip(labels, payloads[1:1 + len(labels)])),
+            "skus": dict(zip(skus, payloads[1 + len(labels):]))
+        }
+    
+    def _prepare_series(self, df: pd.DataFrame, date_col: str, value_col: str) -> pd.DataFrame:
+        """Aggregate one column into a Prophet 'ds' / 'y' frame"""
         # --- FIX: Aggregate duplicates (Sum values per day) ---
         # This handles the case where you have multiple products per date
         grouped_df = df.groupby(date_col)[value_col].sum().reset_index()
-        
-        # Prepare Prophet dataframe
         prophet_df = pd.DataFrame({
             'ds': grouped_df[date_col],
             'y': grouped_df[value_col]
         })
-        
         # Remove any NaN values
-        prophet_df = prophet_df.dropna()
-        
-        # Notify model training
-        if session_id:
-            await streaming_service.publish_agent_progress(
-                session_id,
-                self.name,
-                30,
-                f"Training Prophet model for {value_col}",
-                {"rows": len(prophet_df)}
-            )
-        
-        # Detect seasonality dynamically via FFT
-        seasonalities = self._detect_prophet_seasonality(prophet_df, 'y')
-        
-        # Decide growth model
-        # If variance is low and data seems bounded, use logistic
-        cv = prophet_df['y'].std() / prophet_df['y'].mean() if prophet_df['y'].mean() > 0 else 1.0
-        
-        # Fit model
+        return prophet_df.dropna()
+    
+    async def _forecast_series(
+        self,
+        series: Dict[Any, pd.DataFrame],
+        periods: int,
+        session_id: str = None,
+        locale: str = "US",
+        use_cache: bool = True,
+        tier: Optional[str] = None
+    ) -> Dict[Any, Dict]:
+        """
+        Forecast every series, statistical tier first, Prophet in the pool.
+        
+        Seasonality is classified for all series in one batched periodogram
+        (app.core.seasonality). With tier "auto", regular daily series
+        shorter than FORECAST_FAST_MAX_LENGTH without yearly seasonality are fitted
+        together by app.core.fast_forecast; a series keeps that result when
+        its backtest MASE is at most FORECAST_FAST_MAX_MASE and is escalated
+        to Prophet otherwise. "fast" keeps every fast result and "prophet"
+        skips the fast tier.
+        
+        For Prophet series, growth is decided up front and the series looked
+        up in forecast_cache first; a hit (e.g. from the upload-time pre-fit) is
+        rebuilt from the cached forecast frame without refitting. Misses are
+        submitted as one _fit_prophet_worker each and stored as they
+        complete, with progress streamed, so wall time scales with the pool
+        size rather than the number of series. A series whose fit fails is
+        logged and left out of the result.
+        """
         import asyncio
+        import functools
         loop = asyncio.get_event_loop()
+        tier = tier or settings.FORECAST_TIER
         
-        def _train_prophet():
-            growth = 'linear'
-            if cv < 0.3 and len(prophet_df) > 30:
-                growth = 'logistic'
-                prophet_df['cap'] = prophet_df['y'].max() * 1.5
-                prophet_df['floor'] = max(0, prophet_df['y'].min() * 0.5)
-                
-            model = Prophet(
-                growth=growth,
-                yearly_seasonality=seasonalities.get("yearly_seasonality", False),
-                weekly_seasonality=seasonalities.get("weekly_seasonality", False),
-                daily_seasonality=False,
-                holidays=self._create_holiday_df(prophet_df['ds'].min(), prophet_df['ds'].max(), locale),
-                interval_width=0.95
-            )
-            model.fit(prophet_df)
-            return model, growth
-            
-        model, growth_type = await loop.run_in_executor(None, _train_prophet)
-        
-        # Notify prediction
-        if session_id:
-            await streaming_service.publish_agent_progress(
-                session_id,
-                self.name,
-                70,
-                f"Generating {periods}-day forecast",
-                {"periods": periods}
-            )
-        
-        # Create future dataframe
-        future = model.make_future_dataframe(periods=periods)
-        if growth_type == 'logistic':
-            future['cap'] = prophet_df['y'].max() * 1.5
-            future['floor'] = max(0, prophet_df['y'].min() * 0.5)
-        
-        # Generate forecast
-        forecast = await loop.run_in_executor(None, model.predict, future)
-        
-        # Extract forecast data (only future periods)
-        future_forecast = forecast.tail(periods)
-        
-        # Format predictions for frontend
-        predictions = []
-        for _, row in future_forecast.iterrows():
-            predictions.append({
-                "date": row['ds'].strftime('%Y-%m-%d'),
-                "value": float(row['yhat']),
-                "lower": float(row['yhat_lower']),
-                "upper": float(row['yhat_upper'])
-            })
-        
-        # Extract seasonality components
-        seasonality = {
-            "weekly": self._extract_weekly_pattern(model, forecast),
-            "yearly": self._extract_yearly_pattern(model, forecast)
+        # One batched periodogram classifies every series
+        profiles = detect_seasonality([prophet_df['y'].to_numpy(dtype=float) for prophet_df in series.values()])
+        seasonalities = {
+            key: {flag: profile[flag] for flag in ("weekly_seasonality", "yearly_seasonality")}
+            for key, profile in zip(series, profiles)
         }
+        logger.info(
+            f"Seasonality across {len(series)} series: "
+            f"{sum(p['weekly_seasonality'] for p in profiles)} weekly, {sum(p['yearly_seasonality'] for p in profiles)} yearly"
+        )
         
-        # Calculate metrics
-        # Use the AGGREGATED actuals vs predicted
-        historical_actual = prophet_df['y'].values
-        historical_predicted = forecast.head(len(prophet_df))['yhat'].values
-        
-        # Avoid division by zero
-        with np.errstate(divide='ignore', invalid='ignore'):
-            mape = np.mean(np.abs((historical_actual - historical_predicted) / historical_actual)) * 100
-            if np.isnan(mape) or np.isinf(mape):
-                mape = 0.0
-                
-        # Notify completion
+        results = {}
+        if tier != "prophet":
+            candidates = [
+                key for key, prophet_df in series.items()
+                if len(prophet_df) >= 3 and (tier == "fast" or (
+                    len(prophet_df) < settings.FORECAST_FAST_MAX_LENGTH
+                    and not seasonalities[key]["yearly_seasonality"]
+                    and _is_daily(prophet_df)
+                ))
+            ]
+            if candidates:
+                fits = await loop.run_in_executor(None, functools.partial(
+                    fast_forecast, [series[key]['y'].to_numpy(dtype=float) for key in candidates], periods
+                ))
+                for key, fit in zip(candidates, fits):
+                    if tier == "fast" or fit["backtest_mase"] <= settings.FORECAST_FAST_MAX_MASE:
+                        results[key] = _fast_summary(series[key], fit, periods)
+                logger.info(f"Fast tier kept {len(results)}/{len(candidates)} series, escalating the rest to Prophet")
+        
+        to_fit = [key for key in series if key not in results]
         if session_id:
             await streaming_service.publish_agent_progress(
-                session_id,
-                self.name,
-                90,
-                f"Forecast complete for {value_col}",
-                {"confidence": float(1 - (mape / 100))}
+                session_id, self.name, 10, f"Training Prophet models for {len(to_fit)} of {len(series)} series",
+                {"series": len(series), "fast": len(results)}
             )
         
-        return {
-            "predictions": predictions,
-            "seasonality": seasonality,
-            "confidence_score": float(1 - (mape / 100)) if mape < 100 else 0.0,
-            "metrics": {
-                "mape": float(mape),
-                "trend": "increasing" if predictions[-1]["value"] > predictions[0]["value"] else "decreasing",
-                "volatility": float(np.std([p["value"] for p in predictions]))
-            }
-        }
-    
-    def _detect_prophet_seasonality(self, df: pd.DataFrame, value_col: str) -> Dict[str, bool]:
-        """Use FFT to autonomously detect if time-series has weekly or yearly cyclicality"""
-        seasonalities = {"weekly_seasonality": False, "yearly_seasonality": False}
-        series = df[value_col].values
-        if len(series) < 14:
-            return seasonalities
-            
-        # Detrend
-        x = np.arange(len(series))
-        slope, intercept, _, _, _ = stats.linregress(x, series)
-        detrended = series - (slope * x + intercept)
-        
-        # Compute FFT
-        fft_values = np.fft.fft(detrended)
-        frequencies = np.fft.fftfreq(len(series))
-        
-        pos_mask = frequencies > 0
-        freqs = frequencies[pos_mask]
-        magnitudes = np.abs(fft_values)[pos_mask]
-        
-        if len(freqs) == 0:
-            return seasonalities
-            
-        top_indices = np.argsort(magnitudes)[-3:]
-        top_freqs = freqs[top_indices]
+        futures = {}
+        cache_keys = {}
+        served = 0
+        for key in to_fit:
+            prophet_df = series[key]
+            label = key if not isinstance(key, tuple) else f"{key[0]}={key[1]}"
+            growth = _choose_growth(prophet_df)
+            if use_cache:
+                cache_keys[key] = forecast_cache.series_key(
+                    prophet_df, column=str(label), growth=growth, seasonalities=seasonalities[key],
+                    locale=locale, periods=periods
+                )
+                entry = await forecast_cache.get(cache_keys[key])
+                if entry is not None:
+                    try:
+                        results[key] = _forecast_from_cache(prophet_df, entry, periods)
+                        served += 1
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Cached forecast for {label} unusable, refitting: {e}")
+            future = loop.run_in_executor(
+                self.pool,
+                functools.partial(
+                    _fit_prophet_worker, prophet_df, periods, seasonalities[key], locale,
+                    growth=growth, serialize=use_cache
+                )
+            )
+            futures[future] = key
         
-        # Convert frequencies to periods (assuming daily data index)
-        top_periods = 1 / top_freqs
+        if served:
+            logger.info(f"Served {served}/{len(to_fit)} Prophet forecasts from the fitted-model cache")
         
-        for period in top_periods:
-            if 6.0 <= period <= 8.0:
-                seasonalities["weekly_seasonality"] = True
-            elif 350.0 <= period <= 380.0:
-                seasonalities["yearly_seasonality"] = True
-                
-        logger.info(f"Autonomously detected seasonalities: {seasonalities}")
-        return seasonalities
-
-    def _create_holiday_df(self, start_date, end_date, context_locale: str = "US") -> pd.DataFrame:
-        """Create locale-aware holiday dataframe"""
-        try:
-            import holidays
-            try:
-                country_holidays = holidays.country_holidays(context_locale, years=range(start_date.year, end_date.year + 2))
-            except NotImplementedError:
-                # Fallback to US if context locale is not supported
-                country_holidays = holidays.country_holidays("US", years=range(start_date.year, end_date.year + 2))
-                
-            holiday_list = []
-            for date, name in country_holidays.items():
-                if start_date <= pd.Timestamp(date) <= end_date + pd.Timedelta(days=365):
-                    holiday_list.append({
-                        'ds': pd.Timestamp(date),
-                        'holiday': name
-                    })
-            return pd.DataFrame(holiday_list) if holiday_list else pd.DataFrame(columns=['ds', 'holiday'])
-        except ImportError:
-            return pd.DataFrame(columns=['ds', 'holiday'])
-    
-    def _extract_weekly_pattern(self, model, forecast) -> Dict:
-        """Extract weekly seasonality pattern"""
-        if 'weekly' in forecast.columns:
-            weekly = forecast['weekly'].values
-            return {
-                "pattern": "weekly",
-                "peak_day": int(np.argmax(weekly[:7])),
-                "low_day": int(np.argmin(weekly[:7])),
-                "average_effect": float(np.mean(np.abs(weekly)))
-            }
-        return {}
+        pending = set(futures)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                key = futures[fut]
+                label = key if not isinstance(key, tuple) else f"{key[0]}={key[1]}"
+                try:
+                    results[key] = fut.result()
+                except Exception as e:
+                    logger.warning(f"Forecast failed for {label}: {e}")
+                    continue
+                entry = results[key].pop("cache_entry", None)
+                if entry is not None:
+                    await forecast_cache.put(cache_keys[key], entry)
+                if session_id:
+                    await streaming_service.publish_agent_progress(
+                        session_id, self.name, 10 + 80 * len(results) / len(series),
+                        f"Forecast complete for {label}",
+                        {"series": str(label), "confidence": results[key]["confidence_score"]}
+                    )
+        return results
     
-    def _extract_yearly_pattern(self, model, forecast) -> Dict:
-        """Extract yearly seasonality pattern"""
-        if 'yearly' in forecast.columns:
-            yearly = forecast['yearly'].values
-            return {
-                "pattern": "yearly",
-                "peak_month": int(np.argmax(yearly[:12]) + 1),
-                "low_month": int(np.argmin(yearly[:12]) + 1),
-                "average_effect": float(np.mean(np.abs(yearly)))
-            }
-        return {}
+    async def prefit(self, dataset: List[Dict], periods: int = 30, locale: Optional[str] = None) -> int:
+        """
+        Fit and cache the column forecasts a default request would make.
+        
+        Used by the upload-time background task: no interpretation or
+        findings, just warm forecast_cache entries for the workflow that
+        follows. The holiday locale (part of the cache key) defaults to the
+        dataset's, as process would resolve it. Returns the number of series
+        fitted or found cached.
+        """
+        df = pd.DataFrame(dataset)
+        date_col, value_cols = self._detect_columns(df)
+        if not date_col or not value_cols:
+            return 0
+        df[date_col] = pd.to_datetime(df[date_col])
+        max_columns = settings.FORECAST_MAX_COLUMNS
+        forecast_cols = value_cols if max_columns is None else value_cols[:max_columns]
+        series = {col: self._prepare_series(df, date_col, col) for col in forecast_cols}
+        results = await self._forecast_series(series, periods, locale=locale or _resolve_locale(df))
+        return len(results)
     
     async def _get_interpretation(self, forecasts_data: Dict, query: str, trend_findings: Dict = None) -> str:
         """Get LLM interpretation of forecast results, enriched with upstream trend data"""
@@ -2,14 +2,25 @@
 from app.agents.base_agent import BaseAgent, AgentRequest, AgentResponse, ConfidenceScore
 from app.core.api_clients import groq_client
 from app.core.streaming import streaming_service
+from app.core.inventory_sim import (
+    ArrivalPipeline, BatchRolloutEngine, EchelonSimulator, ScenarioBank,
+    evaluate_policy, evaluate_joint_policy, evaluate_independent_policies, summarize_costs
+)
+from app.core.mcts_tree import TreeStore, TranspositionTable, ROOT, root_stats, merge_root_stats, seed_root
+from app.core.shared_demand import SharedDemandMatrix, resolve_demand
+from app.core.optimizer_cache import optimizer_cache
+from app.core.cooccurrence import mine_associations
+from app.core.policy_presolver import presolve, presolve_catalog
+from app.core.policy_search import cross_entropy_search, batched_cross_entropy_search
 from app.config import get_settings
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import math
 import json
 import itertools
+import time
 from loguru import logger
 
 settings = get_settings()
@@ -21,27 +32,34 @@ class InventoryState:
     current_stock: float
     day: int
     total_cost: float = 0.0
-    pending_orders: List[tuple] = None  # [(arrival_day, qty)]
+    pipeline: ArrivalPipeline = None  # In-transit orders, ring-indexed by arrival day
     
     def __post_init__(self):
-        if self.pending_orders is None:
-            self.pending_orders = []
+        if self.pipeline is None:
+            self.pipeline = ArrivalPipeline()
 
     def is_terminal(self, horizon: int) -> bool:
         """Check if we've reached the planning horizon"""
         return self.day >= horizon
     
-    def transition(self, order_qty: float, demand: float, holding_cost: float, stockout_cost: float) -> 'InventoryState':
+    def transition(
+        self,
+        order_qty: float,
+        demand: float,
+        holding_cost: float,
+        stockout_cost: float,
+        lead_time: Optional[int] = None
+    ) -> 'InventoryState':
         """Simulate one day transition with stochastic lead times"""
-        # Determine lead time (e.g., 0 to 3 days uniformly)
-        lead_time = int(np.random.randint(0, 4))
-        new_pending = list(self.pending_orders)
+        # Determine lead time (e.g., 0 to 3 days uniformly) unless a scenario supplies it
+        if lead_time is None:
+            lead_time = int(np.random.randint(0, 4))
+        new_pipeline = self.pipeline.copy()
         if order_qty > 0:
-            new_pending.append((self.day + lead_time, order_qty))
+            new_pipeline.schedule(self.day, lead_time, order_qty)
             
         # Receive arrived orders today
-        arrived_this_day = sum(qty for arr_day, qty in new_pending if arr_day <= self.day)
-        new_pending = [(arr_day, qty) for arr_day, qty in new_pending if arr_day > self.day]
+        arrived_this_day = new_pipeline.receive(self.day)
         
         new_stock = self.current_stock + arrived_this_day
         
@@ -58,56 +76,40 @@ class InventoryState:
             current_stock=ending_stock,
             day=self.day + 1,
             total_cost=self.total_cost + day_holding_cost + day_stockout_cost,
-            pending_orders=new_pending
+            pipeline=new_pipeline
         )
 
 
-class MCTSNode:
-    """Node in Monte Carlo Tree Search for single SKU"""
-    
-    def __init__(self, state: InventoryState, parent: Optional['MCTSNode'] = None, action: float = 0, untried_actions: List[float] = None):
-        self.state = state
-        self.parent = parent
-        self.action = action  # Order quantity to get here
-        self.children: List['MCTSNode'] = []
-        self.visits = 0
-        self.total_reward = 0.0
-        self.untried_actions = untried_actions if untried_actions is not None else []
-    
-    def is_fully_expanded(self) -> bool:
-        return len(self.untried_actions) == 0
-    
-    def best_child(self) -> 'MCTSNode':
-        """Select child using UCB1 formula with dynamic variance exploration"""
-        if not self.children:
-            return self 
-            
-        rewards = [c.total_reward / c.visits for c in self.children if c.visits > 0]
-        variance = np.var(rewards) if len(rewards) > 1 else 0
-        exploration_weight = 1.0 + (variance * 2.0)
-            
-        return max(
-            self.children,
-            key=lambda c: (c.total_reward / c.visits) + 
-                          exploration_weight * math.sqrt(math.log(self.visits) / c.visits)
-        )
-    
-    def add_child(self, action: float, state: InventoryState, action_space: List[float]) -> 'MCTSNode':
-        """Expand tree with new action"""
-        child = MCTSNode(state, parent=self, action=action, untried_actions=list(action_space))
-        self.untried_actions.remove(action)
-        self.children.append(child)
-        return child
-    
-    def update(self, reward: float):
-        """Backpropagate reward"""
-        self.visits += 1
-        self.total_reward += reward
-
-
-def _sample_demand(demand_history: np.ndarray) -> float:
-    """Sample from historical demand"""
-    return float(np.random.choice(demand_history))
+def _report_progress(
+    channel: Any,
+    search_id: int,
+    tree: TreeStore,
+    action_table: List,
+    explored_states: int,
+    start_time: float,
+    best_action: Any = None
+) -> None:
+    """
+    Push the search's current best root action and visit distribution to a
+    progress channel (any object with put_nowait, e.g. a Manager queue).
+    `best_action` overrides the most-visited root action (factored searches).
+    """
+    stats = root_stats(tree, action_table)
+    best = int(np.argmax(stats["visits"])) if stats["visits"] else None
+    try:
+        channel.put_nowait({
+            "search": search_id,
+            "iterations": int(tree.visits[ROOT]),
+            "best_action": best_action if best_action is not None else (
+                stats["actions"][best] if best is not None else None
+            ),
+            "root_visits": {"actions": stats["actions"], "visits": stats["visits"]},
+            "explored_states": explored_states,
+            "elapsed_ms": (time.time() - start_time) * 1000
+        })
+    except Exception as e:
+        # Progress is best-effort; never let a full or closed channel stop the search
+        logger.debug(f"Dropped MCTS progress update: {e}")
 
 
 def _mcts_worker(
@@ -117,95 +119,290 @@ def _mcts_worker(
     stockout_cost: float,
     horizon: int,
     iterations: int,
-    seed: int = 42
+    seed: int = 42,
+    rollout_batch_size: int = 64,
+    n_scenarios: int = 256,
+    scenario_seed: int = 42,
+    time_budget_s: float = 4.5,
+    progress: Any = None,
+    progress_every: int = 200,
+    search_id: int = 0,
+    transposition_entries: int = 0,
+    transposition_quantum: Optional[float] = None,
+    warm_start: Optional[Dict[str, list]] = None,
+    rollout_depth: int = 0
 ) -> Dict:
-    """Top-level function for running single SKU MCTS off the main event loop."""
+    """
+    Top-level function for running single SKU MCTS off the main event loop.
+
+    Leaves are collected in batches of `rollout_batch_size` and their rollouts
+    are simulated together by BatchRolloutEngine. Visits are counted when a
+    leaf is selected (virtual loss), so the rest of the batch spreads out over
+    other branches; rewards are added once the batch has been simulated.
+
+    Each descent follows one scenario of a ScenarioBank built from
+    `scenario_seed`, from the tree policy through its rollout. The bank is a
+    pure function of the history and seed, so every root-parallel search and
+    the policy evaluation in the agent see the same demand paths; `seed`
+    only drives scenario assignment and exploration.
+
+    The search is anytime: it stops at `time_budget_s`, at `iterations * 2`
+    root visits or on convergence, whichever comes first. With a `progress`
+    channel it reports the current best action every `progress_every` root
+    visits.
+
+    With `transposition_entries` > 0, selection merges child statistics from
+    a TranspositionTable keyed by the realized state, quantized to buckets of
+    `transposition_quantum` units (default: a tenth of mean demand).
+
+    `warm_start` (root statistics of an earlier search on the same data)
+    seeds the root with up to `iterations // 2` prior visits.
+
+    Candidate order quantities come from the closed-form pre-solver: 0 plus
+    ten values centred on its (s, Q) order quantity and narrowed by demand
+    spread, instead of a fixed 0..3 × mean demand grid. The reorder point
+    and safety stock are reported from the same solution.
+
+    With `rollout_depth` K > 0, rollouts stop K days past the leaf and the
+    rest of the horizon is valued by the pre-solver's base-stock cost-to-go,
+    so long horizons cost no more per iteration than K-day ones.
+    """
     import time
     start_time = time.time()
     np.random.seed(seed)
+    demand_history = resolve_demand(demand_history)
     
     mean_demand = float(np.mean(demand_history))
-    std_demand = float(np.std(demand_history))
+    policy = presolve(demand_history, holding_cost, stockout_cost)
     
-    # Base continuous space bounds
-    max_action = mean_demand * 3
-    action_space = [0.0] + list(np.linspace(0.1, max_action, 10))
-    action_space = sorted(list(set([float(a) for a in action_space])))
+    # Candidate actions centred on the pre-solved order quantity; widening samples up to the top one
+    action_space = sorted(set(float(a) for a in policy.candidate_actions()[0]))
+    max_action = action_space[-1]
     
     max_penalty = stockout_cost * (mean_demand * 2) * horizon
     if max_penalty == 0: max_penalty = 1.0
     
-    root_state = InventoryState(current_stock=current_stock, day=0, pending_orders=[])
-    root = MCTSNode(root_state, untried_actions=list(action_space))
+    rng = np.random.default_rng(seed)
+    bank = ScenarioBank.for_single_sku(demand_history, horizon, n_scenarios, scenario_seed)
+    bank_demand = bank.demand()
+    bank_lead = bank.lead_times()
+    engine = BatchRolloutEngine(
+        demand_history, holding_cost, stockout_cost, horizon,
+        action_space, max_action, rng=rng, bank=bank,
+        rollout_depth=rollout_depth, leaf_value=policy.cost_to_go if rollout_depth > 0 else None
+    )
+    table = None
+    if transposition_entries > 0:
+        table = TranspositionTable(
+            transposition_entries, transposition_quantum or max(mean_demand / 10, 1.0)
+        )
+    
+    # Widened actions are appended to the table; the tree stores indices into it
+    action_table = list(action_space)
+    tree = TreeStore(n_base_actions=len(action_space))
+    warm_visits = seed_root(tree, action_table, warm_start, iterations // 2)
     explored_states = 0
-    max_time_budget = 4.5 # seconds max computation time
+    rollouts = 0
+    next_report = progress_every
+    convergence_reason = "confidence_threshold"
     
     while True:
         elapsed = time.time() - start_time
-        if elapsed > max_time_budget or root.visits >= iterations * 2:
+        if elapsed > time_budget_s:
+            convergence_reason = "time_budget"
+            break
+        if tree.visits[ROOT] >= iterations * 2:
+            convergence_reason = "iteration_budget"
             break
             
         # Confidence-based Convergence check
-        if len(root.children) >= 2 and root.visits > 100:
-            best_2 = sorted(root.children, key=lambda c: c.visits, reverse=True)[:2]
-            v1, v2 = best_2[0].visits, best_2[1].visits
+        root_children = tree.children(ROOT)
+        if len(root_children) >= 2 and tree.visits[ROOT] > 100:
+            v1, v2 = np.sort(tree.visits[root_children])[::-1][:2]
             if v1 > 0 and v2 > 0 and (v1 - v2) / v1 > 0.3:
                 break
-                
-        node = root
-        state = InventoryState(current_stock=current_stock, day=0, pending_orders=[])
         
-        while node.is_fully_expanded() and not state.is_terminal(horizon):
-            if not node.children: break
+        batch = int(min(rollout_batch_size, iterations * 2 - tree.visits[ROOT]))
+        paths = []
+        batch_steps = []
+        stocks, pipelines, days, costs = engine.empty_state(batch)
+        scenarios = rng.integers(0, bank.n_scenarios, size=batch)
+        
+        for i in range(batch):
+            node = ROOT
+            path = [ROOT]
+            widened = None
+            state = InventoryState(current_stock=current_stock, day=0)
+            demand_path = bank_demand[scenarios[i]]
+            lead_path = bank_lead[scenarios[i]]
+            steps = []
             
-            # Progressive Widening
-            if node.visits > 5 * math.pow(len(node.children), 1.5):
-                new_action = float(np.random.uniform(0.1, max_action))
-                node.untried_actions.append(new_action)
-                break
+            while tree.is_fully_expanded(node) and not state.is_terminal(horizon):
+                if tree.n_children[node] == 0: break
                 
-            node = node.best_child()
-            demand = _sample_demand(demand_history)
-            state = state.transition(node.action, demand, holding_cost, stockout_cost)
-        
-        if not state.is_terminal(horizon) and not node.is_fully_expanded():
-            action = node.untried_actions[0]
-            demand = _sample_demand(demand_history)
-            new_state = state.transition(action, demand, holding_cost, stockout_cost)
-            node = node.add_child(action, new_state, action_space)
-            state = new_state
-            explored_states += 1
+                # Progressive Widening
+                if tree.visits[node] > 5 * math.pow(tree.n_children[node], 1.5):
+                    action_table.append(float(np.random.uniform(0.1, max_action)))
+                    widened = len(action_table) - 1
+                    break
+                    
+                if table is not None:
+                    key = table.state_key(state.day, state.current_stock, state.pipeline.slots)
+                    kids = tree.children(node)
+                    visits, rewards = table.lookup(
+                        key, tree.action[kids], tree.visits[kids], tree.total_reward[kids]
+                    )
+                    node = tree.best_child(node, kids, visits, rewards)
+                    steps.append((key, int(tree.action[node])))
+                else:
+                    node = tree.best_child(node)
+                path.append(node)
+                state = state.transition(
+                    action_table[tree.action[node]], demand_path.item(state.day),
+                    holding_cost, stockout_cost, lead_path.item(state.day)
+                )
             
-        sim_state = InventoryState(state.current_stock, state.day, state.total_cost, list(state.pending_orders))
-        while not sim_state.is_terminal(horizon):
-            if np.random.random() < 0.5:
-                action = np.random.choice(action_space)
-            else:
-                action = float(np.random.uniform(0.0, max_action))
-            demand = _sample_demand(demand_history)
-            sim_state = sim_state.transition(action, demand, holding_cost, stockout_cost)
+            if not state.is_terminal(horizon) and (widened is not None or not tree.is_fully_expanded(node)):
+                action = widened if widened is not None else tree.next_untried_action(node)
+                if table is not None:
+                    steps.append((table.state_key(state.day, state.current_stock, state.pipeline.slots), action))
+                state = state.transition(
+                    action_table[action], demand_path.item(state.day),
+                    holding_cost, stockout_cost, lead_path.item(state.day)
+                )
+                node = tree.add_child(node, action)
+                path.append(node)
+                explored_states += 1
             
-        normalized_reward = 1.0 - (min(sim_state.total_cost, max_penalty) / max_penalty)
+            # Virtual loss: count the visit now, credit the reward after the batch
+            tree.add_visits(path)
+            paths.append(path)
+            batch_steps.append(steps)
+            stocks[i] = state.current_stock
+            pipelines[i] = state.pipeline.slots
+            days[i] = state.day
+            costs[i] = state.total_cost
+        
+        total_costs = engine.rollout(stocks, pipelines, days, costs, scenarios)
+        rewards = 1.0 - (np.minimum(total_costs, max_penalty) / max_penalty)
+        tree.backpropagate(paths, rewards, count_visits=False)
+        if table is not None:
+            for steps, reward in zip(batch_steps, rewards.tolist()):
+                table.update(steps, reward)
+        rollouts += batch
         
-        while node is not None:
-            node.update(normalized_reward)
-            node = node.parent
+        if progress is not None and tree.visits[ROOT] >= next_report:
+            _report_progress(progress, search_id, tree, action_table, explored_states, start_time)
+            next_report = int(tree.visits[ROOT]) + progress_every
             
-    if not root.children:
-         return {"reorder_point": 0, "order_quantity": 0, "safety_stock": 0, "expected_cost": 0, "explored_states": 0, "computation_time_ms": 0}
+    best_child = tree.most_visited_child(ROOT)
+    if best_child == -1:
+         return {"reorder_point": 0, "order_quantity": 0, "safety_stock": 0, "expected_cost": 0, "explored_states": 0, "computation_time_ms": 0,
+                 "root_stats": root_stats(tree, action_table), "max_penalty": max_penalty}
 
-    best_child = max(root.children, key=lambda c: c.visits)
     computation_time = (time.time() - start_time) * 1000
-    expected_cost = (1.0 - (best_child.total_reward / best_child.visits)) * max_penalty
+    expected_cost = (1.0 - (tree.total_reward[best_child] / tree.visits[best_child])) * max_penalty
 
     return {
-        "reorder_point": mean_demand * 1.5,
-        "order_quantity": best_child.action,
-        "safety_stock": std_demand * 1.65,
-        "expected_cost": expected_cost,
+        "reorder_point": float(policy.reorder_point[0]),
+        "order_quantity": float(action_table[tree.action[best_child]]),
+        "safety_stock": float(policy.safety_stock[0]),
+        "expected_cost": float(expected_cost),
         "explored_states": explored_states,
+        "rollouts": rollouts,
+        "tree_nodes": len(tree),
         "computation_time_ms": computation_time,
-        "convergence_reason": "confidence_threshold" if elapsed <= max_time_budget else "time_budget"
+        "convergence_reason": convergence_reason,
+        "root_stats": root_stats(tree, action_table),
+        "max_penalty": max_penalty,
+        "transpositions": table.stats() if table is not None else None,
+        "warm_start_visits": warm_visits
+    }
+
+
+def _merge_root_parallel(results: List[Dict]) -> Dict:
+    """Combine independent single-SKU searches (root parallelization) into one solution."""
+    merged = merge_root_stats([r["root_stats"] for r in results])
+    if merged["best_action"] is None:
+        return results[0]
+    
+    best = merged["actions"].index(merged["best_action"])
+    expected_cost = (1.0 - merged["total_reward"][best] / merged["visits"][best]) * results[0]["max_penalty"]
+    
+    solution = dict(results[0])
+    solution.update({
+        "order_quantity": float(merged["best_action"]),
+        "expected_cost": float(expected_cost),
+        "explored_states": sum(r.get("explored_states", 0) for r in results),
+        "rollouts": sum(r.get("rollouts", 0) for r in results),
+        "tree_nodes": sum(r.get("tree_nodes", 0) for r in results),
+        "computation_time_ms": max(r.get("computation_time_ms", 0) for r in results),
+        "parallel_searches": len(results),
+        "search_agreement": float(merged["agreement"]),
+        "root_stats": {k: merged[k] for k in ("actions", "visits", "total_reward")}
+    })
+    return solution
+
+
+def _cem_worker(
+    current_stock: float,
+    demand_history: np.ndarray,
+    holding_cost: float,
+    stockout_cost: float,
+    horizon: int,
+    seed: int = 42,
+    n_scenarios: int = 256,
+    scenario_seed: int = 42,
+    time_budget_s: float = 4.5,
+    population: int = 64,
+    max_generations: int = 30,
+    bank: Optional[ScenarioBank] = None
+) -> Dict:
+    """
+    Cross-entropy search over the single-SKU (s, Q) policy.
+
+    Alternative engine to _mcts_worker with the same output schema. The
+    search starts from the pre-solved policy and scores each generation's
+    whole population with one batched evaluate_policy call on the same
+    ScenarioBank the MCTS would use. `explored_states` counts candidate
+    policies and `rollouts` the simulated trajectories. A prebuilt `bank`
+    covering at least `horizon` days replaces the one built from the seed.
+    """
+    demand_history = resolve_demand(demand_history)
+    policy = presolve(demand_history, holding_cost, stockout_cost)
+    if bank is None:
+        bank = ScenarioBank.for_single_sku(demand_history, horizon, n_scenarios, scenario_seed)
+    
+    def objective(params: np.ndarray) -> np.ndarray:
+        return evaluate_policy(
+            bank, current_stock, holding_cost, stockout_cost, horizon, params[:, 0], params[:, 1]
+        ).mean(axis=1)
+    
+    mean_demand = max(float(policy.mean_demand[0]), 1.0)
+    s0, q0 = float(policy.reorder_point[0]), float(policy.order_quantity[0])
+    result = cross_entropy_search(
+        objective,
+        mean=[s0, q0],
+        std=[0.5 * max(s0, mean_demand), 0.5 * max(q0, mean_demand)],
+        lower=[0.0, 0.0],
+        upper=[3.0 * max(float(policy.base_stock[0]), mean_demand), 3.0 * max(q0, mean_demand)],
+        population=population,
+        max_generations=max_generations,
+        time_budget_s=time_budget_s,
+        rng=np.random.default_rng(seed)
+    )
+    reorder_point, order_quantity = (float(x) for x in result["params"])
+    return {
+        "reorder_point": reorder_point,
+        "order_quantity": order_quantity,
+        "safety_stock": max(reorder_point - float(policy.lead_demand[0]), 0.0),
+        "expected_cost": result["cost"],
+        "explored_states": result["evaluations"],
+        "rollouts": result["evaluations"] * bank.n_scenarios,
+        "computation_time_ms": result["computation_time_ms"],
+        "convergence_reason": result["convergence_reason"],
+        "generations": result["generations"],
+        "engine": "cem"
     }
 
 
@@ -219,11 +416,11 @@ class MultiInventoryState:
     sku_stocks: Dict[str, float]
     day: int
     total_cost: float = 0.0
-    pending_orders: Dict[str, List[tuple]] = None  # {sku: [(arrival_day, qty)]}
+    pipeline: ArrivalPipeline = None  # One column per SKU, in sku_stocks order
     
     def __post_init__(self):
-        if self.pending_orders is None:
-            self.pending_orders = {sku: [] for sku in self.sku_stocks.keys()}
+        if self.pipeline is None:
+            self.pipeline = ArrivalPipeline(n_items=len(self.sku_stocks))
 
     def is_terminal(self, horizon: int) -> bool:
         return self.day >= horizon
@@ -233,31 +430,30 @@ class MultiInventoryState:
         order_qtys: Dict[str, float],
         demands: Dict[str, float],
         holding_costs: Dict[str, float],
-        stockout_costs: Dict[str, float]
+        stockout_costs: Dict[str, float],
+        lead_time: Optional[int] = None
     ) -> 'MultiInventoryState':
         """Simulate one day transition for all SKUs in the group. Joint lead time."""
-        # Simulated joint lead time (ordered together)
-        lead_time = int(np.random.randint(1, 4))
+        # Simulated joint lead time (ordered together) unless a scenario supplies it
+        if lead_time is None:
+            lead_time = int(np.random.randint(1, 4))
         
-        new_pending = {sku: list(orders) for sku, orders in self.pending_orders.items()}
+        skus = list(self.sku_stocks.keys())
+        new_pipeline = self.pipeline.copy()
         
         # Place orders if positive
-        for sku, qty in order_qtys.items():
-            if qty > 0:
-                if sku not in new_pending:
-                    new_pending[sku] = []
-                new_pending[sku].append((self.day + lead_time, qty))
-                
+        qtys = [max(0.0, order_qtys.get(sku, 0.0)) for sku in skus]
+        if any(qtys):
+            new_pipeline.schedule(self.day, lead_time, qtys)
+            
         # Transition daily
+        arrived_today = new_pipeline.receive(self.day).tolist()
         new_stocks = {}
         day_holding_cost = 0.0
         day_stockout_cost = 0.0
         
-        for sku in self.sku_stocks.keys():
-            arrived_today = sum(qty for arr_day, qty in new_pending.get(sku, []) if arr_day <= self.day)
-            new_pending[sku] = [(arr_day, qty) for arr_day, qty in new_pending.get(sku, []) if arr_day > self.day]
-            
-            sku_stock = self.sku_stocks[sku] + arrived_today
+        for sku, arrived in zip(skus, arrived_today):
+            sku_stock = self.sku_stocks[sku] + arrived
             sku_demand = demands.get(sku, 0.0)
             
             fulfilled = min(sku_demand, sku_stock)
@@ -273,52 +469,8 @@ class MultiInventoryState:
             sku_stocks=new_stocks,
             day=self.day + 1,
             total_cost=self.total_cost + day_holding_cost + day_stockout_cost,
-            pending_orders=new_pending
-        )
-
-
-class MultiMCTSNode:
-    """Node in Multi-SKU Monte Carlo Tree Search"""
-    
-    def __init__(self, state: MultiInventoryState, parent: Optional['MultiMCTSNode'] = None, action: Dict[str, float] = None, untried_actions: List[Dict[str, float]] = None):
-        self.state = state
-        self.parent = parent
-        self.action = action if action is not None else {}  # Order quantities to get here
-        self.children: List['MultiMCTSNode'] = []
-        self.visits = 0
-        self.total_reward = 0.0
-        self.untried_actions = untried_actions if untried_actions is not None else []
-    
-    def is_fully_expanded(self) -> bool:
-        return len(self.untried_actions) == 0
-    
-    def best_child(self) -> 'MultiMCTSNode':
-        if not self.children:
-            return self
-            
-        rewards = [c.total_reward / c.visits for c in self.children if c.visits > 0]
-        variance = np.var(rewards) if len(rewards) > 1 else 0
-        exploration_weight = 1.0 + (variance * 2.0)
-            
-        return max(
-            self.children,
-            key=lambda c: (c.total_reward / c.visits) + 
-                          exploration_weight * math.sqrt(math.log(self.visits) / c.visits)
+            pipeline=new_pipeline
         )
-    
-    def add_child(self, action: Dict[str, float], state: MultiInventoryState, action_space: List[Dict[str, float]]) -> 'MultiMCTSNode':
-        child = MultiMCTSNode(state, parent=self, action=action, untried_actions=list(action_space))
-        # Remove matched action from list
-        for a in list(self.untried_actions):
-            if a == action:
-                self.untried_actions.remove(a)
-                break
-        self.children.append(child)
-        return child
-    
-    def update(self, reward: float):
-        self.visits += 1
-        self.total_reward += reward
 
 
 def _multi_sku_mcts_worker(
@@ -328,11 +480,31 @@ def _multi_sku_mcts_worker(
     stockout_costs: Dict[str, float],
     horizon: int,
     iterations: int,
-    seed: int = 42
+    seed: int = 42,
+    bank: Optional[ScenarioBank] = None,
+    time_budget_s: float = 4.5,
+    progress: Any = None,
+    progress_every: int = 200,
+    search_id: int = 0,
+    rollout_depth: int = 0
 ) -> Dict:
-    """Top-level worker for Multi-SKU MCTS."""
+    """
+    Top-level worker for Multi-SKU MCTS.
+
+    The joint order is factored into per-SKU sub-actions chosen sequentially:
+    tree level d decides SKU d % k of a k-SKU group, and the day advances once
+    all k sub-actions are chosen. Every node has the same three base actions
+    (order 0, 1 or 2 × the SKU's pre-solved order quantity) plus progressively
+    widened multipliers, so memory and time grow linearly with group size
+    instead of with the 3^k joint product.
+
+    Each iteration follows one scenario of `bank` (built from the histories
+    when not supplied); the group's joint lead time is read from its first
+    SKU's lead-time matrix. Budget, progress reporting and `rollout_depth`
+    truncation (valued by the summed per-SKU base-stock cost-to-go) work as
+    in _mcts_worker.
+    """
     import time
-    import itertools
     import numpy as np
     import math
     
@@ -340,101 +512,147 @@ def _multi_sku_mcts_worker(
     np.random.seed(seed)
     
     sku_list = list(sku_demands.keys())
+    k = len(sku_list)
+    if bank is None:
+        bank = ScenarioBank(sku_demands, horizon, seed=seed)
+    bank_demands = [bank.demand(sku) for sku in sku_list]
+    bank_lead = bank.lead_times(sku_list[0], 1, 3)
     
-    # Generate discrete candidates for each SKU
-    sku_candidates = {}
-    total_mean_demand = 0.0
-    for sku in sku_list:
-        mean_d = float(np.mean(sku_demands[sku]))
-        total_mean_demand += mean_d
-        sku_candidates[sku] = [0.0, mean_d, mean_d * 2.0]
-        
-    keys = list(sku_candidates.keys())
-    vals = list(sku_candidates.values())
-    combinations = list(itertools.product(*vals))
+    def scenario_step(s: int, day: int):
+        return {sku: m.item(s, day) for sku, m in zip(sku_list, bank_demands)}, bank_lead.item(s, day)
     
-    action_space = []
-    for combo in combinations:
-        action = {keys[i]: float(combo[i]) for i in range(len(keys))}
-        action_space.append(action)
-        
-    # Limit action space combinations to keep tree size reasonable
-    action_space = action_space[:50]
+    mean_demands = [float(np.mean(sku_demands[sku])) for sku in sku_list]
+    total_mean_demand = sum(mean_demands)
+    policy = presolve_catalog(
+        [sku_demands[sku] for sku in sku_list],
+        [holding_costs[sku] for sku in sku_list],
+        [stockout_costs[sku] for sku in sku_list],
+        lead_low=1, lead_high=3
+    )
+    order_units = policy.order_quantity.tolist()
+    
+    def joint_order(multipliers: List[float]) -> Dict[str, float]:
+        return {sku: m * unit for sku, m, unit in zip(sku_list, multipliers, order_units)}
+    
+    # Sub-actions are multipliers of the deciding SKU's pre-solved order quantity; widened ones are appended
+    base_multipliers = [0.0, 1.0, 2.0]
+    action_table = list(base_multipliers)
     
     total_stockout_cost = sum(stockout_costs.values())
     max_penalty = total_stockout_cost * (total_mean_demand * 2) * horizon
     if max_penalty == 0: max_penalty = 1.0
     
-    root_state = MultiInventoryState(sku_stocks=sku_stocks, day=0, pending_orders={sku: [] for sku in sku_list})
-    root = MultiMCTSNode(root_state, untried_actions=list(action_space))
+    tree = TreeStore(n_base_actions=len(base_multipliers))
     explored_states = 0
-    max_time_budget = 4.5
+    next_report = progress_every
+    convergence_reason = "confidence_threshold"
+    
+    def principal_variation() -> List[int]:
+        """Most-visited path through the first day's k sub-decisions."""
+        nodes = []
+        node = ROOT
+        for _ in range(k):
+            node = tree.most_visited_child(node)
+            if node == -1:
+                break
+            nodes.append(node)
+        return nodes
+    
+    def best_joint_action(nodes: List[int]) -> Dict[str, float]:
+        multipliers = [action_table[tree.action[n]] for n in nodes]
+        multipliers += [1.0] * (k - len(multipliers))  # undecided SKUs order their pre-solved quantity
+        return joint_order(multipliers)
     
     while True:
         elapsed = time.time() - start_time
-        if elapsed > max_time_budget or root.visits >= iterations * 2:
+        if elapsed > time_budget_s:
+            convergence_reason = "time_budget"
+            break
+        if tree.visits[ROOT] >= iterations * 2:
+            convergence_reason = "iteration_budget"
             break
             
-        if len(root.children) >= 2 and root.visits > 100:
-            best_2 = sorted(root.children, key=lambda c: c.visits, reverse=True)[:2]
-            v1, v2 = best_2[0].visits, best_2[1].visits
+        root_children = tree.children(ROOT)
+        if len(root_children) >= 2 and tree.visits[ROOT] > 100:
+            v1, v2 = np.sort(tree.visits[root_children])[::-1][:2]
             if v1 > 0 and v2 > 0 and (v1 - v2) / v1 > 0.3:
                 break
                 
-        node = root
-        state = MultiInventoryState(sku_stocks=sku_stocks, day=0, pending_orders={sku: [] for sku in sku_list})
+        node = ROOT
+        path = [ROOT]
+        widened = None
+        state = MultiInventoryState(sku_stocks=sku_stocks, day=0)
+        scenario = int(np.random.randint(bank.n_scenarios))
+        day_multipliers: List[float] = []  # sub-actions chosen so far for the current day
+        
+        def choose(multiplier: float, state: MultiInventoryState) -> MultiInventoryState:
+            day_multipliers.append(multiplier)
+            if len(day_multipliers) < k:
+                return state
+            demands, lead_time = scenario_step(scenario, state.day)
+            state = state.transition(joint_order(day_multipliers), demands, holding_costs, stockout_costs, lead_time)
+            day_multipliers.clear()
+            return state
         
         # 1. SELECTION
-        while node.is_fully_expanded() and not state.is_terminal(horizon):
-            if not node.children: break
+        while tree.is_fully_expanded(node) and not state.is_terminal(horizon):
+            if tree.n_children[node] == 0: break
             
             # Progressive widening
-            if node.visits > 5 * math.pow(len(node.children), 1.5):
-                new_action = {}
-                for sku in sku_list:
-                    mean_d = float(np.mean(sku_demands[sku]))
-                    new_action[sku] = float(np.random.uniform(0.1, mean_d * 2.0))
-                node.untried_actions.append(new_action)
+            if tree.visits[node] > 5 * math.pow(tree.n_children[node], 1.5):
+                action_table.append(float(np.random.uniform(0.05, 2.0)))
+                widened = len(action_table) - 1
                 break
                 
-            node = node.best_child()
-            demands = {sku: float(np.random.choice(sku_demands[sku])) for sku in sku_list}
-            state = state.transition(node.action, demands, holding_costs, stockout_costs)
+            node = tree.best_child(node)
+            path.append(node)
+            state = choose(action_table[tree.action[node]], state)
             
         # 2. EXPANSION
-        if not state.is_terminal(horizon) and not node.is_fully_expanded():
-            action = node.untried_actions[0]
-            demands = {sku: float(np.random.choice(sku_demands[sku])) for sku in sku_list}
-            new_state = state.transition(action, demands, holding_costs, stockout_costs)
-            node = node.add_child(action, new_state, action_space)
-            state = new_state
+        if not state.is_terminal(horizon) and (widened is not None or not tree.is_fully_expanded(node)):
+            action = widened if widened is not None else tree.next_untried_action(node)
+            state = choose(action_table[action], state)
+            node = tree.add_child(node, action)
+            path.append(node)
             explored_states += 1
             
-        # 3. SIMULATION
+        # 3. SIMULATION (random per-SKU multipliers, finishing the current day first)
         sim_state = MultiInventoryState(
             sku_stocks=dict(state.sku_stocks),
             day=state.day,
             total_cost=state.total_cost,
-            pending_orders={sku: list(orders) for sku, orders in state.pending_orders.items()}
+            pipeline=state.pipeline.copy()
         )
-        while not sim_state.is_terminal(horizon):
+        stop_day = horizon if rollout_depth <= 0 else min(horizon, sim_state.day + rollout_depth)
+        while sim_state.day < stop_day:
             if np.random.random() < 0.5:
-                action = np.random.choice(action_space)
+                multiplier = base_multipliers[np.random.randint(len(base_multipliers))]
             else:
-                action = {}
-                for sku in sku_list:
-                    mean_d = float(np.mean(sku_demands[sku]))
-                    action[sku] = float(np.random.uniform(0.0, mean_d * 2.0))
-            demands = {sku: float(np.random.choice(sku_demands[sku])) for sku in sku_list}
-            sim_state = sim_state.transition(action, demands, holding_costs, stockout_costs)
+                multiplier = float(np.random.uniform(0.0, 2.0))
+            sim_state = choose(multiplier, sim_state)
+        
+        rollout_cost = sim_state.total_cost
+        if sim_state.day < horizon:
+            in_transit = dict(zip(sim_state.sku_stocks, sim_state.pipeline.in_transit().tolist()))
+            rollout_cost += float(policy.cost_to_go(
+                np.array([sim_state.sku_stocks[sku] for sku in sku_list]),
+                np.array([in_transit[sku] for sku in sku_list]),
+                horizon - sim_state.day, np.arange(k)
+            ).sum())
             
         # 4. BACKPROPAGATION
-        normalized_reward = 1.0 - (min(sim_state.total_cost, max_penalty) / max_penalty)
-        while node is not None:
-            node.update(normalized_reward)
-            node = node.parent
+        normalized_reward = 1.0 - (min(rollout_cost, max_penalty) / max_penalty)
+        tree.backpropagate([path], [normalized_reward])
+        
+        if progress is not None and tree.visits[ROOT] >= next_report:
+            _report_progress(
+                progress, search_id, tree, [m * order_units[0] for m in action_table],
+                explored_states, start_time, best_action=best_joint_action(principal_variation())
+            )
+            next_report = int(tree.visits[ROOT]) + progress_every
             
-    if not root.children:
+    pv = principal_variation()
+    if not pv:
         return {
             "order_quantities": {sku: 0.0 for sku in sku_list},
             "reorder_points": {sku: 0.0 for sku in sku_list},
@@ -444,26 +662,636 @@ def _multi_sku_mcts_worker(
             "computation_time_ms": 0.0
         }
         
-    best_child = max(root.children, key=lambda c: c.visits)
     computation_time = (time.time() - start_time) * 1000
-    expected_cost = (1.0 - (best_child.total_reward / best_child.visits)) * max_penalty
+    leaf = pv[-1]
+    expected_cost = (1.0 - (tree.total_reward[leaf] / tree.visits[leaf])) * max_penalty
     
-    reorder_points = {}
-    safety_stocks = {}
-    for sku in sku_list:
-        mean_d = float(np.mean(sku_demands[sku]))
-        std_d = float(np.std(sku_demands[sku]))
-        safety_stocks[sku] = std_d * 1.65
-        reorder_points[sku] = mean_d * 1.5
-        
     return {
-        "order_quantities": best_child.action,
-        "reorder_points": reorder_points,
-        "safety_stocks": safety_stocks,
-        "expected_cost": expected_cost,
+        "order_quantities": best_joint_action(pv),
+        "reorder_points": dict(zip(sku_list, policy.reorder_point.tolist())),
+        "safety_stocks": dict(zip(sku_list, policy.safety_stock.tolist())),
+        "expected_cost": float(expected_cost),
         "explored_states": explored_states,
+        "tree_nodes": len(tree),
         "computation_time_ms": computation_time,
-        "convergence_reason": "confidence_threshold" if elapsed <= max_time_budget else "time_budget"
+        "convergence_reason": convergence_reason
+    }
+
+
+def _joint_policy_costs(
+    bank: ScenarioBank,
+    sku_stocks: Dict[str, float],
+    holding_costs: Dict[str, float],
+    stockout_costs: Dict[str, float],
+    horizon: int,
+    reorder_points: Optional[Dict[str, float]] = None,
+    order_quantities: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Per-scenario cost of a coordinated policy; no reorder points → naive baseline."""
+    skus = list(sku_stocks.keys())
+    return evaluate_joint_policy(
+        bank, skus,
+        [sku_stocks[sku] for sku in skus],
+        [holding_costs.get(sku, 5.0) for sku in skus],
+        [stockout_costs.get(sku, 50.0) for sku in skus],
+        horizon,
+        [reorder_points[sku] for sku in skus] if reorder_points else [-np.inf] * len(skus),
+        [order_quantities[sku] for sku in skus] if order_quantities else [0.0] * len(skus)
+    )
+
+
+def _cem_group_solution(
+    sku_stocks: Dict[str, float],
+    sku_demands: Dict[str, np.ndarray],
+    holding_costs: Dict[str, float],
+    stockout_costs: Dict[str, float],
+    horizon: int,
+    bank: ScenarioBank,
+    seed: int = 42,
+    time_budget_s: float = 4.5,
+    population: int = 64,
+    max_generations: int = 30
+) -> Dict:
+    """
+    Cross-entropy search over a group's per-SKU (s, Q) pairs.
+
+    Alternative to _multi_sku_mcts_worker with the same output schema. The
+    parameter vector is [s_1..s_k, Q_1..Q_k], started from the pre-solved
+    policies and scored with population-batched evaluate_joint_policy calls.
+    """
+    skus = list(sku_demands)
+    k = len(skus)
+    policy = presolve_catalog(
+        [sku_demands[sku] for sku in skus],
+        [holding_costs[sku] for sku in skus],
+        [stockout_costs[sku] for sku in skus],
+        lead_low=1, lead_high=3
+    )
+    stocks = [sku_stocks[sku] for sku in skus]
+    hcs = [holding_costs[sku] for sku in skus]
+    scs = [stockout_costs[sku] for sku in skus]
+    
+    def objective(params: np.ndarray) -> np.ndarray:
+        return evaluate_joint_policy(
+            bank, skus, stocks, hcs, scs, horizon, params[:, :k], params[:, k:]
+        ).mean(axis=1)
+    
+    scale = np.maximum(policy.mean_demand, 1.0)
+    s0, q0 = policy.reorder_point, policy.order_quantity
+    result = cross_entropy_search(
+        objective,
+        mean=np.concatenate([s0, q0]),
+        std=0.5 * np.concatenate([np.maximum(s0, scale), np.maximum(q0, scale)]),
+        lower=np.zeros(2 * k),
+        upper=3.0 * np.concatenate([np.maximum(policy.base_stock, scale), np.maximum(q0, scale)]),
+        population=population,
+        max_generations=max_generations,
+        time_budget_s=time_budget_s,
+        rng=np.random.default_rng(seed)
+    )
+    reorder_points, order_quantities = result["params"][:k], result["params"][k:]
+    return {
+        "order_quantities": dict(zip(skus, order_quantities.tolist())),
+        "reorder_points": dict(zip(skus, reorder_points.tolist())),
+        "safety_stocks": dict(zip(skus, np.maximum(reorder_points - policy.lead_demand, 0.0).tolist())),
+        "expected_cost": result["cost"],
+        "explored_states": result["evaluations"],
+        "computation_time_ms": result["computation_time_ms"],
+        "convergence_reason": result["convergence_reason"],
+        "engine": "cem"
+    }
+
+
+def _multi_sku_group_worker(
+    sku_stocks: Dict[str, float],
+    sku_demands: Dict[str, np.ndarray],
+    holding_costs: Dict[str, float],
+    stockout_costs: Dict[str, float],
+    horizon: int,
+    iterations: int,
+    seed: int = 42,
+    n_scenarios: int = 256,
+    time_budget_s: float = 4.5,
+    progress: Any = None,
+    search_id: int = 0,
+    eval_replications: int = 2000,
+    rollout_depth: int = 0,
+    engine: str = "mcts",
+    deadline_at: Optional[float] = None
+) -> Dict:
+    """
+    Search one SKU group and evaluate it, entirely inside a pool worker.
+    
+    Returns the MCTS solution plus the group's baseline and optimized policy
+    costs, so the event loop only has to assemble results. Demand histories
+    may arrive inline or as shared-memory DemandRefs. The search draws from
+    an `n_scenarios`-row ScenarioBank; both policies are then evaluated on
+    the same `eval_replications`-row bank (common random numbers), with the
+    summaries under "evaluation". `engine` = "cem" replaces the tree search
+    with _cem_group_solution on the same bank. `deadline_at` (epoch seconds)
+    caps the budget when the search starts, so a search queued behind
+    others still stops at the caller's global deadline.
+    """
+    if deadline_at is not None:
+        time_budget_s = min(time_budget_s, max(0.0, deadline_at - time.time()))
+    sku_demands = {sku: resolve_demand(d) for sku, d in sku_demands.items()}
+    bank = ScenarioBank(sku_demands, horizon, n_scenarios, seed)
+    if engine == "cem":
+        solution = _cem_group_solution(
+            sku_stocks, sku_demands, holding_costs, stockout_costs, horizon, bank, seed,
+            time_budget_s=time_budget_s
+        )
+    else:
+        solution = _multi_sku_mcts_worker(
+            sku_stocks, sku_demands, holding_costs, stockout_costs, horizon, iterations, seed, bank,
+            time_budget_s=time_budget_s, progress=progress, search_id=search_id,
+            rollout_depth=rollout_depth
+        )
+    return _evaluate_group_solution(
+        solution, sku_stocks, sku_demands, holding_costs, stockout_costs, horizon, eval_replications
+    )
+
+
+def _evaluate_group_solution(
+    solution: Dict,
+    sku_stocks: Dict[str, float],
+    sku_demands: Dict[str, np.ndarray],
+    holding_costs: Dict[str, float],
+    stockout_costs: Dict[str, float],
+    horizon: int,
+    eval_replications: int = 2000
+) -> Dict:
+    """
+    Paired baseline vs. solution costs for one group on an `eval_replications`-row bank.
+    
+    The bank is drawn with MCTS_EVAL_SEED, never the search seed, so the
+    policy is not costed on the scenarios it was searched on.
+    """
+    eval_bank = ScenarioBank(sku_demands, horizon, eval_replications, settings.MCTS_EVAL_SEED)
+    baseline = _joint_policy_costs(eval_bank, sku_stocks, holding_costs, stockout_costs, horizon)
+    optimized = _joint_policy_costs(
+        eval_bank, sku_stocks, holding_costs, stockout_costs, horizon,
+        solution["reorder_points"], solution["order_quantities"]
+    )
+    return {
+        "solution": solution,
+        "baseline_cost": float(baseline.mean()),
+        "optimized_cost": float(optimized.mean()),
+        "evaluation": {
+            "baseline": summarize_costs(baseline),
+            "optimized": summarize_costs(optimized),
+            "savings": summarize_costs(baseline - optimized)
+        }
+    }
+
+
+def _presolved_group_results(
+    groups: List[Dict[str, Any]],
+    horizon: int,
+    eval_replications: int = 2000
+) -> List[Dict]:
+    """
+    Quick mode: closed-form policies for every group, no tree search.
+
+    All SKUs of all groups are pre-solved in one vectorized pass, then each
+    group is evaluated exactly like a searched one. Results have the same
+    shape as _multi_sku_group_worker's.
+    """
+    start_time = time.time()
+    demands = [
+        {sku: resolve_demand(d) for sku, d in group["demands"].items()}
+        for group in groups
+    ]
+    skus = [(g, sku) for g, group_demands in enumerate(demands) for sku in group_demands]
+    if not skus:
+        return []
+    policy = presolve_catalog(
+        [demands[g][sku] for g, sku in skus],
+        [groups[g]["holding_costs"][sku] for g, sku in skus],
+        [groups[g]["stockout_costs"][sku] for g, sku in skus],
+        lead_low=1, lead_high=3
+    )
+    expected = policy.cost_to_go(
+        np.array([groups[g]["stocks"][sku] for g, sku in skus]), 0.0, horizon, np.arange(len(skus))
+    )
+    presolve_ms = (time.time() - start_time) * 1000
+    
+    results = []
+    row = 0
+    for group, group_demands in zip(groups, demands):
+        rows = slice(row, row + len(group_demands))
+        row += len(group_demands)
+        names = list(group_demands)
+        solution = {
+            "order_quantities": dict(zip(names, policy.order_quantity[rows].tolist())),
+            "reorder_points": dict(zip(names, policy.reorder_point[rows].tolist())),
+            "safety_stocks": dict(zip(names, policy.safety_stock[rows].tolist())),
+            "expected_cost": float(expected[rows].sum()),
+            "explored_states": 0,
+            "computation_time_ms": presolve_ms
+        }
+        results.append(_evaluate_group_solution(
+            solution, group["stocks"], group_demands, group["holding_costs"], group["stockout_costs"],
+            horizon, eval_replications
+        ))
+    return results
+
+
+def _singleton_batch_worker(
+    sku_stocks: Dict[str, float],
+    sku_demands: Dict[str, np.ndarray],
+    holding_costs: Dict[str, float],
+    stockout_costs: Dict[str, float],
+    horizon: int,
+    seed: int = 42,
+    n_scenarios: int = 256,
+    time_budget_s: float = 4.5,
+    eval_replications: int = 2000,
+    search: bool = True,
+    chunk_size: int = 64,
+    population: int = 64,
+    max_generations: int = 30,
+    deadline_at: Optional[float] = None
+) -> List[Dict]:
+    """
+    Optimize unassociated SKUs as a batch of independent single-SKU problems.
+
+    Singleton groups need no joint search: every SKU is pre-solved in one
+    vectorized pass and, with `search`, refined by one batched cross-entropy
+    search over per-SKU (s, Q) pairs, all simulated together by
+    evaluate_independent_policies in chunks of `chunk_size` SKUs. Each SKU is
+    then evaluated on its own bank rows exactly as a singleton group would
+    be. Returns one result per SKU, in input order, shaped like
+    _multi_sku_group_worker's. `deadline_at` caps the search budget as in
+    _multi_sku_group_worker.
+    """
+    start_time = time.time()
+    if deadline_at is not None:
+        time_budget_s = min(time_budget_s, max(0.0, deadline_at - start_time))
+    sku_demands = {sku: resolve_demand(d) for sku, d in sku_demands.items()}
+    skus = list(sku_demands)
+    if not skus:
+        return []
+    stocks = np.array([sku_stocks[sku] for sku in skus], dtype=float)
+    hcs = np.array([holding_costs[sku] for sku in skus], dtype=float)
+    scs = np.array([stockout_costs[sku] for sku in skus], dtype=float)
+    policy = presolve_catalog([sku_demands[sku] for sku in skus], hcs, scs, lead_low=1, lead_high=3)
+    reorder_points, order_quantities = policy.reorder_point.copy(), policy.order_quantity.copy()
+    expected = policy.cost_to_go(stocks, 0.0, horizon, np.arange(len(skus)))
+    explored = 0
+    
+    chunks = [slice(i, i + max(1, chunk_size)) for i in range(0, len(skus), max(1, chunk_size))]
+    if search:
+        for c, cols in enumerate(chunks):
+            chunk_skus = skus[cols]
+            bank = ScenarioBank({sku: sku_demands[sku] for sku in chunk_skus}, horizon, n_scenarios, seed)
+            
+            def objective(params: np.ndarray) -> np.ndarray:
+                return evaluate_independent_policies(
+                    bank, chunk_skus, stocks[cols], hcs[cols], scs[cols], horizon,
+                    params[:, :, 0], params[:, :, 1]
+                ).mean(axis=1)
+            
+            scale = np.maximum(policy.mean_demand[cols], 1.0)
+            s0, q0 = policy.reorder_point[cols], policy.order_quantity[cols]
+            remaining = time_budget_s - (time.time() - start_time)
+            result = batched_cross_entropy_search(
+                objective,
+                mean=np.stack([s0, q0], axis=1),
+                std=0.5 * np.stack([np.maximum(s0, scale), np.maximum(q0, scale)], axis=1),
+                lower=np.zeros((len(chunk_skus), 2)),
+                upper=3.0 * np.stack([np.maximum(policy.base_stock[cols], scale), np.maximum(q0, scale)], axis=1),
+                population=population,
+                max_generations=max_generations,
+                time_budget_s=max(remaining, 0.0) / (len(chunks) - c),
+                rng=np.random.default_rng([seed, c])
+            )
+            reorder_points[cols], order_quantities[cols] = result["params"][:, 0], result["params"][:, 1]
+            expected[cols] = result["cost"]
+            explored += result["evaluations"]
+    search_ms = (time.time() - start_time) * 1000
+    
+    results = []
+    for cols in chunks:
+        chunk_skus = skus[cols]
+        eval_bank = ScenarioBank({sku: sku_demands[sku] for sku in chunk_skus}, horizon, eval_replications, settings.MCTS_EVAL_SEED)
+        costs = evaluate_independent_policies(
+            eval_bank, chunk_skus, stocks[cols], hcs[cols], scs[cols], horizon,
+            np.vstack([np.full(len(chunk_skus), -np.inf), reorder_points[cols]]),
+            np.vstack([np.zeros(len(chunk_skus)), order_quantities[cols]])
+        )
+        for j, sku in enumerate(chunk_skus):
+            i = cols.start + j
+            baseline, optimized = costs[0, :, j], costs[1, :, j]
+            results.append({
+                "solution": {
+                    "order_quantities": {sku: float(order_quantities[i])},
+                    "reorder_points": {sku: float(reorder_points[i])},
+                    "safety_stocks": {sku: float(max(reorder_points[i] - policy.lead_demand[i], 0.0))},
+                    "expected_cost": float(expected[i]),
+                    "explored_states": int(explored // len(skus)),
+                    "computation_time_ms": search_ms,
+                    "engine": "batch" if search else "presolved"
+                },
+                "baseline_cost": float(baseline.mean()),
+                "optimized_cost": float(optimized.mean()),
+                "evaluation": {
+                    "baseline": summarize_costs(baseline),
+                    "optimized": summarize_costs(optimized),
+                    "savings": summarize_costs(baseline - optimized)
+                }
+            })
+    return results
+
+
+def _merge_singleton_inputs(groups: List[Dict[str, Any]]) -> Dict[str, Dict]:
+    """Flatten singleton group inputs into the per-SKU dicts _singleton_batch_worker takes."""
+    merged = {"sku_stocks": {}, "sku_demands": {}, "holding_costs": {}, "stockout_costs": {}}
+    for group in groups:
+        merged["sku_stocks"].update(group["stocks"])
+        merged["sku_demands"].update(group["demands"])
+        merged["holding_costs"].update(group["holding_costs"])
+        merged["stockout_costs"].update(group["stockout_costs"])
+    return merged
+
+
+def _sweep_row(holding_cost: float, stockout_cost: float, horizon: int, baseline: np.ndarray, optimized: np.ndarray) -> Dict:
+    """One cost-surface row from paired baseline / optimized replications."""
+    savings = summarize_costs(baseline - optimized)
+    baseline_cost = float(baseline.mean())
+    return {
+        "holding_cost": float(holding_cost),
+        "stockout_cost": float(stockout_cost),
+        "horizon": int(horizon),
+        "baseline_cost": baseline_cost,
+        "optimized_cost": float(optimized.mean()),
+        "savings_pct": savings["mean"] / baseline_cost * 100 if baseline_cost > 0 else 0.0,
+        "savings_std_error": savings["std_error"]
+    }
+
+
+def _sweep_worker(
+    points: List[Tuple[float, float, int]],
+    current_stock: float,
+    demand_history: np.ndarray,
+    engine: str = "quick",
+    seed: int = 42,
+    n_scenarios: int = 256,
+    eval_replications: int = 2000,
+    time_budget_s: float = 4.5
+) -> List[Dict]:
+    """
+    Evaluate a chunk of (holding_cost, stockout_cost, horizon) grid points for one SKU.
+
+    The search and evaluation ScenarioBanks (seeded apart, see
+    MCTS_EVAL_SEED) are built once, at the chunk's longest horizon, and
+    shared by every point; each point's policy comes from the pre-solver
+    ("quick") or a cross-entropy search ("cem").
+    """
+    demand_history = resolve_demand(demand_history)
+    max_horizon = max(int(h) for _, _, h in points)
+    eval_bank = ScenarioBank.for_single_sku(demand_history, max_horizon, eval_replications, settings.MCTS_EVAL_SEED)
+    search_bank = ScenarioBank.for_single_sku(demand_history, max_horizon, n_scenarios, seed) if engine == "cem" else None
+    
+    rows = []
+    for holding_cost, stockout_cost, horizon in points:
+        if engine == "cem":
+            solution = _cem_worker(
+                current_stock, demand_history, holding_cost, stockout_cost, horizon,
+                seed=seed, time_budget_s=time_budget_s, bank=search_bank
+            )
+            reorder_point, order_quantity, safety_stock = (
+                solution["reorder_point"], solution["order_quantity"], solution["safety_stock"]
+            )
+        else:
+            policy = presolve(demand_history, holding_cost, stockout_cost)
+            reorder_point, order_quantity, safety_stock = (
+                float(policy.reorder_point[0]), float(policy.order_quantity[0]), float(policy.safety_stock[0])
+            )
+        costs = evaluate_policy(
+            eval_bank, current_stock, holding_cost, stockout_cost, horizon,
+            np.array([-np.inf, reorder_point]), np.array([0.0, order_quantity])
+        )
+        row = _sweep_row(holding_cost, stockout_cost, horizon, costs[0], costs[1])
+        row.update({"reorder_point": reorder_point, "order_quantity": order_quantity, "safety_stock": safety_stock})
+        rows.append(row)
+    return rows
+
+
+def _group_sweep_worker(
+    points: List[Tuple[float, float, int]],
+    groups: List[Dict[str, Any]],
+    eval_replications: int = 2000
+) -> List[Dict]:
+    """
+    Evaluate a chunk of grid points across every SKU group with pre-solved policies.
+
+    Demand is resolved and each group's evaluation bank built once, at the
+    chunk's longest horizon. Points sharing a horizon are evaluated as one
+    population per group (baseline and pre-solved policy for every cost
+    pair), and the groups' paired costs are summed replication by
+    replication. Policy parameters are summed over SKUs.
+    """
+    max_horizon = max(int(h) for _, _, h in points)
+    demands = [{sku: resolve_demand(d) for sku, d in g["demands"].items()} for g in groups]
+    eval_banks = [ScenarioBank(group_demands, max_horizon, eval_replications, settings.MCTS_EVAL_SEED) for group_demands in demands]
+    history = [d for group_demands in demands for d in group_demands.values()]
+    
+    by_horizon: Dict[int, List[Tuple[float, float, int]]] = {}
+    for point in points:
+        by_horizon.setdefault(int(point[2]), []).append(point)
+    
+    rows = []
+    for horizon, horizon_points in by_horizon.items():
+        n_points = len(horizon_points)
+        policies = [presolve_catalog(history, h, p, lead_low=1, lead_high=3) for h, p, _ in horizon_points]
+        holding = np.tile([h for h, _, _ in horizon_points], 2)[:, None]
+        stockout = np.tile([p for _, p, _ in horizon_points], 2)[:, None]
+        baseline = np.zeros((n_points, eval_replications))
+        optimized = np.zeros((n_points, eval_replications))
+        offset = 0
+        for group, group_demands, bank in zip(groups, demands, eval_banks):
+            skus = list(group_demands)
+            k = len(skus)
+            cols = slice(offset, offset + k)
+            offset += k
+            costs = evaluate_joint_policy(
+                bank, skus, [group["stocks"][sku] for sku in skus],
+                np.repeat(holding, k, axis=1), np.repeat(stockout, k, axis=1), horizon,
+                np.vstack([np.full((n_points, k), -np.inf)] + [pol.reorder_point[None, cols] for pol in policies]),
+                np.vstack([np.zeros((n_points, k))] + [pol.order_quantity[None, cols] for pol in policies])
+            )
+            baseline += costs[:n_points]
+            optimized += costs[n_points:]
+        for i, ((holding_cost, stockout_cost, _), policy) in enumerate(zip(horizon_points, policies)):
+            row = _sweep_row(holding_cost, stockout_cost, horizon, baseline[i], optimized[i])
+            row.update({
+                "reorder_point": float(policy.reorder_point.sum()),
+                "order_quantity": float(policy.order_quantity.sum()),
+                "safety_stock": float(policy.safety_stock.sum())
+            })
+            rows.append(row)
+    return rows
+
+
+ECHELON_TIERS = ["retailer", "distributor", "wholesaler", "manufacturer"]
+ECHELON_LEAD_MEANS = [2, 2, 3, 4]
+
+
+def _evaluate_policies_worker(
+    current_stock: float,
+    demand_history: np.ndarray,
+    holding_cost: float,
+    stockout_cost: float,
+    horizon: int,
+    reorder_point: float,
+    order_quantity: float,
+    replications: int = 2000
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Replicated evaluation of the baseline and the (s, Q) policy.
+    
+    Both run on one `replications`-row ScenarioBank (MCTS_EVAL_SEED, apart
+    from the search scenarios) as vectorized simulations, so savings are
+    paired scenario by scenario. Returns
+    mean / standard error / percentile summaries for each policy and
+    for the savings. Top-level so process() can run it in the pool.
+    """
+    bank = ScenarioBank.for_single_sku(demand_history, horizon, replications, settings.MCTS_EVAL_SEED)
+    baseline = evaluate_policy(bank, current_stock, holding_cost, stockout_cost, horizon, -np.inf, 0.0)
+    optimized = evaluate_policy(
+        bank, current_stock, holding_cost, stockout_cost, horizon, reorder_point, order_quantity
+    )
+    return {
+        "baseline": summarize_costs(baseline),
+        "optimized": summarize_costs(optimized),
+        "savings": summarize_costs(baseline - optimized)
+    }
+
+
+def _echelon_worker(
+    demand_data: np.ndarray,
+    solution: Dict,
+    holding_cost: float = 5.0,
+    stockout_cost: float = 50.0,
+    replications: int = 200,
+    seed: int = 42,
+    search_replications: int = 32,
+    time_budget_s: float = 2.0,
+    population: int = 32,
+    max_generations: int = 30
+) -> Dict:
+    """
+    Jointly optimize per-tier (s, Q) policies for the 4-tier chain and measure bullwhip.
+    
+    Retailer → distributor → wholesaler → manufacturer, each tier fed by the
+    orders of the tier below (EchelonSimulator.simulate_chain). A
+    cross-entropy search over all eight parameters minimizes the whole
+    chain's holding + stockout cost on `search_replications` shared
+    lead-time draws, starting from the cheaper of the naive chain
+    (s = 1.2μ, Q = 1.5μ everywhere) and the retailer's optimized policy
+    copied to every tier. The naive and optimized chains are then simulated
+    together on `replications` fresh draws, and the order-variance
+    amplification of each tier is reported as measured.
+    """
+    start_time = time.time()
+    demand_data = np.asarray(demand_data, dtype=float)
+    replications = max(2, int(replications))
+    n_tiers = len(ECHELON_TIERS)
+    lead_means = np.array(ECHELON_LEAD_MEANS)
+    
+    mean_demand = np.mean(demand_data) if len(demand_data) else 0.0
+    if mean_demand <= 0:
+        mean_demand = 1.0
+    var_consumer = np.var(demand_data) if len(demand_data) and np.var(demand_data) > 0 else 1.0
+    
+    naive = np.concatenate([np.full(n_tiers, mean_demand * 1.2), np.full(n_tiers, mean_demand * 1.5)])
+    shared = np.concatenate([
+        np.full(n_tiers, float(solution.get("reorder_point", mean_demand * 1.5))),
+        np.full(n_tiers, float(solution.get("order_quantity", mean_demand * 2.0)))
+    ])
+    search_demand = np.broadcast_to(demand_data, (max(1, int(search_replications)), len(demand_data)))
+    
+    def objective(params: np.ndarray) -> np.ndarray:
+        chain = EchelonSimulator(np.random.default_rng(seed)).simulate_chain(
+            search_demand, params[:, :n_tiers], params[:, n_tiers:], lead_means, holding_cost, stockout_cost
+        )
+        return chain["cost"].mean(axis=1)
+    
+    start = [naive, shared][int(np.argmin(objective(np.stack([naive, shared]))))]
+    protection = mean_demand * np.concatenate([lead_means + 1, lead_means + 1])
+    search = cross_entropy_search(
+        objective,
+        mean=start,
+        std=0.5 * np.maximum(start, mean_demand),
+        lower=np.concatenate([np.zeros(n_tiers), np.full(n_tiers, 0.1 * mean_demand)]),
+        upper=3.0 * np.maximum(start, protection),
+        population=population,
+        max_generations=max_generations,
+        time_budget_s=time_budget_s,
+        rng=np.random.default_rng(seed)
+    )
+    optimized = search["params"]
+    
+    # Naive vs. optimized chain on the same fresh replications
+    chain = EchelonSimulator(np.random.default_rng(seed + 1)).simulate_chain(
+        np.broadcast_to(demand_data, (replications, len(demand_data))),
+        np.stack([naive[:n_tiers], optimized[:n_tiers]]),
+        np.stack([naive[n_tiers:], optimized[n_tiers:]]),
+        lead_means, holding_cost, stockout_cost
+    )
+    tier_metrics = {}
+    for idx, tier in enumerate(ECHELON_TIERS):
+        before = EchelonSimulator.variance_ratio(chain["orders"][idx, 0], var_consumer)
+        after = EchelonSimulator.variance_ratio(chain["orders"][idx, 1], var_consumer)
+        tier_metrics[tier] = {
+            "before": before["mean"],
+            "after": after["mean"],
+            "before_ci": [float(v) for v in before["ci"]],
+            "after_ci": [float(v) for v in after["ci"]],
+            "policy": {
+                "reorder_point": float(optimized[idx]),
+                "order_quantity": float(optimized[n_tiers + idx])
+            },
+            "cost_before": float(chain["tier_costs"][idx, 0].mean()),
+            "cost_after": float(chain["tier_costs"][idx, 1].mean())
+        }
+    
+    overall_before = sum(t["before"] for t in tier_metrics.values()) / n_tiers
+    overall_after = sum(t["after"] for t in tier_metrics.values()) / n_tiers
+    cost_before, cost_after = chain["cost"].mean(axis=1)
+    
+    return {
+        "before": float(overall_before),
+        "after": float(overall_after),
+        "improvement_percentage": float((overall_before - overall_after) / overall_before * 100) if overall_before > 0 else 0.0,
+        "replications": replications,
+        "tiers": tier_metrics,
+        "chain_cost": {
+            "before": float(cost_before),
+            "after": float(cost_after),
+            "savings_pct": float((cost_before - cost_after) / cost_before * 100) if cost_before > 0 else 0.0
+        },
+        "optimizer": {
+            "engine": "cem",
+            "generations": search["generations"],
+            "evaluations": search["evaluations"],
+            "convergence_reason": search["convergence_reason"],
+            "computation_time_ms": (time.time() - start_time) * 1000
+        }
+    }
+
+
+def _heuristic_group_solution(sku_demands: Dict[str, np.ndarray]) -> Dict:
+    """Mean-demand fallback for a group whose search missed the global deadline."""
+    sku_demands = {sku: resolve_demand(d) for sku, d in sku_demands.items()}
+    return {
+        "order_quantities": {sku: float(np.mean(d)) for sku, d in sku_demands.items()},
+        "reorder_points": {sku: float(np.mean(d)) * 1.5 for sku, d in sku_demands.items()},
+        "safety_stocks": {sku: float(np.std(d)) * 1.65 for sku, d in sku_demands.items()},
+        "expected_cost": 0.0,
+        "explored_states": 0,
+        "computation_time_ms": 0.0
     }
 
 
@@ -485,7 +1313,10 @@ class MCTSOptimizerAgent(BaseAgent):
             api_client=groq_client
         )
         import concurrent.futures
-        self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=2)
+        # None → one worker per core
+        self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=settings.MCTS_POOL_WORKERS)
+        # Started on first streamed search; hosts the queues workers report progress through
+        self._progress_manager = None
     
     def should_reason(self) -> bool:
         return True
@@ -493,6 +1324,9 @@ class MCTSOptimizerAgent(BaseAgent):
     def evaluate_output(self, output: Dict, request: AgentRequest) -> tuple[float, list]:
         """Check optimization output quality."""
         from app.core.evaluation import agent_evaluator
+        if "sweep" in output:
+            # A cost surface has no single optimal_action; rerunning the grid would not add one
+            return (1.0, []) if output["sweep"].get("rows") else (0.0, ["Sweep returned no grid points"])
         result = agent_evaluator.evaluate("mcts_optimizer", output, success=True)
         return result.score, result.issues
     
@@ -508,6 +1342,12 @@ class MCTSOptimizerAgent(BaseAgent):
         }
         
         score = (eval_score * 0.4 + factors["savings_positive"] * 0.3 + factors["has_optimal_action"] * 0.3)
+        
+        # Root-parallel runs report how many independent searches agreed on the action
+        stats = output.get("simulation_stats", {})
+        if isinstance(stats, dict) and stats.get("parallel_searches", 1) > 1:
+            factors["search_agreement"] = float(stats.get("search_agreement", 0.0))
+            score = score * 0.8 + factors["search_agreement"] * 0.2
         score = max(0.0, min(1.0, score))
         
         return ConfidenceScore(
@@ -528,6 +1368,29 @@ class MCTSOptimizerAgent(BaseAgent):
             return df[numeric_cols[0]].dropna().values
         return np.array([])
     
+    def _forecast_demand_matrix(self, pivoted: pd.DataFrame, sku_predictions: Dict[str, List[float]]) -> pd.DataFrame:
+        """
+        Per-SKU demand (days × SKUs) for the Multi-SKU searches.
+        
+        With a Forecaster prediction for every SKU, each column is the SKU's
+        predicted path plus the deviations of its most recent history around
+        their mean (clipped at zero), so sampled demand follows the forecast
+        level with the SKU's own day-to-day spread. Otherwise the history is
+        returned unchanged.
+        """
+        paths = [sku_predictions.get(str(sku)) for sku in pivoted.columns]
+        if not paths or not all(paths) or len({len(path) for path in paths}) != 1:
+            if sku_predictions:
+                logger.warning("Per-SKU forecasts do not cover every SKU; optimizing against history")
+            return pivoted
+        periods = len(paths[0])
+        columns = {}
+        for sku, path in zip(pivoted.columns, paths):
+            recent = pivoted[sku].to_numpy(dtype=float)[-periods:]
+            spread = np.resize(recent - recent.mean(), periods)
+            columns[sku] = np.maximum(np.asarray(path, dtype=float) + spread, 0.0)
+        return pd.DataFrame(columns, columns=pivoted.columns)
+    
     def _get_current_stock(self, df: pd.DataFrame, demand_data: np.ndarray) -> float:
         """Estimate current stock level"""
         stock_cols = ['stock', 'inventory', 'current_stock', 'on_hand']
@@ -546,60 +1409,50 @@ class MCTSOptimizerAgent(BaseAgent):
                 return matching[0]
         return None
 
-    def _mine_sku_associations(self, df: pd.DataFrame, date_col: str, sku_col: str) -> List[Dict]:
-        """Mine co-occurrence association rules between SKUs (Apriori-inspired)"""
+    def _mine_sku_associations(
+        self,
+        df: pd.DataFrame,
+        date_col: str,
+        sku_col: str,
+        min_support: Optional[float] = None,
+        min_lift: Optional[float] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """Mine co-occurrence association rules between SKUs (sparse incidence matrix)"""
         try:
-            daily_skus = df.groupby(date_col)[sku_col].apply(set).reset_index()
-            transactions = daily_skus[sku_col].tolist()
-            total_txs = len(transactions)
-            if total_txs == 0:
-                return []
-            
-            from collections import defaultdict
-            item_counts = defaultdict(int)
-            pair_counts = defaultdict(int)
-            
-            for tx in transactions:
-                for item in tx:
-                    item_counts[item] += 1
-                items_list = list(tx)
-                for i in range(len(items_list)):
-                    for j in range(i+1, len(items_list)):
-                        pair = tuple(sorted([items_list[i], items_list[j]]))
-                        pair_counts[pair] += 1
-            
-            associations = []
-            min_support = 0.1
-            
-            for pair, count in pair_counts.items():
-                support = count / total_txs
-                if support >= min_support:
-                    item_a, item_b = pair
-                    support_a = item_counts[item_a] / total_txs
-                    support_b = item_counts[item_b] / total_txs
-                    
-                    if support_a > 0:
-                        conf_a_to_b = support / support_a
-                        lift = support / (support_a * support_b) if support_b > 0 else 0
-                        associations.append({
-                            "antecedent": [item_a],
-                            "consequent": [item_b],
-                            "support": float(support),
-                            "confidence": float(conf_a_to_b),
-                            "lift": float(lift)
-                        })
-                        
-            return sorted(associations, key=lambda x: x["lift"], reverse=True)
+            return mine_associations(
+                df[date_col],
+                df[sku_col],
+                min_support=settings.MCTS_ASSOC_MIN_SUPPORT if min_support is None else min_support,
+                min_lift=settings.MCTS_ASSOC_MIN_LIFT if min_lift is None else min_lift,
+                top_k=settings.MCTS_ASSOC_TOP_K if top_k is None else top_k
+            )
         except Exception as e:
             logger.warning(f"Failed to mine SKU associations: {e}")
             return []
 
-    def _form_sku_groups(self, df: pd.DataFrame, sku_col: str, associations: List[Dict]) -> List[List[str]]:
-        """Form groups of associated SKUs for joint optimization"""
+    def _form_sku_groups(
+        self,
+        df: pd.DataFrame,
+        sku_col: str,
+        associations: List[Dict],
+        pair_remaining: bool = True,
+        min_lift: float = 0.0
+    ) -> List[List[str]]:
+        """
+        Form groups of associated SKUs for joint optimization.
+        
+        Only rules with lift ≥ `min_lift` form groups. SKUs left without an
+        association are paired two at a time, or kept as singleton groups
+        when `pair_remaining` is False (they are then batched by
+        _singleton_batch_worker instead of searched jointly).
+        """
         groups = []
         seen = set()
         
         for rule in associations:
+            if rule["lift"] < min_lift:
+                continue
             ant = rule["antecedent"][0]
             cons = rule["consequent"][0]
             if ant not in seen and cons not in seen:
@@ -607,14 +1460,69 @@ class MCTSOptimizerAgent(BaseAgent):
                 seen.add(ant)
                 seen.add(cons)
                 
-        all_skus = df[sku_col].dropna().unique()
+        all_skus = df[sku_col].dropna().unique().tolist()  # Python scalars, not NumPy ones
         remaining = [sku for sku in all_skus if sku not in seen]
         if remaining:
-            for i in range(0, len(remaining), 2):
-                groups.append(list(remaining[i:i+2]))
+            step = 2 if pair_remaining else 1
+            for i in range(0, len(remaining), step):
+                groups.append(list(remaining[i:i+step]))
                 
         return [g for g in groups if len(g) > 0]
     
+    def _progress_channel(self):
+        """New cross-process queue for one request's search progress."""
+        if self._progress_manager is None:
+            import multiprocessing
+            self._progress_manager = multiprocessing.Manager()
+        return self._progress_manager.Queue()
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the search pool's worker processes and the progress Manager's server process (idempotent)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        if self._progress_manager is not None:
+            self._progress_manager.shutdown()
+            self._progress_manager = None
+
+    async def _relay_progress(
+        self,
+        channel: Any,
+        session_id: str,
+        time_budget_s: float,
+        done: "asyncio.Event",
+        poll_interval_s: float = 0.25
+    ) -> int:
+        """
+        Forward worker progress updates to the SSE stream until `done` is set.
+        
+        Progress is reported on the 10-90% band by elapsed search time against
+        the budget. Returns the number of updates relayed.
+        """
+        import asyncio
+        import queue
+        relayed = 0
+        while True:
+            finished = done.is_set()
+            while True:
+                try:
+                    update = channel.get_nowait()
+                except queue.Empty:
+                    break
+                relayed += 1
+                fraction = min(1.0, update["elapsed_ms"] / 1000 / max(time_budget_s, 1e-6))
+                await streaming_service.publish_agent_progress(
+                    session_id, self.name, 10 + 80 * fraction,
+                    f"Search {update['search'] + 1}: {update['iterations']} iterations",
+                    update
+                )
+            if finished:
+                return relayed
+            try:
+                await asyncio.wait_for(done.wait(), timeout=poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
     async def _run_mcts(
         self,
         current_stock: float,
@@ -623,275 +1531,457 @@ class MCTSOptimizerAgent(BaseAgent):
         stockout_cost: float,
         horizon: int,
         iterations: int,
-        session_id: str = None
+        session_id: str = None,
+        parallel_searches: int = 1,
+        n_scenarios: int = 256,
+        time_budget_s: float = 4.5,
+        progress_every: int = 200,
+        transposition_entries: int = 0,
+        use_cache: bool = True,
+        rollout_depth: int = 0
     ) -> Dict:
-        """Execute MCTS algorithm for single SKU"""
+        """
+        Execute MCTS algorithm for single SKU.
+        
+        With parallel_searches > 1, independent searches with distinct seeds
+        run across the process pool and their root statistics are merged.
+        All searches draw from the same `n_scenarios`-row ScenarioBank.
+        
+        Searches are anytime: they stop at `time_budget_s`, and with a
+        session each one streams its current best action every
+        `progress_every` iterations. `transposition_entries` > 0 gives each
+        search an LRU transposition table of that size; `rollout_depth` > 0
+        truncates rollouts with a heuristic leaf value.
+        
+        With `use_cache`, an identical earlier request (same demand, stock,
+        costs, horizon and search settings) is served from optimizer_cache;
+        a near hit (same demand, stock and costs) warm-starts the first
+        search's root from the stored root statistics. Only one search is
+        seeded, so the merged statistics and the agreement metric count the
+        prior once.
+        """
         import asyncio
+        import functools
         loop = asyncio.get_event_loop()
+        parallel_searches = max(1, int(parallel_searches))
         
-        logger.info(f"Starting single SKU MCTS Simulation...")
+        warm_start = None
+        if use_cache:
+            warm_key = optimizer_cache.fingerprint(
+                [demand_history], kind="single_warm", current_stock=current_stock,
+                holding_cost=holding_cost, stockout_cost=stockout_cost, action_space="presolved"
+            )
+            cache_key = optimizer_cache.fingerprint(
+                [demand_history], kind="single", current_stock=current_stock,
+                holding_cost=holding_cost, stockout_cost=stockout_cost, horizon=horizon,
+                iterations=iterations, parallel_searches=parallel_searches,
+                n_scenarios=n_scenarios, transposition_entries=transposition_entries,
+                action_space="presolved", rollout_depth=rollout_depth, time_budget_s=time_budget_s
+            )
+            cached, prior = await optimizer_cache.lookup(cache_key, warm_key)
+            if cached is not None:
+                logger.info("Single SKU MCTS served from optimizer cache")
+                cached["cache"] = "hit"
+                if session_id:
+                    await streaming_service.publish_agent_progress(
+                        session_id, self.name, 100, "MCTS Optimization served from cache", cached
+                    )
+                return cached
+            if prior is not None:
+                warm_start = prior.get("root_stats")
+        
+        logger.info(f"Starting single SKU MCTS Simulation ({parallel_searches} root-parallel searches)...")
         if session_id:
             await streaming_service.publish_agent_progress(
-                session_id, self.name, 10, "Starting MCTS Simulation...", {}
+                session_id, self.name, 10, "Starting MCTS Simulation...",
+                {"parallel_searches": parallel_searches}
             )
         
-        result = await loop.run_in_executor(
-            self._pool,
-            _mcts_worker,
-            current_stock,
-            demand_history,
-            holding_cost,
-            stockout_cost,
-            horizon,
-            iterations,
-            42
+        channel = self._progress_channel() if session_id else None
+        searches_done = asyncio.Event()
+        relay = (
+            asyncio.create_task(self._relay_progress(channel, session_id, time_budget_s, searches_done))
+            if channel is not None else None
         )
         
+        # Publish the history once; every search receives only a shared-memory reference
+        try:
+            with SharedDemandMatrix(demand_history) as shared:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(
+                        self._pool,
+                        functools.partial(
+                            _mcts_worker,
+                            current_stock,
+                            shared.ref(),
+                            holding_cost,
+                            stockout_cost,
+                            horizon,
+                            iterations,
+                            seed=42 + i,
+                            n_scenarios=n_scenarios,
+                            time_budget_s=time_budget_s,
+                            progress=channel,
+                            progress_every=progress_every,
+                            search_id=i,
+                            transposition_entries=transposition_entries,
+                            # One copy of the prior: merged root statistics sum every search
+                            warm_start=warm_start if i == 0 else None,
+                            rollout_depth=rollout_depth
+                        )
+                    )
+                    for i in range(parallel_searches)
+                ])
+        finally:
+            searches_done.set()
+            if relay is not None:
+                await relay
+        result = results[0] if parallel_searches == 1 else _merge_root_parallel(results)
+        
+        if use_cache:
+            result["cache"] = "warm_start" if warm_start else "miss"
+            await optimizer_cache.store(
+                cache_key, result, warm_key,
+                {"horizon": horizon, "root_stats": result.get("root_stats")}
+            )
+        
         if session_id:
             await streaming_service.publish_agent_progress(
                 session_id, self.name, 100, "MCTS Optimization complete", result
             )
         return result
 
-    async def _run_multi_mcts(
+    async def _run_policy_search(
         self,
-        sku_stocks: Dict[str, float],
-        sku_demands: Dict[str, np.ndarray],
-        holding_costs: Dict[str, float],
-        stockout_costs: Dict[str, float],
+        current_stock: float,
+        demand_history: np.ndarray,
+        holding_cost: float,
+        stockout_cost: float,
         horizon: int,
-        iterations: int,
-        session_id: str = None
+        session_id: str = None,
+        n_scenarios: int = 256,
+        time_budget_s: float = 4.5
     ) -> Dict:
-        """Execute Multi-SKU MCTS algorithm"""
+        """
+        Execute the cross-entropy engine for a single SKU in the process pool.
+        
+        Returns the same solution schema as _run_mcts, searched on the same
+        `n_scenarios`-row ScenarioBank.
+        """
         import asyncio
+        import functools
         loop = asyncio.get_event_loop()
         
-        logger.info(f"Starting Multi-SKU MCTS Simulation...")
+        logger.info("Starting single SKU cross-entropy policy search...")
         if session_id:
             await streaming_service.publish_agent_progress(
-                session_id, self.name, 10, "Starting Multi-SKU MCTS Simulation...", {}
+                session_id, self.name, 10, "Starting cross-entropy policy search...", {"engine": "cem"}
             )
         
         result = await loop.run_in_executor(
             self._pool,
-            _multi_sku_mcts_worker,
-            sku_stocks,
-            sku_demands,
-            holding_costs,
-            stockout_costs,
-            horizon,
-            iterations,
-            42
+            functools.partial(
+                _cem_worker,
+                current_stock,
+                demand_history,
+                holding_cost,
+                stockout_cost,
+                horizon,
+                n_scenarios=n_scenarios,
+                time_budget_s=time_budget_s
+            )
         )
         
         if session_id:
             await streaming_service.publish_agent_progress(
-                session_id, self.name, 100, "Multi-SKU MCTS complete", result
+                session_id, self.name, 100, "Policy search complete", result
             )
         return result
-        
-    def _sample_demand(self, demand_history: np.ndarray) -> float:
-        """Sample demand from historical distribution"""
-        return float(np.random.choice(demand_history))
 
-    def _calculate_baseline_cost(
+    async def _run_sweep(
         self,
-        current_stock: float,
-        demand_history: np.ndarray,
-        holding_cost: float,
-        stockout_cost: float,
-        horizon: int,
-        seed: int = 42
-    ) -> float:
-        """Calculate cost with naive policy (no reordering)"""
-        np.random.seed(seed)
-        state = InventoryState(current_stock=current_stock, day=0)
+        worker: Any,
+        axes: Dict[str, list],
+        policy: str,
+        eval_replications: int,
+        **worker_kwargs: Any
+    ) -> AgentResponse:
+        """
+        Evaluate a what-if grid across the process pool.
+        
+        The (holding_cost, stockout_cost, horizon) product of `axes` is dealt
+        round-robin into one chunk per pool worker; each chunk reuses one
+        resolved demand matrix and one set of ScenarioBanks (see
+        _sweep_worker / _group_sweep_worker). Returns a compact cost-surface
+        table instead of per-point reports, with no LLM interpretation.
+        """
+        import asyncio
+        import functools
+        import os
+        loop = asyncio.get_event_loop()
+        start_time = time.time()
         
-        for _ in range(horizon):
-            demand = self._sample_demand(demand_history)
-            state = state.transition(0, demand, holding_cost, stockout_cost)
-        return state.total_cost
+        points = list(itertools.product(axes["holding_cost"], axes["stockout_cost"], axes["horizon"]))
+        n_chunks = max(1, min(len(points), settings.MCTS_POOL_WORKERS or os.cpu_count() or 1))
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(
+                self._pool,
+                functools.partial(worker, points[i::n_chunks], eval_replications=eval_replications, **worker_kwargs)
+            )
+            for i in range(n_chunks)
+        ])
+        rows = sorted(
+            (row for chunk in chunks for row in chunk),
+            key=lambda r: (r["holding_cost"], r["stockout_cost"], r["horizon"])
+        )
+        columns = [
+            "holding_cost", "stockout_cost", "horizon", "reorder_point", "order_quantity",
+            "safety_stock", "baseline_cost", "optimized_cost", "savings_pct", "savings_std_error"
+        ]
+        return AgentResponse(
+            agent_name=self.name,
+            success=True,
+            data={
+                "sweep": {
+                    "axes": axes,
+                    "policy": policy,
+                    "columns": columns,
+                    "rows": [[row[c] for c in columns] for row in rows]
+                },
+                "simulation_stats": {
+                    "mode": "sweep",
+                    "grid_points": len(rows),
+                    "chunks": n_chunks,
+                    "eval_replications": eval_replications,
+                    "computation_time_ms": (time.time() - start_time) * 1000
+                }
+            }
+        )
 
-    def _calculate_multi_baseline_cost(
-        self,
-        sku_stocks: Dict[str, float],
-        sku_demands: Dict[str, np.ndarray],
-        holding_costs: Dict[str, float],
-        stockout_costs: Dict[str, float],
-        horizon: int,
-        seed: int = 42
-    ) -> float:
-        """Calculate cost with naive policy for multiple SKUs"""
-        np.random.seed(seed)
-        total_cost = 0.0
-        for sku in sku_stocks.keys():
-            stock = sku_stocks[sku]
-            demand_history = sku_demands[sku]
-            hc = holding_costs.get(sku, 5.0)
-            sc = stockout_costs.get(sku, 50.0)
-            for _ in range(horizon):
-                demand = float(np.random.choice(demand_history))
-                stockout = max(0.0, demand - stock)
-                stock = max(0.0, stock - demand)
-                total_cost += (hc * stock) + (sc * stockout)
-        return total_cost
-    
-    def _calculate_optimized_cost(
+    async def _run_singleton_batch(
         self,
-        current_stock: float,
-        demand_history: np.ndarray,
-        holding_cost: float,
-        stockout_cost: float,
+        groups: List[Dict[str, Any]],
         horizon: int,
-        reorder_point: float,
-        order_quantity: float,
-        seed: int = 42
-    ) -> float:
-        """Calculate true expected cost simulating the policy deterministically"""
-        np.random.seed(seed)
-        state = InventoryState(current_stock=current_stock, day=0)
-        for _ in range(horizon):
-            order_qty = order_quantity if state.current_stock <= reorder_point else 0.0
-            demand = self._sample_demand(demand_history)
-            state = state.transition(order_qty, demand, holding_cost, stockout_cost)
-        return state.total_cost
-
-    def _calculate_multi_optimized_cost(
+        deadline_s: float = None,
+        n_scenarios: int = 256,
+        time_budget_s: float = 4.5,
+        eval_replications: int = 2000
+    ) -> List[Optional[Dict]]:
+        """
+        Optimize every singleton group in one pool worker (_singleton_batch_worker).
+        
+        Shares the Multi-SKU deadline; if the batch misses it, every
+        singleton comes back as None and falls back like a timed-out group.
+        """
+        import asyncio
+        import functools
+        if not groups:
+            return []
+        loop = asyncio.get_event_loop()
+        deadline_s = deadline_s if deadline_s is not None else settings.MCTS_GROUP_DEADLINE_S
+        
+        logger.info(f"Optimizing {len(groups)} unassociated SKUs as one independent batch...")
+        # The worker stops its own search at the deadline; cancelling a running future does not
+        future = loop.run_in_executor(
+            self._pool,
+            functools.partial(
+                _singleton_batch_worker,
+                **_merge_singleton_inputs(groups),
+                horizon=horizon,
+                seed=42,
+                n_scenarios=n_scenarios,
+                time_budget_s=min(time_budget_s, deadline_s),
+                eval_replications=eval_replications,
+                chunk_size=settings.MCTS_SINGLETON_CHUNK,
+                deadline_at=time.time() + deadline_s
+            )
+        )
+        try:
+            return await asyncio.wait_for(future, timeout=deadline_s)
+        except asyncio.TimeoutError:
+            logger.warning(f"Singleton batch missed the {deadline_s}s deadline")
+        except Exception as e:
+            logger.warning(f"Singleton batch failed: {e}")
+        return [None] * len(groups)
+
+    async def _run_group_searches(
         self,
-        sku_stocks: Dict[str, float],
-        sku_demands: Dict[str, np.ndarray],
-        holding_costs: Dict[str, float],
-        stockout_costs: Dict[str, float],
+        groups: List[Dict[str, Any]],
         horizon: int,
-        reorder_points: Dict[str, float],
-        order_quantities: Dict[str, float],
-        seed: int = 42
-    ) -> float:
-        """Calculate cost with optimized coordinated policy for multiple SKUs"""
-        np.random.seed(seed)
-        state = MultiInventoryState(
-            sku_stocks=dict(sku_stocks),
-            day=0,
-            pending_orders={sku: [] for sku in sku_stocks.keys()}
+        iterations: int,
+        session_id: str = None,
+        deadline_s: float = None,
+        n_scenarios: int = 256,
+        time_budget_s: float = 4.5,
+        use_cache: bool = True,
+        eval_replications: int = 2000,
+        rollout_depth: int = 0,
+        engine: str = "mcts"
+    ) -> List[Optional[Dict]]:
+        """
+        Dispatch every SKU group to the process pool at once.
+        
+        Each group is searched and costed inside a worker
+        (_multi_sku_group_worker, with the given `engine`) under its own
+        anytime budget, capped by the time left to the global deadline so
+        searches already running stop themselves. Results are streamed as
+        they complete; groups not back when the deadline passes are
+        cancelled and come back as None.
+        
+        Groups carrying a "cache_key" are served from optimizer_cache when an
+        identical search was already run, and stored once they complete.
+        """
+        import asyncio
+        import functools
+        loop = asyncio.get_event_loop()
+        deadline_s = deadline_s if deadline_s is not None else settings.MCTS_GROUP_DEADLINE_S
+        
+        logger.info(f"Dispatching {len(groups)} Multi-SKU group searches (deadline {deadline_s}s)...")
+        if session_id:
+            await streaming_service.publish_agent_progress(
+                session_id, self.name, 10, "Starting Multi-SKU MCTS Simulation...",
+                {"groups": len(groups)}
+            )
+        
+        channel = self._progress_channel() if session_id else None
+        searches_done = asyncio.Event()
+        relay = (
+            asyncio.create_task(self._relay_progress(channel, session_id, time_budget_s, searches_done))
+            if channel is not None else None
         )
-        for _ in range(horizon):
-            should_order = False
-            for sku in sku_stocks.keys():
-                effective_stock = state.sku_stocks[sku] + sum(qty for _, qty in state.pending_orders.get(sku, []))
-                if effective_stock <= reorder_points[sku]:
-                    should_order = True
-                    break
-                    
-            order_qtys = {}
-            for sku in sku_stocks.keys():
-                order_qtys[sku] = order_quantities[sku] if should_order else 0.0
-                
-            demands = {sku: float(np.random.choice(sku_demands[sku])) for sku in sku_stocks.keys()}
-            state = state.transition(order_qtys, demands, holding_costs, stockout_costs)
-        return state.total_cost
-    
-    def _calculate_bullwhip_effect(self, demand_data: np.ndarray, solution: Dict) -> Dict:
-        """Calculate Bullwhip Effect metrics using a real 4-tier supply chain simulation"""
-        demand_data = np.asarray(demand_data, dtype=float)
-        demand_variance = np.var(demand_data)
-        if demand_variance == 0:
-            demand_variance = 1.0
-            
-        mean_demand = np.mean(demand_data)
-        if mean_demand <= 0:
-            mean_demand = 1.0
-
-        def simulate_tier(demand_series: np.ndarray, reorder_point: float, order_quantity: float, lead_time_mean: int) -> np.ndarray:
-            stock = order_quantity * 1.5
-            pending = []
-            orders = []
-            
-            for day in range(len(demand_series)):
-                arrived = sum(qty for arr_day, qty in pending if arr_day <= day)
-                pending = [(arr_day, qty) for arr_day, qty in pending if arr_day > day]
-                stock += arrived
-                
-                demand = demand_series[day]
-                stock = max(0.0, stock - demand)
-                
-                inv_position = stock + sum(qty for _, qty in pending)
-                if inv_position <= reorder_point:
-                    lead_time = int(np.random.randint(max(1, lead_time_mean - 1), lead_time_mean + 2))
-                    pending.append((day + lead_time, order_quantity))
-                    orders.append(order_quantity)
-                else:
-                    orders.append(0.0)
-            return np.array(orders)
-
-        # Before (Naive (s, Q) policy at all levels, reacting locally)
-        ret_reorder = mean_demand * 1.2
-        ret_qty = mean_demand * 1.5
-        retailer_orders_before = simulate_tier(demand_data, ret_reorder, ret_qty, lead_time_mean=2)
         
-        dist_mean = np.mean(retailer_orders_before) if np.mean(retailer_orders_before) > 0 else mean_demand
-        dist_reorder = dist_mean * 1.2
-        dist_qty = dist_mean * 1.5
-        distributor_orders_before = simulate_tier(retailer_orders_before, dist_reorder, dist_qty, lead_time_mean=2)
+        results: List[Optional[Dict]] = [None] * len(groups)
+        if use_cache:
+            for idx, g in enumerate(groups):
+                if g.get("cache_key"):
+                    cached, _ = await optimizer_cache.lookup(g["cache_key"])
+                    if cached is not None:
+                        # JSON turned integer SKU labels into strings
+                        cached = optimizer_cache.restore_keys(cached, g["demands"].keys())
+                    results[idx] = cached
         
-        whole_mean = np.mean(distributor_orders_before) if np.mean(distributor_orders_before) > 0 else mean_demand
-        whole_reorder = whole_mean * 1.2
-        whole_qty = whole_mean * 1.5
-        wholesaler_orders_before = simulate_tier(distributor_orders_before, whole_reorder, whole_qty, lead_time_mean=3)
+        # Running futures cannot be cancelled, so every search is also capped by the deadline itself
+        deadline_at = time.time() + deadline_s
+        futures = {
+            loop.run_in_executor(
+                self._pool,
+                functools.partial(
+                    _multi_sku_group_worker,
+                    g["stocks"],
+                    g["demands"],
+                    g["holding_costs"],
+                    g["stockout_costs"],
+                    horizon,
+                    iterations,
+                    seed=42,
+                    n_scenarios=n_scenarios,
+                    time_budget_s=min(time_budget_s, deadline_s),
+                    progress=channel,
+                    search_id=idx,
+                    eval_replications=eval_replications,
+                    rollout_depth=rollout_depth,
+                    engine=engine,
+                    deadline_at=deadline_at
+                )
+            ): idx
+            for idx, g in enumerate(groups)
+            if results[idx] is None
+        }
+        pending = set(futures)
+        deadline = loop.time() + deadline_s
+        completed = len(groups) - len(futures)  # served from cache
         
-        mfg_mean = np.mean(wholesaler_orders_before) if np.mean(wholesaler_orders_before) > 0 else mean_demand
-        mfg_reorder = mfg_mean * 1.2
-        mfg_qty = mfg_mean * 1.5
-        manufacturer_orders_before = simulate_tier(wholesaler_orders_before, mfg_reorder, mfg_qty, lead_time_mean=4)
-
-        # Variance ratios before
-        var_consumer = np.var(demand_data) if np.var(demand_data) > 0 else 1.0
-        r_before = np.var(retailer_orders_before) / var_consumer
-        d_before = np.var(distributor_orders_before) / var_consumer
-        w_before = np.var(wholesaler_orders_before) / var_consumer
-        m_before = np.var(manufacturer_orders_before) / var_consumer
-
-        # After (Optimized policy at all levels, sharing visibility)
-        opt_reorder = float(solution.get("reorder_point", mean_demand * 1.5))
-        opt_qty = float(solution.get("order_quantity", mean_demand * 2.0))
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for fut in done:
+                idx = futures[fut]
+                completed += 1
+                try:
+                    results[idx] = fut.result()
+                except Exception as e:
+                    logger.warning(f"Multi-SKU group {idx + 1} search failed: {e}")
+                    continue
+                if use_cache and groups[idx].get("cache_key"):
+                    await optimizer_cache.store(groups[idx]["cache_key"], results[idx])
+                if session_id:
+                    await streaming_service.publish_agent_progress(
+                        session_id, self.name, 10 + 80 * completed / len(groups),
+                        f"Group {idx + 1}/{len(groups)} optimized",
+                        {
+                            "group_id": idx + 1,
+                            "skus": list(groups[idx]["demands"].keys()),
+                            "order_quantities": results[idx]["solution"]["order_quantities"],
+                            "baseline_cost": results[idx]["baseline_cost"],
+                            "optimized_cost": results[idx]["optimized_cost"]
+                        }
+                    )
         
-        retailer_orders_after = simulate_tier(demand_data, opt_reorder, opt_qty, lead_time_mean=2)
-        distributor_orders_after = simulate_tier(demand_data, opt_reorder, opt_qty, lead_time_mean=2)
-        wholesaler_orders_after = simulate_tier(demand_data, opt_reorder, opt_qty, lead_time_mean=3)
-        manufacturer_orders_after = simulate_tier(demand_data, opt_reorder, opt_qty, lead_time_mean=4)
-
-        # Variance ratios after
-        r_after = np.var(retailer_orders_after) / var_consumer
-        d_after = np.var(distributor_orders_after) / var_consumer
-        w_after = np.var(wholesaler_orders_after) / var_consumer
-        m_after = np.var(manufacturer_orders_after) / var_consumer
-
-        # Clean-up and clamp values to ensure realism
-        r_before = max(1.1, r_before)
-        d_before = max(1.3, d_before)
-        w_before = max(1.6, w_before)
-        m_before = max(2.0, m_before)
+        if pending:
+            logger.warning(f"{len(pending)} Multi-SKU group searches missed the {deadline_s}s deadline")
+            for fut in pending:
+                fut.cancel()
+        searches_done.set()
+        if relay is not None:
+            await relay
         
-        r_after = max(1.0, min(r_after, r_before - 0.05))
-        d_after = max(1.0, min(d_after, d_before - 0.1))
-        w_after = max(1.0, min(w_after, w_before - 0.2))
-        m_after = max(1.0, min(m_after, m_before - 0.3))
+        if session_id:
+            await streaming_service.publish_agent_progress(
+                session_id, self.name, 100, "Multi-SKU MCTS complete",
+                {"completed_groups": completed, "timed_out_groups": len(pending)}
+            )
+        return results
         
-        overall_before = (r_before + d_before + w_before + m_before) / 4.0
-        overall_after = (r_after + d_after + w_after + m_after) / 4.0
-        improvement = ((overall_before - overall_after) / overall_before) * 100
-
+    def _presolved_solution(
+        self,
+        current_stock: float,
+        demand_history: np.ndarray,
+        holding_cost: float,
+        stockout_cost: float,
+        horizon: int
+    ) -> Dict:
+        """Quick mode: closed-form (s, Q) policy in the same shape as an MCTS solution."""
+        start_time = time.time()
+        policy = presolve(demand_history, holding_cost, stockout_cost)
         return {
-            "before": float(overall_before),
-            "after": float(overall_after),
-            "improvement_percentage": float(max(0.0, improvement)),
-            "tiers": {
-                "retailer": {"before": float(r_before), "after": float(r_after)},
-                "distributor": {"before": float(d_before), "after": float(d_after)},
-                "wholesaler": {"before": float(w_before), "after": float(w_after)},
-                "manufacturer": {"before": float(m_before), "after": float(m_after)}
-            }
+            "reorder_point": float(policy.reorder_point[0]),
+            "order_quantity": float(policy.order_quantity[0]),
+            "safety_stock": float(policy.safety_stock[0]),
+            "expected_cost": float(policy.cost_to_go(current_stock, 0.0, horizon)),
+            "explored_states": 0,
+            "computation_time_ms": (time.time() - start_time) * 1000,
+            "critical_ratio": float(policy.critical_ratio[0]),
+            "base_stock": float(policy.base_stock[0])
         }
+
+    async def _run_bullwhip(
+        self,
+        demand_data: np.ndarray,
+        solution: Dict,
+        holding_cost: float,
+        stockout_cost: float
+    ) -> Dict:
+        """Optimize the echelon chain and measure bullwhip in the process pool."""
+        import asyncio
+        import functools
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._pool,
+            functools.partial(
+                _echelon_worker,
+                np.asarray(demand_data, dtype=float),
+                dict(solution),
+                float(holding_cost),
+                float(stockout_cost),
+                replications=max(2, int(settings.MCTS_BULLWHIP_REPLICATIONS)),
+                search_replications=settings.MCTS_ECHELON_SEARCH_REPLICATIONS,
+                time_budget_s=settings.MCTS_ECHELON_TIME_BUDGET_S
+            )
+        )
     
     async def _get_interpretation(
         self,
@@ -909,6 +1999,12 @@ class MCTSOptimizerAgent(BaseAgent):
             "bullwhip_reduction": f"{bullwhip_metrics['improvement_percentage']:.1f}%",
             "safety_stock": f"{solution['safety_stock']:.0f} units"
         }
+        if "chain_cost" in bullwhip_metrics:
+            summary["supply_chain_cost_savings"] = f"{bullwhip_metrics['chain_cost']['savings_pct']:.1f}%"
+            summary["tier_policies"] = {
+                tier: f"Order {m['policy']['order_quantity']:.0f} at {m['policy']['reorder_point']:.0f}"
+                for tier, m in bullwhip_metrics["tiers"].items()
+            }
         
         # Inject upstream forecast context if available
         forecast_context = ""
@@ -962,6 +2058,8 @@ Keep it actionable and non-technical."""
         
     async def process(self, request: AgentRequest) -> AgentResponse:
         """Main process method - handles single and multi-SKU optimization"""
+        import asyncio
+        import functools
         try:
             if "dataset" not in request.context:
                 return AgentResponse(
@@ -976,6 +2074,44 @@ Keep it actionable and non-technical."""
             stockout_cost = request.parameters.get("stockout_cost", 50)
             horizon = request.parameters.get("horizon", 30)
             iterations = request.parameters.get("iterations", 2000)
+            parallel_searches = request.parameters.get("parallel_searches", settings.MCTS_PARALLEL_SEARCHES)
+            n_scenarios = max(1, int(request.parameters.get("scenarios", settings.MCTS_SCENARIOS)))
+            # Anytime search budget per search (seconds); long batch runs can raise it
+            time_budget_s = float(request.parameters.get("deadline_s", settings.MCTS_TIME_BUDGET_S))
+            progress_every = max(1, int(request.parameters.get("progress_every", settings.MCTS_PROGRESS_EVERY)))
+            transposition_entries = max(0, int(request.parameters.get("transpositions", settings.MCTS_TRANSPOSITION_ENTRIES)))
+            use_cache = bool(request.parameters.get("use_cache", True))
+            eval_replications = max(2, int(request.parameters.get("eval_replications", settings.MCTS_EVAL_REPLICATIONS)))
+            association_top_k = request.parameters.get("association_top_k")
+            rollout_depth = max(0, int(request.parameters.get("rollout_depth", settings.MCTS_ROLLOUT_DEPTH)))
+            batch_singletons = bool(request.parameters.get("batch_singletons", settings.MCTS_BATCH_SINGLETONS))
+            # "search" runs MCTS; "quick" returns the closed-form pre-solved policy only;
+            # "sweep" evaluates a what-if grid (parameters["sweep"]) and returns a cost surface
+            mode = request.parameters.get("mode", "search")
+            # Search engine: "mcts" (tree search) or "cem" (cross-entropy policy search)
+            engine = request.parameters.get("engine", "mcts")
+            if engine not in ("mcts", "cem"):
+                return AgentResponse(
+                    agent_name=self.name,
+                    success=False,
+                    error=f"Unknown optimizer engine '{engine}' (expected 'mcts' or 'cem')"
+                )
+            
+            # "sweep": what-if grid over costs / horizon; unspecified axes keep the request's value
+            if mode == "sweep":
+                spec = request.parameters.get("sweep") or {}
+                sweep_axes = {
+                    "holding_cost": [float(v) for v in spec.get("holding_cost", [holding_cost])],
+                    "stockout_cost": [float(v) for v in spec.get("stockout_cost", [stockout_cost])],
+                    "horizon": [max(1, int(v)) for v in spec.get("horizon", [horizon])]
+                }
+                grid_points = math.prod(len(v) for v in sweep_axes.values())
+                if grid_points == 0 or grid_points > settings.MCTS_SWEEP_MAX_POINTS:
+                    return AgentResponse(
+                        agent_name=self.name,
+                        success=False,
+                        error=f"Sweep grid has {grid_points} points (allowed: 1-{settings.MCTS_SWEEP_MAX_POINTS})"
+                    )
             
             logger.info(f"Starting MCTS with {iterations} iterations, {horizon}-day horizon")
             
@@ -1002,6 +2138,14 @@ Keep it actionable and non-technical."""
             if sku_col and df[sku_col].nunique() > 1:
                 logger.info(f"Multi-SKU scenario detected with column '{sku_col}' ({df[sku_col].nunique()} unique values)")
                 
+                # Multi-SKU sweeps re-price pre-solved group policies; there is no per-point search to swap
+                if mode == "sweep" and engine == "cem":
+                    return AgentResponse(
+                        agent_name=self.name,
+                        success=False,
+                        error="Sweep mode supports engine 'cem' for single-SKU data only; multi-SKU sweeps use pre-solved policies"
+                    )
+                
                 # Pivot or group values to extract demand per SKU per date
                 numeric_cols = df.select_dtypes(include=[np.number]).columns
                 value_col = None
@@ -1020,9 +2164,22 @@ Keep it actionable and non-technical."""
                         error="No numeric demand column detected for Multi-SKU optimization"
                     )
                 
-                # Mine co-occurrences
-                associations = self._mine_sku_associations(df, date_col, sku_col)
-                sku_groups = self._form_sku_groups(df, sku_col, associations)
+                # Mine co-occurrences (thresholds resolved once so the response reports them)
+                mining = {
+                    "min_support": settings.MCTS_ASSOC_MIN_SUPPORT,
+                    "min_lift": settings.MCTS_ASSOC_MIN_LIFT,
+                    "top_k": settings.MCTS_ASSOC_TOP_K if association_top_k is None else association_top_k
+                }
+                joint_min_lift = settings.MCTS_JOINT_MIN_LIFT if batch_singletons else 0.0
+                associations = self._mine_sku_associations(df, date_col, sku_col, **mining)
+                sku_groups = self._form_sku_groups(
+                    df, sku_col, associations, pair_remaining=not batch_singletons,
+                    min_lift=joint_min_lift
+                )
+                # Only associated groups pay for a joint search; singletons are optimized as one batch
+                singleton_idx = [i for i, g in enumerate(sku_groups) if len(g) == 1] if batch_singletons else []
+                joint_idx = [i for i in range(len(sku_groups)) if i not in set(singleton_idx)]
+                group_iterations = max(1, iterations // max(1, len(joint_idx)))
                 
                 # Get aggregated demand histories
                 pivoted = df.groupby([date_col, sku_col])[value_col].sum().unstack(fill_value=0.0)
@@ -1033,59 +2190,127 @@ Keep it actionable and non-technical."""
                 total_safety_stock = 0.0
                 total_baseline_cost = 0.0
                 total_optimized_cost = 0.0
+                total_explored_states = 0
+                savings_variance = 0.0  # groups are evaluated independently, so variances add
                 
                 # Fetch upstream Forecaster findings
                 forecast_findings = await self.get_upstream_findings(
                     request.workflow_id, "Forecaster"
                 )
                 
-                for idx, group in enumerate(sku_groups):
-                    group_demands = {}
-                    group_stocks = {}
-                    group_hc = {}
-                    group_sc = {}
-                    
-                    for sku in group:
-                        demand_data = pivoted[sku].values
-                        
-                        # Apply Forecaster ratio scale
-                        if forecast_findings and "predictions_summary" in forecast_findings:
-                            preds = forecast_findings["predictions_summary"].get(sku)
-                            if preds:
-                                try:
-                                    start_val = max(0.01, float(preds.get("start_value", 1.0)))
-                                    end_val = max(0.01, float(preds.get("end_value", 1.0)))
-                                    ratio = end_val / start_val
-                                    demand_data = demand_data * ratio
-                                except Exception as e:
-                                    logger.warning(f"Failed to scale {sku} demand: {e}")
+                # Demand each SKU is optimized against: its own (reconciled) forecast when the
+                # Forecaster published per-SKU predictions, else its history
+                demand_matrix = self._forecast_demand_matrix(
+                    pivoted, (forecast_findings or {}).get("sku_predictions", {})
+                )
+                
+                # Publish the demand matrix once; workers get (segment, row) references
+                shared_demand = SharedDemandMatrix(demand_matrix.values.T, list(demand_matrix.columns))
+                try:
+                    group_inputs = []
+                    for group in sku_groups:
+                        group_demands = {}
+                        group_stocks = {}
+                        group_hc = {}
+                        group_sc = {}
                         
-                        group_demands[sku] = demand_data
-                        group_stocks[sku] = float(np.mean(demand_data) * 2)
-                        group_hc[sku] = float(holding_cost)
-                        group_sc[sku] = float(stockout_cost)
+                        for sku in group:
+                            group_demands[sku] = shared_demand.ref(sku)
+                            group_stocks[sku] = float(np.mean(demand_matrix[sku].values) * 2)
+                            group_hc[sku] = float(holding_cost)
+                            group_sc[sku] = float(stockout_cost)
                         
-                    # Run Multi-SKU MCTS
-                    opt_solution = await self._run_multi_mcts(
-                        sku_stocks=group_stocks,
-                        sku_demands=group_demands,
-                        holding_costs=group_hc,
-                        stockout_costs=group_sc,
-                        horizon=horizon,
-                        iterations=iterations // len(sku_groups),
-                        session_id=request.session_id
-                    )
+                        group_inputs.append({
+                            "stocks": group_stocks,
+                            "demands": group_demands,
+                            "holding_costs": group_hc,
+                            "stockout_costs": group_sc,
+                            "cache_key": optimizer_cache.fingerprint(
+                                [demand_matrix[sku].values for sku in group_demands],
+                                kind="group", stocks={str(sku): v for sku, v in group_stocks.items()},
+                                holding_cost=holding_cost, stockout_cost=stockout_cost, horizon=horizon,
+                                iterations=group_iterations, n_scenarios=n_scenarios,
+                                eval_replications=eval_replications, action_space="presolved",
+                                rollout_depth=rollout_depth, engine=engine, time_budget_s=time_budget_s,
+                                deadline_s=request.parameters.get("group_deadline_s", settings.MCTS_GROUP_DEADLINE_S)
+                            )
+                        })
                     
-                    group_baseline = self._calculate_multi_baseline_cost(
-                        group_stocks, group_demands, group_hc, group_sc, horizon
-                    )
+                    if mode == "sweep":
+                        # Groups are re-priced per grid point with pre-solved policies
+                        return await self._run_sweep(
+                            _group_sweep_worker, sweep_axes, "presolved", eval_replications,
+                            groups=group_inputs
+                        )
                     
-                    group_optimized = self._calculate_multi_optimized_cost(
-                        group_stocks, group_demands, group_hc, group_sc, horizon,
-                        opt_solution["reorder_points"], opt_solution["order_quantities"]
-                    )
+                    # Run all Multi-SKU group searches concurrently (or pre-solve them in quick mode)
+                    search_start = time.time()
+                    joint_inputs = [group_inputs[i] for i in joint_idx]
+                    singleton_inputs = [group_inputs[i] for i in singleton_idx]
+                    if mode == "quick":
+                        # Pre-solved, but the replicated evaluations still run in the pool
+                        loop = asyncio.get_event_loop()
+                        joint_results, singleton_results = await asyncio.gather(
+                            loop.run_in_executor(self._pool, functools.partial(
+                                _presolved_group_results, joint_inputs, horizon,
+                                eval_replications=eval_replications
+                            )),
+                            loop.run_in_executor(self._pool, functools.partial(
+                                _singleton_batch_worker, **_merge_singleton_inputs(singleton_inputs),
+                                horizon=horizon, eval_replications=eval_replications, search=False,
+                                chunk_size=settings.MCTS_SINGLETON_CHUNK
+                            ))
+                        )
+                    else:
+                        joint_results, singleton_results = await asyncio.gather(
+                            self._run_group_searches(
+                                joint_inputs,
+                                horizon=horizon,
+                                iterations=group_iterations,
+                                session_id=request.session_id,
+                                deadline_s=request.parameters.get("group_deadline_s"),
+                                n_scenarios=n_scenarios,
+                                time_budget_s=time_budget_s,
+                                use_cache=use_cache,
+                                eval_replications=eval_replications,
+                                rollout_depth=rollout_depth,
+                                engine=engine
+                            ),
+                            self._run_singleton_batch(
+                                singleton_inputs,
+                                horizon=horizon,
+                                deadline_s=request.parameters.get("group_deadline_s"),
+                                n_scenarios=n_scenarios,
+                                time_budget_s=time_budget_s,
+                                eval_replications=eval_replications
+                            )
+                        )
+                    group_results = [None] * len(sku_groups)
+                    for i, result in zip(joint_idx, joint_results):
+                        group_results[i] = result
+                    for i, result in zip(singleton_idx, singleton_results):
+                        group_results[i] = result
+                    search_time_ms = (time.time() - search_start) * 1000
+                    
+                    # Fallbacks for timed-out groups read from the segment too
+                    fallback_solutions = [
+                        _heuristic_group_solution(inputs["demands"]) if result is None else None
+                        for inputs, result in zip(group_inputs, group_results)
+                    ]
+                finally:
+                    shared_demand.close()
                     
-                    group_optimized = min(group_optimized, group_baseline * 0.99)
+                for idx, (group, fallback, result) in enumerate(zip(sku_groups, fallback_solutions, group_results)):
+                    if result is None:
+                        # Missed the deadline: fall back to mean-demand policy, excluded from savings
+                        opt_solution = fallback
+                        group_baseline = group_optimized = 0.0
+                    else:
+                        opt_solution = result["solution"]
+                        group_baseline = result["baseline_cost"]
+                        group_optimized = result["optimized_cost"]
+                        savings_variance += result.get("evaluation", {}).get("savings", {}).get("std_error", 0.0) ** 2
+                        total_explored_states += opt_solution.get("explored_states", 0)
                     
                     skus_rec = []
                     for sku in group:
@@ -1105,8 +2330,13 @@ Keep it actionable and non-technical."""
                     sku_groups_list.append({
                         "group_id": idx + 1,
                         "skus": skus_rec,
-                        "group_rationale": f"Co-occurrence group optimized together to minimize joint logistics overhead",
-                        "combined_savings_pct": float(savings_pct)
+                        "group_rationale": (
+                            "No meaningful co-occurrence; optimized independently in the singleton batch"
+                            if idx in singleton_idx else
+                            "Co-occurrence group optimized together to minimize joint logistics overhead"
+                        ),
+                        "combined_savings_pct": float(savings_pct),
+                        "status": "optimized" if result is not None else "deadline_exceeded"
                     })
                     
                     total_baseline_cost += group_baseline
@@ -1121,8 +2351,8 @@ Keep it actionable and non-technical."""
                 
                 # Aggregate overall demand for bullwhip
                 overall_demand = pivoted.sum(axis=1).values
-                bullwhip_metrics = self._calculate_bullwhip_effect(
-                    overall_demand, representative_solution
+                bullwhip_metrics = await self._run_bullwhip(
+                    overall_demand, representative_solution, holding_cost, stockout_cost
                 )
                 
                 # Formulate final response data structure
@@ -1133,15 +2363,24 @@ Keep it actionable and non-technical."""
                     "sku_groups": sku_groups_list
                 }
                 
+                savings_amount = total_baseline_cost - total_optimized_cost
+                savings_se = math.sqrt(savings_variance)
                 expected_savings = {
-                    "amount_inr": float(total_baseline_cost - total_optimized_cost),
-                    "percentage": float(((total_baseline_cost - total_optimized_cost) / total_baseline_cost) * 100) if total_baseline_cost > 0 else 0.0
+                    "amount_inr": float(savings_amount),
+                    "percentage": float((savings_amount / total_baseline_cost) * 100) if total_baseline_cost > 0 else 0.0,
+                    "std_error": float(savings_se),
+                    "ci_95": [float(savings_amount - 1.96 * savings_se), float(savings_amount + 1.96 * savings_se)]
                 }
                 
                 sim_stats = {
+                    "mode": mode,
+                    "engine": engine,
                     "iterations": iterations,
-                    "explored_states": int(total_qty * 1.5),  # representative stat
-                    "computation_time_ms": 1500.0,
+                    "explored_states": int(total_explored_states),
+                    "computation_time_ms": float(search_time_ms),
+                    "timed_out_groups": sum(1 for r in group_results if r is None),
+                    "joint_groups": len(joint_idx),
+                    "batched_singletons": len(singleton_idx),
                     "baseline_cost": float(total_baseline_cost),
                     "optimized_cost": float(total_optimized_cost)
                 }
@@ -1164,8 +2403,9 @@ Keep it actionable and non-technical."""
                     "expected_savings": expected_savings,
                     "bullwhip_reduction": bullwhip_metrics,
                     "sku_associations": {
-                        "method": "apriori",
-                        "min_support": 0.1,
+                        "method": "sparse_cooccurrence",
+                        **mining,
+                        "joint_min_lift": joint_min_lift,
                         "associations": associations[:10]
                     },
                     "simulation_stats": sim_stats,
@@ -1216,30 +2456,67 @@ Keep it actionable and non-technical."""
                         except Exception as e:
                             logger.warning(f"Failed to scale demand by Prophet forecast: {e}")
 
-                optimal_solution = await self._run_mcts(
-                    current_stock=current_stock,
-                    demand_history=demand_data,
-                    holding_cost=holding_cost,
-                    stockout_cost=stockout_cost,
-                    horizon=horizon,
-                    iterations=iterations,
-                    session_id=request.session_id
-                )
+                if mode == "sweep":
+                    with SharedDemandMatrix(demand_data) as shared:
+                        return await self._run_sweep(
+                            _sweep_worker, sweep_axes, "cem" if engine == "cem" else "presolved",
+                            eval_replications,
+                            current_stock=current_stock,
+                            demand_history=shared.ref(),
+                            engine="cem" if engine == "cem" else "quick",
+                            n_scenarios=n_scenarios,
+                            time_budget_s=time_budget_s
+                        )
                 
-                baseline_cost = self._calculate_baseline_cost(
-                    current_stock, demand_data, holding_cost, stockout_cost, horizon
-                )
+                if mode == "quick":
+                    optimal_solution = self._presolved_solution(
+                        current_stock, demand_data, holding_cost, stockout_cost, horizon
+                    )
+                elif engine == "cem":
+                    optimal_solution = await self._run_policy_search(
+                        current_stock=current_stock,
+                        demand_history=demand_data,
+                        holding_cost=holding_cost,
+                        stockout_cost=stockout_cost,
+                        horizon=horizon,
+                        session_id=request.session_id,
+                        n_scenarios=n_scenarios,
+                        time_budget_s=time_budget_s
+                    )
+                else:
+                    optimal_solution = await self._run_mcts(
+                        current_stock=current_stock,
+                        demand_history=demand_data,
+                        holding_cost=holding_cost,
+                        stockout_cost=stockout_cost,
+                        horizon=horizon,
+                        iterations=iterations,
+                        session_id=request.session_id,
+                        parallel_searches=parallel_searches,
+                        n_scenarios=n_scenarios,
+                        time_budget_s=time_budget_s,
+                        progress_every=progress_every,
+                        transposition_entries=transposition_entries,
+                        use_cache=use_cache,
+                        rollout_depth=rollout_depth
+                    )
                 
-                optimized_cost = self._calculate_optimized_cost(
-                    current_stock, demand_data, holding_cost, stockout_cost, horizon,
-                    optimal_solution["reorder_point"], optimal_solution["order_quantity"]
+                # Replicated, paired evaluation of baseline vs. recommended policy, in the pool
+                evaluation = await asyncio.get_event_loop().run_in_executor(
+                    self._pool,
+                    functools.partial(
+                        _evaluate_policies_worker,
+                        current_stock, demand_data, holding_cost, stockout_cost, horizon,
+                        optimal_solution["reorder_point"], optimal_solution["order_quantity"],
+                        replications=eval_replications
+                    )
                 )
+                baseline_cost = evaluation["baseline"]["mean"]
+                optimal_solution["expected_cost"] = evaluation["optimized"]["mean"]
+                savings = evaluation["savings"]
                 
-                expected_cost = min(optimized_cost, baseline_cost * 0.99) if optimized_cost > 0 else optimal_solution["expected_cost"]
-                optimal_solution["expected_cost"] = expected_cost
-                
-                bullwhip_metrics = self._calculate_bullwhip_effect(
-                    demand_data, optimal_solution
+                bullwhip_metrics = await self._run_bullwhip(
+                    demand_data, optimal_solution, holding_cost, stockout_cost
                 )
                 
                 interpretation = await self._get_interpretation(
@@ -1254,16 +2531,28 @@ Keep it actionable and non-technical."""
                         "safety_stock": float(optimal_solution["safety_stock"])
                     },
                     "expected_savings": {
-                        "amount_inr": float(baseline_cost - optimal_solution["expected_cost"]),
-                        "percentage": float(((baseline_cost - optimal_solution["expected_cost"]) / baseline_cost) * 100)
+                        "amount_inr": float(savings["mean"]),
+                        "percentage": float((savings["mean"] / baseline_cost) * 100) if baseline_cost > 0 else 0.0,
+                        "std_error": float(savings["std_error"]),
+                        "ci_95": [
+                            float(savings["mean"] - 1.96 * savings["std_error"]),
+                            float(savings["mean"] + 1.96 * savings["std_error"])
+                        ]
                     },
                     "bullwhip_reduction": bullwhip_metrics,
                     "simulation_stats": {
+                        "mode": mode,
+                        "engine": engine,
                         "iterations": iterations,
                         "explored_states": optimal_solution["explored_states"],
+                        "rollouts": optimal_solution.get("rollouts", 0),
                         "computation_time_ms": optimal_solution["computation_time_ms"],
                         "baseline_cost": float(baseline_cost),
-                        "optimized_cost": float(optimal_solution["expected_cost"])
+                        "optimized_cost": float(optimal_solution["expected_cost"]),
+                        "parallel_searches": optimal_solution.get("parallel_searches", 1),
+                        "search_agreement": optimal_solution.get("search_agreement", 1.0),
+                        "policy_evaluation": evaluation,
+                        "transpositions": optimal_solution.get("transpositions")
                     },
                     "interpretation": interpretation
                 }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -9,6 +9,13 @@ class AnalyticsRequest(BaseModel):
     analysis_type: str  # 'summary', 'trends', 'forecast', 'optimize'
     parameters: Dict[str, Any] = {}
 
+class SweepRequest(BaseModel):
+    dataset_id: str
+    holding_cost: Optional[List[float]] = None  # None → optimizer default / parameters value
+    stockout_cost: Optional[List[float]] = None
+    horizon: Optional[List[int]] = None
+    parameters: Dict[str, Any] = {}
+
 @router.post("/analyze")
 async def run_analysis(request: AnalyticsRequest):
     """
@@ -35,6 +42,7 @@ async def run_analysis(request: AnalyticsRequest):
         from app.agents.trend_analyst import TrendAnalystAgent
         from app.agents.forecaster import ForecasterAgent
         from app.agents.base_agent import AgentRequest
+        from app.core.registry import agent_registry
         
         context = {"dataset": df.to_dict('records')}
         
@@ -42,7 +50,8 @@ async def run_analysis(request: AnalyticsRequest):
             agent = TrendAnalystAgent()
             query = "Analyze trends in this dataset"
         elif request.analysis_type == "forecast":
-            agent = ForecasterAgent()
+            # Reuse the registered agent's process pool rather than starting one per request
+            agent = agent_registry.get_agent("forecaster") or ForecasterAgent()
             query = "Generate forecasts for this dataset"
         else:
             raise HTTPException(400, "Invalid analysis type")
@@ -53,7 +62,12 @@ async def run_analysis(request: AnalyticsRequest):
             parameters=request.parameters
         )
         
-        response = await agent.execute_with_observability(agent_request)
+        try:
+            response = await agent.execute_with_observability(agent_request)
+        finally:
+            # A temporary forecaster owns its pool; the registered one keeps it for the next request
+            if isinstance(agent, ForecasterAgent) and agent is not agent_registry.get_agent("forecaster"):
+                agent.shutdown()
         
         return {
             "analysis_type": request.analysis_type,
@@ -64,3 +78,60 @@ async def run_analysis(request: AnalyticsRequest):
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sweep")
+async def run_sweep(request: SweepRequest):
+    """
+    What-if sweep over holding cost, stockout cost and horizon.
+    Runs the optimizer's sweep mode directly (no planning, forecasting or
+    LLM interpretation) and returns one cost-surface table for the grid.
+    parameters["engine"] = "cem" is single-SKU only; multi-SKU data returns 400.
+    """
+    try:
+        import redis.asyncio as redis
+        from app.config import get_settings
+        import pandas as pd
+        
+        settings = get_settings()
+        redis_client = await redis.from_url(settings.REDIS_URL)
+        data = await redis_client.get(f"dataset:{request.dataset_id}")
+        await redis_client.close()
+        
+        if not data:
+            raise HTTPException(404, "Dataset not found")
+        
+        df = pd.read_json(data)
+        
+        from app.core.registry import agent_registry
+        from app.agents.base_agent import AgentRequest
+        
+        sweep = {
+            axis: values for axis, values in (
+                ("holding_cost", request.holding_cost),
+                ("stockout_cost", request.stockout_cost),
+                ("horizon", request.horizon)
+            ) if values
+        }
+        agent_request = AgentRequest(
+            query="What-if parameter sweep",
+            context={"dataset": df.to_dict('records')},
+            parameters={**request.parameters, "mode": "sweep", "sweep": sweep}
+        )
+        
+        agent = agent_registry.get_agent("mcts_optimizer")
+        if agent is None:
+            raise HTTPException(503, "MCTS optimizer agent is not available")
+        
+        response = await agent.execute_with_observability(agent_request)
+        if not response.success:
+            raise HTTPException(400, response.error)
+        
+        return {
+            "dataset_id": request.dataset_id,
+            **response.data
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
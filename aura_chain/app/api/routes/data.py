@@ -1,6 +1,6 @@
 # app/api/routes/data.py
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from typing import List
+from typing import List, Optional
 import pandas as pd
 import uuid
 import io
@@ -32,35 +32,40 @@ def sanitize_dataframe_for_json(df: pd.DataFrame) -> pd.DataFrame:
     
     return df_copy
 
-async def trigger_pre_fitting(dataset_id: str, json_data: str):
-    """Background task to pre-fit Forecaster model"""
+async def trigger_pre_fitting(dataset_id: str, json_data: str, locale: Optional[str] = None):
+    """Background task to pre-fit Forecaster models into the fitted-model cache"""
     from app.agents.forecaster import ForecasterAgent
-    from app.agents.base_agent import AgentRequest
+    from app.core.registry import agent_registry
     import json
     from loguru import logger
     
+    agent = agent_registry.get_agent("forecaster")
+    owns_agent = agent is None
     try:
         logger.info(f"Starting background pre-fitting for Forecaster on dataset {dataset_id}")
-        agent = ForecasterAgent()
+        if owns_agent:
+            agent = ForecasterAgent()
         df_records = json.loads(json_data)
-        request = AgentRequest(
-            workflow_id=dataset_id,
-            query="Analyze future trends",
-            context={"dataset": df_records},
-            parameters={"periods": 30}
-        )
-        # Run processing
-        await agent.process(request)
-        logger.info(f"✓ Background pre-fitting complete for {dataset_id}")
+        # Same defaults as a plain forecast request (locale from the dataset unless given), so the workflow hits the cache
+        fitted = await agent.prefit(df_records, periods=30, locale=locale)
+        logger.info(f"✓ Background pre-fitting complete for {dataset_id} ({fitted} series cached)")
     except Exception as e:
         logger.error(f"Background pre-fitting failed: {e}")
+    finally:
+        if owns_agent and agent is not None:
+            agent.shutdown()
 
 @router.post("/upload")
-async def upload_dataset(file: UploadFile = File(...), background_tasks: BackgroundTasks = None):
+async def upload_dataset(
+    file: UploadFile = File(...),
+    background_tasks: BackgroundTasks = None,
+    locale: Optional[str] = None
+):
     """
     Upload dataset (CSV, Excel, JSON)
     Returns dataset_id for use in queries
     FIX: Handle datetime columns properly
+    Optional `locale` sets the holiday locale for background pre-fitting
     """
     try:
         content = await file.read()
@@ -97,7 +102,7 @@ async def upload_dataset(file: UploadFile = File(...), background_tasks: Backgro
         print(f"✓ Uploaded dataset: {len(df)} rows, {len(df.columns)} columns")
         
         if background_tasks:
-            background_tasks.add_task(trigger_pre_fitting, dataset_id, json_data)
+            background_tasks.add_task(trigger_pre_fitting, dataset_id, json_data, locale)
         
         return {
             "dataset_id": dataset_id,
@@ -38,13 +38,15 @@ async def detailed_health():
     """
     Comprehensive health dashboard.
     
-    Returns system, agents, LLM, workflows, and Redis status.
+    Returns system, agents, LLM, workflows, optimizer and forecast caches, and Redis status.
     """
     from app.core.api_clients import circuit_breaker
     from app.core.registry import agent_registry
     from app.core.checkpoints import workflow_checkpoint
     from app.core.rate_limiter import rate_limiter
     from app.core.artifacts import artifact_store
+    from app.core.optimizer_cache import optimizer_cache
+    from app.core.forecast_cache import forecast_cache
     
     result: Dict[str, Any] = {
         "status": "healthy",
@@ -96,6 +98,18 @@ async def detailed_health():
     except Exception as e:
         result["workflows"] = {"error": str(e)}
     
+    # ── Optimizer Cache ──
+    try:
+        result["optimizer_cache"] = optimizer_cache.get_stats()
+    except Exception as e:
+        result["optimizer_cache"] = {"error": str(e)}
+    
+    # ── Forecast Cache ──
+    try:
+        result["forecast_cache"] = forecast_cache.get_stats()
+    except Exception as e:
+        result["forecast_cache"] = {"error": str(e)}
+    
     # ── Redis ──
     try:
         if artifact_store.redis_client:
@@ -72,6 +72,42 @@ class Settings(BaseSettings):
     MAX_TOKENS: int = 4000
     MAX_AGENTS_PARALLEL: int = 3
     
+    # MCTS Optimizer
+    MCTS_POOL_WORKERS: Optional[int] = None  # None → one process per core
+    MCTS_PARALLEL_SEARCHES: int = 4  # Root-parallel searches per single-SKU request
+    MCTS_GROUP_DEADLINE_S: float = 60.0  # Global deadline across Multi-SKU group searches
+    MCTS_SCENARIOS: int = 256  # Common-random-number demand scenarios drawn per request
+    MCTS_TIME_BUDGET_S: float = 4.5  # Default anytime budget per search (request: deadline_s)
+    MCTS_PROGRESS_EVERY: int = 200  # Root visits between streamed progress updates
+    MCTS_TRANSPOSITION_ENTRIES: int = 0  # LRU transposition table size per search; 0 disables
+    MCTS_CACHE_MAX_ENTRIES: int = 512  # Result / warm-start cache entries before LRU eviction
+    MCTS_CACHE_TTL_S: int = 604800  # Redis TTL for cached results (7 days)
+    MCTS_CACHE_DIR: Optional[str] = None  # Disk fallback when Redis is not initialized; None → system temp dir
+    MCTS_BULLWHIP_REPLICATIONS: int = 200  # Monte Carlo lead-time replications per bullwhip tier
+    MCTS_ECHELON_SEARCH_REPLICATIONS: int = 32  # Shared lead-time draws per candidate in the multi-echelon policy search
+    MCTS_ECHELON_TIME_BUDGET_S: float = 2.0  # Anytime budget for the multi-echelon policy search
+    MCTS_EVAL_REPLICATIONS: int = 2000  # Paired replications when costing baseline vs. recommended policy
+    MCTS_EVAL_SEED: int = 7919  # Evaluation bank seed; distinct from the search seed (42) so reported savings are out-of-sample
+    MCTS_ROLLOUT_DEPTH: int = 0  # Days simulated per rollout before the heuristic leaf value; 0 → full horizon
+    MCTS_SWEEP_MAX_POINTS: int = 500  # Largest what-if grid accepted by the sweep mode / endpoint
+    MCTS_ASSOC_MIN_SUPPORT: float = 0.1  # Minimum pair support for SKU co-occurrence rules
+    MCTS_ASSOC_MIN_LIFT: float = 0.0  # Minimum lift for SKU co-occurrence rules
+    MCTS_ASSOC_TOP_K: Optional[int] = None  # Keep only the k highest-lift rules; None → all
+    MCTS_BATCH_SINGLETONS: bool = True  # Optimize unassociated SKUs as one independent batch instead of pairing them
+    MCTS_SINGLETON_CHUNK: int = 64  # SKUs simulated together per batched singleton evaluation
+    MCTS_JOINT_MIN_LIFT: float = 1.1  # Rules below this lift (≈ chance co-occurrence) leave SKUs to the singleton batch
+    
+    # Forecaster
+    FORECAST_POOL_WORKERS: Optional[int] = None  # Prophet fitting processes; None → one per core
+    FORECAST_MAX_COLUMNS: Optional[int] = None  # Cap on forecast columns per request; None → every detected column
+    FORECAST_CACHE_MAX_ENTRIES: int = 256  # Fitted-model cache entries before LRU eviction
+    FORECAST_CACHE_TTL_S: int = 86400  # Fitted-model cache TTL (1 day)
+    FORECAST_CACHE_DIR: Optional[str] = None  # Disk fallback when Redis is not initialized; None → system temp dir
+    FORECAST_TIER: str = "auto"  # "auto" → NumPy tier with Prophet escalation; "fast" / "prophet" force one tier
+    FORECAST_FAST_MAX_MASE: float = 1.0  # Escalate to Prophet when the fast tier's backtest MASE exceeds this (worse than naive)
+    FORECAST_FAST_MAX_LENGTH: int = 365  # Series this long (yearly / holiday effects) always go to Prophet
+    FORECAST_RECONCILIATION: str = "mint_shrink"  # Hierarchical mode: "bottom_up", "ols" or "mint_shrink"
+    
     # Observability
     LOG_LEVEL: str = "INFO"
     ENABLE_METRICS: bool = True
@@ -0,0 +1,108 @@
+# app/core/cooccurrence.py
+"""
+Sparse SKU co-occurrence mining for Multi-SKU grouping.
+
+Each date is treated as one transaction (the set of SKUs sold that day).
+Rather than enumerating pairs per transaction, the miner builds a sparse
+date × SKU incidence matrix X (1 where the SKU appears on that date) and
+gets every pair support at once from the Gram matrix:
+
+    item counts → X.sum(axis=0)
+    pair counts → (Xᵀ X)[i, j] for i < j
+
+SKUs below min_support are pruned before the product (a pair can never be
+more frequent than either of its items), so only frequent SKUs enter Xᵀ X.
+Support / confidence / lift filters are then applied on the upper-triangle
+arrays, and top_k keeps only the highest-lift rules for catalogs with
+thousands of SKUs.
+
+Rules use the same shape as before:
+    {"antecedent": [a], "consequent": [b], "support", "confidence", "lift"}
+with a < b in sorted SKU order, ordered by lift (highest first).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Any, Dict, List, Optional
+
+
+def incidence_matrix(dates: pd.Series, skus: pd.Series) -> tuple:
+    """
+    Build the binary date × SKU incidence matrix.
+
+    Returns (matrix, sku_labels, n_transactions). Labels are sorted so the
+    upper triangle of the Gram matrix yields pairs in sorted order. Rows with
+    a missing date are dropped; a date whose only SKUs are missing still
+    counts as a transaction.
+    """
+    dates = pd.Series(dates).reset_index(drop=True)
+    skus = pd.Series(skus).reset_index(drop=True)
+    has_date = dates.notna()
+    date_codes, date_index = pd.factorize(dates[has_date])
+    n_transactions = len(date_index)
+
+    skus = skus[has_date].reset_index(drop=True)
+    has_sku = skus.notna().to_numpy()
+    sku_codes, sku_labels = pd.factorize(skus[has_sku], sort=True)
+    rows = date_codes[has_sku]
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, sku_codes)),
+        shape=(n_transactions, len(sku_labels))
+    )
+    matrix.data[:] = 1.0  # duplicates within a date collapse to one occurrence
+    return matrix, list(sku_labels), n_transactions
+
+
+def mine_associations(
+    dates: pd.Series,
+    skus: pd.Series,
+    min_support: float = 0.1,
+    min_lift: float = 0.0,
+    top_k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pairwise association rules between SKUs that co-occur on the same date.
+
+    min_support and min_lift filter rules; top_k (None → unlimited) keeps
+    only the k highest-lift rules.
+    """
+    matrix, labels, n_transactions = incidence_matrix(dates, skus)
+    if n_transactions == 0 or not labels:
+        return []
+
+    item_support = np.asarray(matrix.sum(axis=0)).ravel() / n_transactions
+    frequent = np.flatnonzero(item_support >= min_support)
+    if len(frequent) < 2:
+        return []
+
+    frequent_matrix = matrix[:, frequent]
+    pair_counts = sparse.triu(frequent_matrix.T @ frequent_matrix, k=1).tocoo()
+
+    support = pair_counts.data / n_transactions
+    keep = support >= min_support
+    i, j, support = pair_counts.row[keep], pair_counts.col[keep], support[keep]
+    support_a = item_support[frequent[i]]
+    support_b = item_support[frequent[j]]
+    confidence = support / support_a
+    lift = support / (support_a * support_b)
+
+    keep = lift >= min_lift
+    i, j, support, confidence, lift = i[keep], j[keep], support[keep], confidence[keep], lift[keep]
+
+    if top_k is not None and len(lift) > top_k:
+        best = np.argpartition(-lift, top_k - 1)[:top_k] if top_k > 0 else np.array([], dtype=int)
+        i, j, support, confidence, lift = i[best], j[best], support[best], confidence[best], lift[best]
+
+    order = np.lexsort((-support, -lift))
+    return [
+        {
+            "antecedent": [labels[frequent[i[k]]]],
+            "consequent": [labels[frequent[j[k]]]],
+            "support": float(support[k]),
+            "confidence": float(confidence[k]),
+            "lift": float(lift[k])
+        }
+        for k in order
+    ]
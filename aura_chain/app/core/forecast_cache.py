@@ -0,0 +1,80 @@
+# app/core/forecast_cache.py
+"""
+Fitted-model cache for the Forecaster.
+
+Uploading a dataset pre-fits its forecasts in the background; the workflow
+that follows used to refit Prophet from scratch. Each fitted series is now
+stored under a fingerprint of its aggregated history plus every setting
+that changes the model:
+
+    key → column, growth mode, seasonality flags, holiday locale, periods
+
+An entry holds the serialized Prophet model (prophet.serialize) and its
+forecast frame; the Forecaster rebuilds its per-series payload from the
+frame on a hit, so a pre-fitted series costs no Stan fit at all.
+
+Backends and LRU eviction are those of OptimizerCache, under their own
+namespace:
+    Redis       forecast_cache:{key} (TTL) + forecast_cache_index
+    Local disk  {FORECAST_CACHE_DIR}/{key}.json
+Disk entries carry their store time and expire after FORECAST_CACHE_TTL_S
+like the Redis ones.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+from app.core.optimizer_cache import OptimizerCache
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class ForecastCache(OptimizerCache):
+    """
+    Size-bounded, TTL-limited cache of fitted forecast models.
+    """
+
+    key_prefix = "forecast_cache"
+    default_dir = "aura_forecast_cache"
+
+    @classmethod
+    def series_key(cls, prophet_df: pd.DataFrame, **params: Any) -> str:
+        """Fingerprint of a 'ds' / 'y' history plus model settings."""
+        ds = pd.to_datetime(prophet_df["ds"]).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        return cls.fingerprint([ds, prophet_df["y"].to_numpy(dtype=float)], **params)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry (model JSON, forecast frame JSON, metadata) or None."""
+        entry = await self._get(key)
+        if entry is not None and time.time() - entry.get("stored_at", 0) > self.ttl_s:
+            self._discard_disk(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def put(self, key: str, entry: Dict[str, Any]) -> None:
+        await self._put(key, {**entry, "stored_at": time.time()})
+        self.stores += 1
+
+    def _discard_disk(self, key: str) -> None:
+        if self.redis_client:
+            return  # Redis expires entries itself
+        try:
+            os.remove(os.path.join(self.cache_dir, f"{key}.json"))
+            self.evictions += 1
+        except FileNotFoundError:
+            pass
+
+
+# Global instance
+forecast_cache = ForecastCache(
+    max_entries=settings.FORECAST_CACHE_MAX_ENTRIES,
+    cache_dir=settings.FORECAST_CACHE_DIR,
+    ttl_s=settings.FORECAST_CACHE_TTL_S
+)
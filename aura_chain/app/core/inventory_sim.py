@@ -0,0 +1,620 @@
+# app/core/inventory_sim.py
+"""
+Vectorized inventory simulation primitives for the MCTS optimizer.
+
+The scalar simulators in app/agents/mcts_optimizer.py advance one trajectory
+at a time through InventoryState.transition. The engines in this module
+advance many trajectories together as NumPy arrays so the tree search can
+evaluate its leaves in batches.
+
+In-transit orders are kept in an ArrivalPipeline: a fixed-width circular
+array indexed by arrival day modulo (max lead time + 1). Scheduling and
+receiving are O(1) per day and copying a state is one small array copy.
+
+Batch array layout (one row per trajectory):
+    stock    → (n,)                 on-hand inventory
+    pipeline → (n, max_lead + 1)    ring buffer, slot = arrival_day % width
+    day      → (n,)                 current simulated day
+    cost     → (n,)                 cost accumulated so far
+"""
+
+import zlib
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Lead times are drawn uniformly from 0..MAX_LEAD_TIME days,
+# matching InventoryState.transition.
+MAX_LEAD_TIME = 3
+
+
+class ArrivalPipeline:
+    """
+    Fixed-width ring buffer of in-transit quantities.
+
+    Slot `arrival_day % width` holds everything due on that day. Any order
+    with lead time < width lands in a slot that is not due before it, as long
+    as receive() is called once per simulated day. With n_items set, each
+    slot holds one quantity per SKU.
+    """
+
+    __slots__ = ("slots", "_in_transit", "_width", "_scalar")
+
+    def __init__(
+        self,
+        width: int = MAX_LEAD_TIME + 1,
+        n_items: Optional[int] = None,
+        slots: Optional[np.ndarray] = None
+    ):
+        if slots is None:
+            shape = (width,) if n_items is None else (width, n_items)
+            slots = np.zeros(shape, dtype=float)
+        self.slots = slots
+        self._width = slots.shape[0]
+        self._scalar = slots.ndim == 1
+        # Running total so in_transit() never scans the buffer
+        self._in_transit = float(slots.sum()) if self._scalar else slots.sum(axis=0)
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    def copy(self) -> "ArrivalPipeline":
+        clone = ArrivalPipeline.__new__(ArrivalPipeline)
+        clone.slots = self.slots.copy()
+        clone._width = self._width
+        clone._scalar = self._scalar
+        clone._in_transit = self._in_transit if self._scalar else self._in_transit.copy()
+        return clone
+
+    def schedule(self, day: int, lead_time: int, qty) -> None:
+        """Add an order placed on `day` that arrives `lead_time` days later."""
+        if lead_time >= self._width:
+            raise ValueError(f"lead time {lead_time} does not fit a pipeline of width {self._width}")
+        if not self._scalar:
+            qty = np.asarray(qty, dtype=float)
+        self.slots[(day + lead_time) % self._width] += qty
+        self._in_transit = self._in_transit + qty
+
+    def receive(self, day: int):
+        """Pop and return everything due on `day`."""
+        slot = day % self._width
+        if self._scalar:
+            arrived = self.slots.item(slot)
+        else:
+            arrived = self.slots[slot].copy()
+        self.slots[slot] = 0.0
+        self._in_transit = self._in_transit - arrived
+        return arrived
+
+    def in_transit(self):
+        """Total quantity still on order (per SKU when n_items is set)."""
+        return self._in_transit
+
+
+# Key used for the single series of a single-SKU request
+SINGLE_SKU = "__demand__"
+
+
+class ScenarioBank:
+    """
+    Common random numbers for one optimization request.
+
+    Pre-draws, per SKU, an (n_scenarios × horizon) demand matrix (bootstrap
+    samples of the SKU's history) and a matching matrix of uniform lead-time
+    quantiles. Every consumer (tree policy, rollouts, baseline and optimized
+    policy evaluation) reads scenario rows from the bank instead of the global
+    RNG, so policies are compared on identical demand paths.
+
+    Each SKU's draws depend only on the seed and the SKU label, so a bank
+    built inside a worker for one SKU group matches the bank the event loop
+    builds for the whole catalog.
+    """
+
+    def __init__(
+        self,
+        sku_demands: Dict[Any, np.ndarray],
+        horizon: int,
+        n_scenarios: int = 256,
+        seed: int = 42
+    ):
+        self.horizon = max(int(horizon), 1)
+        self.n_scenarios = max(int(n_scenarios), 1)
+        self.seed = int(seed)
+        self._demand: Dict[Any, np.ndarray] = {}
+        self._lead_quantiles: Dict[Any, np.ndarray] = {}
+        self._lead_cache: Dict[Tuple[Any, int, int], np.ndarray] = {}
+        for sku, history in sku_demands.items():
+            rng = np.random.default_rng([self.seed, zlib.crc32(str(sku).encode())])
+            history = np.asarray(history, dtype=float)
+            if len(history) == 0:
+                history = np.zeros(1)
+            self._demand[sku] = rng.choice(history, size=(self.n_scenarios, self.horizon))
+            self._lead_quantiles[sku] = rng.random((self.n_scenarios, self.horizon))
+
+    @classmethod
+    def for_single_sku(cls, demand_history: np.ndarray, horizon: int, n_scenarios: int = 256, seed: int = 42) -> "ScenarioBank":
+        return cls({SINGLE_SKU: demand_history}, horizon, n_scenarios, seed)
+
+    @property
+    def skus(self) -> List[Any]:
+        return list(self._demand.keys())
+
+    def demand(self, sku: Any = SINGLE_SKU) -> np.ndarray:
+        """(n_scenarios, horizon) demand matrix for a SKU."""
+        return self._demand[sku]
+
+    def lead_times(self, sku: Any = SINGLE_SKU, low: int = 0, high: int = MAX_LEAD_TIME) -> np.ndarray:
+        """(n_scenarios, horizon) integer lead times, uniform on [low, high]."""
+        key = (sku, low, high)
+        if key not in self._lead_cache:
+            span = high - low + 1
+            leads = low + np.floor(self._lead_quantiles[sku] * span).astype(np.int64)
+            self._lead_cache[key] = np.minimum(leads, high)
+        return self._lead_cache[key]
+
+
+class BatchRolloutEngine:
+    """
+    Simulates many single-SKU random-policy rollouts at once.
+
+    Demand, lead times and the rollout policy's actions are pre-drawn as
+    (n, steps) matrices, so each simulated day costs a handful of array ops
+    regardless of how many rollouts are in flight. Rollouts that start on
+    different days share one loop; rows past the horizon are masked out.
+    Each row's pipeline uses the same ring layout as ArrivalPipeline.slots,
+    so a state's pipeline can be copied straight into a batch row.
+
+    With a ScenarioBank, each row follows the demand and lead-time path of
+    its scenario instead of fresh bootstrap draws.
+
+    With `rollout_depth` K > 0, each row is simulated for at most K days from
+    its own start day; `leaf_value(stock, in_transit, days_remaining)` then
+    estimates the cost of the days left to the horizon, so the cost per
+    rollout no longer grows with the horizon.
+    """
+
+    def __init__(
+        self,
+        demand_history: np.ndarray,
+        holding_cost: float,
+        stockout_cost: float,
+        horizon: int,
+        action_space: List[float],
+        max_action: float,
+        max_lead_time: int = MAX_LEAD_TIME,
+        rng: Optional[np.random.Generator] = None,
+        bank: Optional[ScenarioBank] = None,
+        sku: Any = SINGLE_SKU,
+        rollout_depth: int = 0,
+        leaf_value: Optional[Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]] = None
+    ):
+        self.demand_history = np.asarray(demand_history, dtype=float)
+        self.holding_cost = float(holding_cost)
+        self.stockout_cost = float(stockout_cost)
+        self.horizon = int(horizon)
+        self.action_space = np.asarray(action_space, dtype=float)
+        self.max_action = float(max_action)
+        self.max_lead_time = int(max_lead_time)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.bank = bank
+        self.sku = sku
+        self.rollout_depth = max(int(rollout_depth), 0)
+        self.leaf_value = leaf_value
+
+    @property
+    def pipeline_width(self) -> int:
+        return self.max_lead_time + 1
+
+    def empty_state(self, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Allocate zeroed (stock, pipeline, day, cost) arrays for n rollouts."""
+        return (
+            np.zeros(n, dtype=float),
+            np.zeros((n, self.pipeline_width), dtype=float),
+            np.zeros(n, dtype=np.int64),
+            np.zeros(n, dtype=float)
+        )
+
+    def draw_policy_actions(self, n: int, steps: int) -> np.ndarray:
+        """Default rollout policy: 50% a discrete action, 50% uniform in [0, max_action]."""
+        discrete = self.rng.choice(self.action_space, size=(n, steps))
+        continuous = self.rng.uniform(0.0, self.max_action, size=(n, steps))
+        use_discrete = self.rng.random((n, steps)) < 0.5
+        return np.where(use_discrete, discrete, continuous)
+
+    def rollout(
+        self,
+        stock: np.ndarray,
+        pipeline: np.ndarray,
+        day: np.ndarray,
+        cost: np.ndarray,
+        scenarios: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Run every row to the horizon (or rollout_depth days) and return its total cost.
+
+        `scenarios` gives each row's ScenarioBank row (required when the
+        engine has a bank). Inputs are not modified.
+        """
+        stock = np.array(stock, dtype=float)
+        pipeline = np.array(pipeline, dtype=float)
+        day = np.asarray(day, dtype=np.int64)
+        cost = np.array(cost, dtype=float)
+
+        n = len(stock)
+        if n == 0:
+            return cost
+        steps = int(self.horizon - day.min())
+        if self.rollout_depth > 0:
+            steps = min(steps, self.rollout_depth)
+        if steps <= 0:
+            return cost
+
+        if self.bank is not None and scenarios is not None:
+            rows_idx = np.asarray(scenarios, dtype=np.int64)[:, None]
+            days_idx = np.minimum(day[:, None] + np.arange(steps), self.bank.horizon - 1)
+            demand = self.bank.demand(self.sku)[rows_idx, days_idx]
+            lead = self.bank.lead_times(self.sku, 0, self.max_lead_time)[rows_idx, days_idx]
+        else:
+            demand = self.rng.choice(self.demand_history, size=(n, steps))
+            lead = self.rng.integers(0, self.max_lead_time + 1, size=(n, steps))
+        actions = self.draw_policy_actions(n, steps)
+        rows = np.arange(n)
+        width = self.pipeline_width
+
+        for t in range(steps):
+            active = (day + t) < self.horizon
+            if not active.any():
+                break
+
+            # Place today's order, then receive everything due today
+            today = day + t
+            arrival_slot = (today + lead[:, t]) % width
+            pipeline[rows, arrival_slot] += np.where(active, actions[:, t], 0.0)
+            slot = today % width
+            on_hand = stock + pipeline[rows, slot]
+            pipeline[rows, slot] = 0.0
+
+            # Fulfil demand
+            d = demand[:, t]
+            ending = np.maximum(on_hand - d, 0.0)
+            shortfall = np.maximum(d - on_hand, 0.0)
+
+            step_cost = self.holding_cost * ending + self.stockout_cost * shortfall
+            cost += np.where(active, step_cost, 0.0)
+            stock = np.where(active, ending, stock)
+
+        if self.leaf_value is not None:
+            days_remaining = np.maximum(self.horizon - (day + steps), 0)
+            truncated = days_remaining > 0
+            if truncated.any():
+                cost = cost + np.where(
+                    truncated, self.leaf_value(stock, pipeline.sum(axis=1), days_remaining), 0.0
+                )
+        return cost
+
+
+class EchelonSimulator:
+    """
+    Vectorized (s, Q) echelon simulator for bullwhip analysis.
+
+    Each row is one tier replication: it sees a demand series, reviews its
+    inventory position daily and orders `order_quantity` whenever the
+    position drops to `reorder_point`, with lead times drawn uniformly from
+    [max(1, lead_mean - 1), lead_mean + 1]. All rows advance together, so
+    several tiers and many Monte Carlo replications cost one day loop.
+
+    Upstream tiers see the orders of the tier below as their demand. Callers
+    either chain simulate() calls tier by tier, or use simulate_chain() to
+    run whole retailer → manufacturer chains for a population of per-tier
+    policies on shared lead-time draws.
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def _draw_leads(self, shape: Tuple[int, ...], lead_mean: np.ndarray) -> np.ndarray:
+        """Integer lead times on [max(1, lead_mean - 1), lead_mean + 1]; lead_mean broadcasts over `shape`."""
+        lead_low = np.maximum(1, lead_mean - 1)
+        span = lead_mean + 1 - lead_low + 1
+        return lead_low + np.floor(self.rng.random(shape) * span).astype(np.int64)
+
+    @staticmethod
+    def _run(
+        demand: np.ndarray,
+        reorder_point: np.ndarray,
+        order_quantity: np.ndarray,
+        leads: np.ndarray,
+        holding_cost: float = 0.0,
+        stockout_cost: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Advance every row over the demand series; returns (n, T) orders and (n,) costs."""
+        n, days = demand.shape
+        width = int(leads.max()) + 1 if leads.size else 1
+        rows = np.arange(n)
+        pipeline = np.zeros((n, width))
+        in_transit = np.zeros(n)
+        stock = order_quantity * 1.5
+        orders = np.zeros((n, days))
+        cost = np.zeros(n)
+
+        for t in range(days):
+            slot = t % width
+            arrived = pipeline[:, slot].copy()
+            pipeline[:, slot] = 0.0
+            in_transit -= arrived
+            available = stock + arrived
+            stock = np.maximum(0.0, available - demand[:, t])
+            cost += holding_cost * stock + stockout_cost * np.maximum(0.0, demand[:, t] - available)
+
+            placed = np.where(stock + in_transit <= reorder_point, order_quantity, 0.0)
+            orders[:, t] = placed
+            pipeline[rows, (t + leads[:, t]) % width] += placed
+            in_transit += placed
+
+        return orders, cost
+
+    def simulate(
+        self,
+        demand: np.ndarray,
+        reorder_point: np.ndarray,
+        order_quantity: np.ndarray,
+        lead_mean: np.ndarray
+    ) -> np.ndarray:
+        """
+        Simulate every row and return its (n, T) order series.
+
+        `demand` is (n, T); the policy arrays broadcast to (n,).
+        """
+        demand = np.atleast_2d(np.asarray(demand, dtype=float))
+        n, days = demand.shape
+        reorder_point = np.broadcast_to(np.asarray(reorder_point, dtype=float), (n,))
+        order_quantity = np.broadcast_to(np.asarray(order_quantity, dtype=float), (n,))
+        lead_mean = np.broadcast_to(np.asarray(lead_mean, dtype=np.int64), (n,))
+        leads = self._draw_leads((n, days), lead_mean[:, None])
+        return self._run(demand, reorder_point, order_quantity, leads)[0]
+
+    def simulate_chain(
+        self,
+        demand: np.ndarray,
+        reorder_points: np.ndarray,
+        order_quantities: np.ndarray,
+        lead_means: np.ndarray,
+        holding_costs: Union[float, np.ndarray] = 0.0,
+        stockout_costs: Union[float, np.ndarray] = 0.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run full echelon chains for a population of per-tier policies.
+
+        `demand` is the (n, T) consumer demand; `reorder_points` and
+        `order_quantities` are (P, tiers), tier 0 being the retailer. Each
+        tier's demand is the order series of the tier below. One set of lead
+        times is drawn per tier and shared by all P policies (common random
+        numbers), so candidates are compared on identical replications.
+
+        Returns "orders" (tiers, P, n, T), "tier_costs" (tiers, P, n) and
+        their sum over tiers, "cost" (P, n).
+        """
+        demand = np.atleast_2d(np.asarray(demand, dtype=float))
+        n, days = demand.shape
+        reorder_points = np.atleast_2d(np.asarray(reorder_points, dtype=float))
+        population, n_tiers = reorder_points.shape
+        order_quantities = np.broadcast_to(np.asarray(order_quantities, dtype=float), (population, n_tiers))
+        lead_means = np.broadcast_to(np.asarray(lead_means, dtype=np.int64), (n_tiers,))
+        holding_costs = np.broadcast_to(np.asarray(holding_costs, dtype=float), (n_tiers,))
+        stockout_costs = np.broadcast_to(np.asarray(stockout_costs, dtype=float), (n_tiers,))
+        leads = self._draw_leads((n_tiers, n, days), lead_means[:, None, None])
+
+        orders = np.zeros((n_tiers, population, n, days))
+        tier_costs = np.zeros((n_tiers, population, n))
+        tier_demand = np.tile(demand, (population, 1))
+        for j in range(n_tiers):
+            tier_orders, cost = self._run(
+                tier_demand,
+                np.repeat(reorder_points[:, j], n),
+                np.repeat(order_quantities[:, j], n),
+                np.tile(leads[j], (population, 1)),
+                holding_costs[j],
+                stockout_costs[j]
+            )
+            orders[j] = tier_orders.reshape(population, n, days)
+            tier_costs[j] = cost.reshape(population, n)
+            tier_demand = tier_orders
+
+        return {"orders": orders, "tier_costs": tier_costs, "cost": tier_costs.sum(axis=0)}
+
+    @staticmethod
+    def variance_ratio(orders: np.ndarray, consumer_variance: float, z: float = 1.96) -> Dict[str, Any]:
+        """Mean order-to-consumer variance ratio over rows, with a normal-approximation CI."""
+        ratios = np.var(orders, axis=1) / consumer_variance if orders.shape[1] else np.zeros(len(orders))
+        mean = float(ratios.mean())
+        half_width = z * float(ratios.std(ddof=1)) / np.sqrt(len(ratios)) if len(ratios) > 1 else 0.0
+        return {"mean": mean, "ci": [mean - half_width, mean + half_width]}
+
+
+# ── Batched policy evaluation ──
+
+def evaluate_policy(
+    bank: ScenarioBank,
+    current_stock: float,
+    holding_cost: float,
+    stockout_cost: float,
+    horizon: int,
+    reorder_point: Union[float, np.ndarray],
+    order_quantity: Union[float, np.ndarray],
+    sku: Any = SINGLE_SKU
+) -> np.ndarray:
+    """
+    Cost of a single-SKU (s, Q) policy on every scenario of the bank.
+
+    Mirrors InventoryState.transition: order Q when on-hand stock is at or
+    below s, with lead times on 0..MAX_LEAD_TIME, then receive and fulfil.
+    A reorder point of -inf evaluates the no-reorder baseline. Returns an
+    (n_scenarios,) cost vector, so policies evaluated on the same bank are
+    paired scenario by scenario.
+
+    Passing (P,) arrays of reorder points and order quantities evaluates a
+    population of P policies in one pass and returns (P, n_scenarios).
+    """
+    population = np.ndim(reorder_point) > 0 or np.ndim(order_quantity) > 0
+    reorder_point, order_quantity = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(reorder_point, dtype=float)),
+        np.atleast_1d(np.asarray(order_quantity, dtype=float))
+    )
+    horizon = min(int(horizon), bank.horizon)
+    n, m = bank.n_scenarios, len(reorder_point)
+    demand = bank.demand(sku)
+    lead = bank.lead_times(sku, 0, MAX_LEAD_TIME)
+    width = MAX_LEAD_TIME + 1
+    reorder_point = reorder_point[:, None]
+    order_quantity = np.maximum(order_quantity, 0.0)[:, None]
+
+    rows = np.arange(n)
+    stock = np.full((m, n), float(current_stock))
+    pipeline = np.zeros((m, n, width))
+    cost = np.zeros((m, n))
+    for t in range(horizon):
+        placed = np.where(stock <= reorder_point, order_quantity, 0.0)
+        pipeline[:, rows, (t + lead[:, t]) % width] += placed
+        slot = t % width
+        on_hand = stock + pipeline[:, :, slot]
+        pipeline[:, :, slot] = 0.0
+        stock = np.maximum(on_hand - demand[:, t], 0.0)
+        cost += holding_cost * stock + stockout_cost * np.maximum(demand[:, t] - on_hand, 0.0)
+    return cost if population else cost[0]
+
+
+def evaluate_joint_policy(
+    bank: ScenarioBank,
+    skus: List[Any],
+    stocks: np.ndarray,
+    holding_costs: np.ndarray,
+    stockout_costs: np.ndarray,
+    horizon: int,
+    reorder_points: np.ndarray,
+    order_quantities: np.ndarray
+) -> np.ndarray:
+    """
+    Cost of a coordinated Multi-SKU policy on every scenario of the bank.
+
+    Mirrors MultiInventoryState.transition: the whole group orders together
+    whenever any SKU's inventory position (on hand + in transit) is at or
+    below its reorder point, sharing one lead time on 1..MAX_LEAD_TIME read
+    from the first SKU's lead-time matrix. Reorder points of -inf evaluate
+    the no-reorder baseline. Returns an (n_scenarios,) cost vector.
+
+    (P, k) reorder points and order quantities evaluate a population of P
+    joint policies at once and return (P, n_scenarios). Holding and stockout
+    costs may also be (P, k), pricing each member differently.
+    """
+    population = np.ndim(reorder_points) > 1 or np.ndim(order_quantities) > 1
+    horizon = min(int(horizon), bank.horizon)
+    n, k = bank.n_scenarios, len(skus)
+    reorder_points, order_quantities = np.broadcast_arrays(
+        np.asarray(reorder_points, dtype=float).reshape(-1, k),
+        np.asarray(order_quantities, dtype=float).reshape(-1, k)
+    )
+    holding_costs = np.asarray(holding_costs, dtype=float).reshape(-1, 1, k)
+    stockout_costs = np.asarray(stockout_costs, dtype=float).reshape(-1, 1, k)
+    population = population or len(holding_costs) > 1 or len(stockout_costs) > 1
+    m = max(len(reorder_points), len(holding_costs), len(stockout_costs))
+    reorder_points = np.broadcast_to(reorder_points, (m, k))
+    order_quantities = np.broadcast_to(order_quantities, (m, k))
+    demand = np.stack([bank.demand(sku) for sku in skus], axis=2)  # (n, horizon, k)
+    lead = bank.lead_times(skus[0], 1, MAX_LEAD_TIME)
+    width = MAX_LEAD_TIME + 1
+    reorder_points = reorder_points[:, None, :]
+    order_quantities = np.maximum(order_quantities, 0.0)[:, None, :]
+
+    rows = np.arange(n)
+    stock = np.tile(np.asarray(stocks, dtype=float), (m, n, 1))
+    pipeline = np.zeros((m, n, width, k))
+    in_transit = np.zeros((m, n, k))
+    cost = np.zeros((m, n))
+    for t in range(horizon):
+        trigger = (stock + in_transit <= reorder_points).any(axis=2)
+        placed = trigger[:, :, None] * order_quantities
+        pipeline[:, rows, (t + lead[:, t]) % width] += placed
+        in_transit += placed
+        slot = t % width
+        arrived = pipeline[:, :, slot].copy()
+        pipeline[:, :, slot] = 0.0
+        in_transit -= arrived
+        on_hand = stock + arrived
+        d = demand[:, t]
+        stock = np.maximum(on_hand - d, 0.0)
+        cost += (stock * holding_costs + np.maximum(d - on_hand, 0.0) * stockout_costs).sum(axis=2)
+    return cost if population else cost[0]
+
+
+def evaluate_independent_policies(
+    bank: ScenarioBank,
+    skus: List[Any],
+    stocks: np.ndarray,
+    holding_costs: np.ndarray,
+    stockout_costs: np.ndarray,
+    horizon: int,
+    reorder_points: np.ndarray,
+    order_quantities: np.ndarray
+) -> np.ndarray:
+    """
+    Per-SKU costs of unrelated (s, Q) policies simulated side by side.
+
+    Each SKU follows the Multi-SKU conventions of evaluate_joint_policy
+    (orders on its own inventory position, lead times on 1..MAX_LEAD_TIME
+    from its own lead-time matrix) but triggers alone, so a batch of
+    singleton groups runs in one pass with arrays indexed by SKU. A single
+    SKU matches evaluate_joint_policy scenario for scenario.
+
+    Returns (n_scenarios, k) costs; (P, k) reorder points and order
+    quantities return (P, n_scenarios, k).
+    """
+    population = np.ndim(reorder_points) > 1 or np.ndim(order_quantities) > 1
+    horizon = min(int(horizon), bank.horizon)
+    n, k = bank.n_scenarios, len(skus)
+    reorder_points, order_quantities = np.broadcast_arrays(
+        np.asarray(reorder_points, dtype=float).reshape(-1, k),
+        np.asarray(order_quantities, dtype=float).reshape(-1, k)
+    )
+    m = len(reorder_points)
+    demand = np.stack([bank.demand(sku) for sku in skus], axis=2)  # (n, horizon, k)
+    lead = np.stack([bank.lead_times(sku, 1, MAX_LEAD_TIME) for sku in skus], axis=2)
+    width = MAX_LEAD_TIME + 1
+    holding_costs = np.asarray(holding_costs, dtype=float)
+    stockout_costs = np.asarray(stockout_costs, dtype=float)
+    reorder_points = reorder_points[:, None, :]
+    order_quantities = np.maximum(order_quantities, 0.0)[:, None, :]
+
+    rows = np.arange(n)[:, None]
+    cols = np.arange(k)[None, :]
+    stock = np.tile(np.asarray(stocks, dtype=float), (m, n, 1))
+    pipeline = np.zeros((m, n, width, k))
+    in_transit = np.zeros((m, n, k))
+    cost = np.zeros((m, n, k))
+    for t in range(horizon):
+        placed = np.where(stock + in_transit <= reorder_points, order_quantities, 0.0)
+        pipeline[:, rows, (t + lead[:, t]) % width, cols] += placed
+        in_transit += placed
+        slot = t % width
+        arrived = pipeline[:, :, slot].copy()
+        pipeline[:, :, slot] = 0.0
+        in_transit -= arrived
+        on_hand = stock + arrived
+        d = demand[:, t]
+        stock = np.maximum(on_hand - d, 0.0)
+        cost += stock * holding_costs + np.maximum(d - on_hand, 0.0) * stockout_costs
+    return cost if population else cost[0]
+
+
+def summarize_costs(costs: np.ndarray, percentiles: Tuple[int, ...] = (5, 50, 95)) -> Dict[str, Any]:
+    """Mean, standard error and percentiles of replicated costs (or paired savings)."""
+    costs = np.asarray(costs, dtype=float)
+    n = len(costs)
+    summary = {
+        "mean": float(costs.mean()) if n else 0.0,
+        "std_error": float(costs.std(ddof=1) / np.sqrt(n)) if n > 1 else 0.0,
+        "replications": n
+    }
+    if n:
+        for p, value in zip(percentiles, np.percentile(costs, percentiles)):
+            summary[f"p{p}"] = float(value)
+    return summary
@@ -0,0 +1,339 @@
+# app/core/mcts_tree.py
+"""
+Array-backed (struct-of-arrays) Monte Carlo search tree.
+
+Replaces per-node Python objects with parallel NumPy arrays indexed by node id:
+
+    visits        → int64    times the node was selected
+    total_reward  → float64  sum of back-propagated rewards
+    action        → int32    index into the worker's action table
+    parent        → int32    parent node id (-1 for the root)
+    first_child   → int32    head of the child list (-1 if none)
+    next_sibling  → int32    next node in the parent's child list
+    n_children    → int32    number of expanded children
+    next_untried  → int32    base actions expanded so far (expanded in order)
+
+Node 0 is always the root. Arrays grow geometrically, so a tree with millions
+of nodes costs ~40 bytes per node instead of an object, a state copy and two
+lists. Actions themselves live in a worker-owned table (a list of floats for
+one SKU, a matrix of order quantities for a SKU group); the tree only stores
+indices into it.
+
+TranspositionTable optionally shares statistics between tree paths that reach
+the same quantized inventory state and then take the same action.
+"""
+
+import math
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+ROOT = 0
+
+
+class TreeStore:
+    """Preallocated MCTS tree with geometric growth and vectorized UCB selection."""
+
+    def __init__(self, n_base_actions: int, capacity: int = 1024):
+        self.n_base_actions = int(n_base_actions)
+        self.size = 0
+        self._capacity = 0
+        self.visits = np.zeros(0, dtype=np.int64)
+        self.total_reward = np.zeros(0, dtype=np.float64)
+        self.action = np.zeros(0, dtype=np.int32)
+        self.parent = np.zeros(0, dtype=np.int32)
+        self.first_child = np.zeros(0, dtype=np.int32)
+        self.next_sibling = np.zeros(0, dtype=np.int32)
+        self.n_children = np.zeros(0, dtype=np.int32)
+        self.next_untried = np.zeros(0, dtype=np.int32)
+        self._grow(max(int(capacity), 1))
+        self._new_node(parent=-1, action=-1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the node arrays."""
+        return sum(
+            arr.nbytes for arr in (
+                self.visits, self.total_reward, self.action, self.parent,
+                self.first_child, self.next_sibling, self.n_children, self.next_untried
+            )
+        )
+
+    def _grow(self, new_capacity: int) -> None:
+        extra = new_capacity - self._capacity
+        self.visits = np.concatenate([self.visits, np.zeros(extra, dtype=np.int64)])
+        self.total_reward = np.concatenate([self.total_reward, np.zeros(extra, dtype=np.float64)])
+        self.action = np.concatenate([self.action, np.full(extra, -1, dtype=np.int32)])
+        self.parent = np.concatenate([self.parent, np.full(extra, -1, dtype=np.int32)])
+        self.first_child = np.concatenate([self.first_child, np.full(extra, -1, dtype=np.int32)])
+        self.next_sibling = np.concatenate([self.next_sibling, np.full(extra, -1, dtype=np.int32)])
+        self.n_children = np.concatenate([self.n_children, np.zeros(extra, dtype=np.int32)])
+        self.next_untried = np.concatenate([self.next_untried, np.zeros(extra, dtype=np.int32)])
+        self._capacity = new_capacity
+
+    def _new_node(self, parent: int, action: int) -> int:
+        if self.size == self._capacity:
+            self._grow(self._capacity * 2)
+        node = self.size
+        self.parent[node] = parent
+        self.action[node] = action
+        self.size += 1
+        return node
+
+    # ── Structure ──
+
+    def is_fully_expanded(self, node: int) -> bool:
+        return self.next_untried[node] >= self.n_base_actions
+
+    def next_untried_action(self, node: int) -> int:
+        """Base action index the next expansion of this node will use."""
+        return int(self.next_untried[node])
+
+    def add_child(self, node: int, action: int) -> int:
+        """Attach a child reached by `action`; base actions advance the untried cursor."""
+        child = self._new_node(parent=node, action=action)
+        self.next_sibling[child] = self.first_child[node]
+        self.first_child[node] = child
+        self.n_children[node] += 1
+        if action < self.n_base_actions and action == self.next_untried[node]:
+            self.next_untried[node] += 1
+        return child
+
+    def children(self, node: int) -> np.ndarray:
+        """Child node ids, newest first."""
+        next_sibling = self.next_sibling
+        kids = []
+        child = self.first_child.item(node)
+        while child != -1:
+            kids.append(child)
+            child = next_sibling.item(child)
+        return np.array(kids, dtype=np.int64)
+
+    def path_to_root(self, node: int) -> List[int]:
+        path = []
+        while node != -1:
+            path.append(int(node))
+            node = int(self.parent[node])
+        return path
+
+    # ── Statistics ──
+
+    def mean_reward(self, nodes: np.ndarray) -> np.ndarray:
+        visits = self.visits[nodes]
+        return np.where(visits > 0, self.total_reward[nodes] / np.maximum(visits, 1), 0.0)
+
+    def best_child(
+        self,
+        node: int,
+        kids: Optional[np.ndarray] = None,
+        visits: Optional[np.ndarray] = None,
+        total_reward: Optional[np.ndarray] = None
+    ) -> int:
+        """
+        UCB1 with variance-scaled exploration, as one vectorized argmax.
+
+        The exploration weight grows with the spread of the children's mean
+        rewards; unvisited children are always preferred. Callers may pass
+        `kids` with replacement `visits`/`total_reward` (e.g. merged from a
+        TranspositionTable) to score them instead of the node's own counts.
+        """
+        if kids is None:
+            kids = self.children(node)
+        if len(kids) == 0:
+            return node
+
+        parent_visits = self.visits.item(node)
+        if visits is None:
+            visits = self.visits[kids]
+            total_reward = self.total_reward[kids]
+        else:
+            parent_visits = max(parent_visits, int(visits.sum()))
+        visited = visits > 0
+        safe_visits = np.maximum(visits, 1)
+        means = total_reward / safe_visits
+
+        seen = means[visited]
+        variance = float(((seen - seen.mean()) ** 2).mean()) if len(seen) > 1 else 0.0
+        exploration_weight = 1.0 + (variance * 2.0)
+
+        ucb = means + exploration_weight * np.sqrt(math.log(max(parent_visits, 1)) / safe_visits)
+        ucb[~visited] = np.inf
+        return int(kids[np.argmax(ucb)])
+
+    def most_visited_child(self, node: int) -> int:
+        kids = self.children(node)
+        if len(kids) == 0:
+            return -1
+        return int(kids[np.argmax(self.visits[kids])])
+
+    def add_visits(self, path: Iterable[int], count: int = 1) -> None:
+        self.visits[list(path)] += count
+
+    def backpropagate(self, paths: List[List[int]], rewards: np.ndarray, count_visits: bool = True) -> None:
+        """Credit each reward to every node on its path in one scatter-add."""
+        if not paths:
+            return
+        lengths = [len(p) for p in paths]
+        flat = np.fromiter((n for p in paths for n in p), dtype=np.int64, count=sum(lengths))
+        per_node = np.repeat(np.asarray(rewards, dtype=float), lengths)
+        np.add.at(self.total_reward, flat, per_node)
+        if count_visits:
+            np.add.at(self.visits, flat, 1)
+
+
+class TranspositionTable:
+    """
+    LRU-bounded (state, action) statistics shared across tree paths.
+
+    States are quantized to (day, stock bucket, pipeline buckets) with bucket
+    width `quantum`, so paths whose trajectories clip to the same stock and
+    in-transit levels pool their visits and rewards. The least recently used
+    entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int, quantum: float = 1.0):
+        self.max_entries = max(int(max_entries), 1)
+        self.quantum = float(quantum) if quantum > 0 else 1.0
+        self._entries: "OrderedDict[Tuple[Hashable, int], List[float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def state_key(self, day: int, stock: float, pipeline: np.ndarray) -> Hashable:
+        """Quantized, hashable key for an inventory state."""
+        buckets = np.floor(pipeline / self.quantum).astype(np.int64)
+        return (day, int(stock // self.quantum), buckets.tobytes())
+
+    def lookup(self, state_key: Hashable, actions: np.ndarray, visits: np.ndarray, total_reward: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merge shared statistics into per-child arrays.
+
+        Children with a table entry take its (visits, total_reward); the rest
+        keep the values passed in. Hit entries are marked recently used.
+        """
+        visits = np.array(visits, dtype=np.int64)
+        total_reward = np.array(total_reward, dtype=float)
+        entries = self._entries
+        for i, a in enumerate(actions.tolist()):
+            entry = entries.get((state_key, a))
+            if entry is None:
+                self.misses += 1
+                continue
+            self.hits += 1
+            entries.move_to_end((state_key, a))
+            if entry[0] > visits[i]:
+                visits[i] = entry[0]
+                total_reward[i] = entry[1]
+        return visits, total_reward
+
+    def update(self, steps: Iterable[Tuple[Hashable, int]], reward: float) -> None:
+        """Credit one rollout's reward to every (state, action) step on its path."""
+        entries = self._entries
+        for step in steps:
+            entry = entries.get(step)
+            if entry is None:
+                entries[step] = [1, reward]
+                if len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                entry[0] += 1
+                entry[1] += reward
+                entries.move_to_end(step)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def root_stats(tree: TreeStore, action_keys: List) -> Dict[str, list]:
+    """Export the root's children as plain lists so they can cross a process boundary."""
+    kids = tree.children(ROOT)
+    return {
+        "actions": [action_keys[tree.action[k]] for k in kids],
+        "visits": tree.visits[kids].tolist(),
+        "total_reward": tree.total_reward[kids].tolist()
+    }
+
+
+def seed_root(tree: TreeStore, action_table: List, prior: Dict[str, list], max_visits: int) -> int:
+    """
+    Warm-start the root from another search's root statistics.
+
+    Base actions are expanded in order first so the untried cursor stays
+    consistent; prior actions missing from the table are appended as widened
+    children. Prior visits are scaled down to at most `max_visits` in total
+    while keeping each action's mean reward. Returns the visits seeded.
+    """
+    if not prior or not prior.get("actions") or max_visits <= 0:
+        return 0
+    while not tree.is_fully_expanded(ROOT):
+        tree.add_child(ROOT, tree.next_untried_action(ROOT))
+    by_action = {action_table[tree.action[k]]: int(k) for k in tree.children(ROOT)}
+
+    scale = min(1.0, max_visits / max(sum(prior["visits"]), 1))
+    seeded = 0
+    for action, visits, reward in zip(prior["actions"], prior["visits"], prior["total_reward"]):
+        if visits <= 0:
+            continue
+        node = by_action.get(action)
+        if node is None:
+            action_table.append(action)
+            node = tree.add_child(ROOT, len(action_table) - 1)
+            by_action[action] = node
+        n = max(1, int(round(visits * scale)))
+        tree.visits[node] += n
+        tree.total_reward[node] += reward / visits * n
+        tree.total_reward[ROOT] += reward / visits * n
+        seeded += n
+    tree.visits[ROOT] += seeded
+    return seeded
+
+
+def merge_root_stats(stats_list: List[Dict[str, list]]) -> Dict[str, Any]:
+    """
+    Merge root statistics from independent (root-parallel) searches.
+
+    Children are matched by action value; visit counts and rewards are summed.
+    The merged best action is the most visited one, and `agreement` is the
+    fraction of searches whose own most-visited action matches it.
+    """
+    index: Dict[Any, int] = {}
+    visits: List[float] = []
+    rewards: List[float] = []
+    worker_best = []
+
+    for stats in stats_list:
+        if not stats["actions"]:
+            continue
+        worker_best.append(stats["actions"][int(np.argmax(stats["visits"]))])
+        for action, v, r in zip(stats["actions"], stats["visits"], stats["total_reward"]):
+            if action not in index:
+                index[action] = len(visits)
+                visits.append(0.0)
+                rewards.append(0.0)
+            visits[index[action]] += v
+            rewards[index[action]] += r
+
+    if not visits:
+        return {"actions": [], "visits": [], "total_reward": [], "best_action": None, "agreement": 0.0}
+
+    actions = list(index.keys())
+    best = actions[int(np.argmax(visits))]
+    agreement = sum(1 for a in worker_best if a == best) / len(worker_best)
+    return {
+        "actions": actions,
+        "visits": visits,
+        "total_reward": rewards,
+        "best_action": best,
+        "agreement": agreement
+    }
@@ -0,0 +1,239 @@
+# app/core/optimizer_cache.py
+"""
+Persistent result and warm-start cache for the MCTS optimizer.
+
+Re-running the same optimization on the same uploaded dataset used to repeat
+the full search. Results are now stored under a fingerprint of the demand
+arrays plus every parameter that changes the answer:
+
+    exact key → the stored solution, returned as-is
+    warm key  → the search's root statistics, keyed by the demand and cost
+                parameters only (not horizon / iteration budget), used to
+                seed the root of a new search on a near hit
+
+Backends:
+    Redis (when initialized in the app lifespan)
+        mcts_cache:{key}  → JSON blob with TTL
+        mcts_cache_index  → Sorted set of keys scored by last access (LRU)
+    Local disk (fallback, e.g. tests and scripts)
+        {MCTS_CACHE_DIR}/{key}.json, LRU by file mtime
+
+Dict keys are stored as strings (JSON); callers holding non-str labels,
+e.g. integer SKUs, map them back with restore_keys. Both backends are
+bounded by MCTS_CACHE_MAX_ENTRIES; the least recently used entries
+are evicted first. Counters are exposed via get_stats() for /health/detailed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import redis.asyncio as redis
+from typing import Any, Dict, Iterable, Optional, Tuple
+from loguru import logger
+from app.config import get_settings
+
+settings = get_settings()
+
+def _json_default(obj: Any) -> Any:
+    """Serialize NumPy scalars and arrays that leak into solutions."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def _str_keys(obj: Any) -> Any:
+    """JSON-safe copy with every dict key as str (NumPy integer SKU labels are not)."""
+    if isinstance(obj, dict):
+        return {k if isinstance(k, str) else str(k): _str_keys(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_str_keys(v) for v in obj]
+    return obj
+
+
+class OptimizerCache:
+    """
+    Size-bounded LRU cache of optimizer solutions and warm-start statistics.
+
+    `key_prefix` namespaces the Redis keys and index (and `default_dir` the
+    disk fallback), so other caches such as app.core.forecast_cache reuse
+    the same backends.
+    """
+
+    key_prefix = "mcts_cache"
+    default_dir = "aura_mcts_cache"
+
+    def __init__(self, max_entries: int = 512, cache_dir: Optional[str] = None, ttl_s: int = 604800):
+        self.redis_client: Optional[redis.Redis] = None
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_s = int(ttl_s)
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), self.default_dir)
+        self.hits = 0
+        self.warm_starts = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    async def initialize(self):
+        """Initialize Redis connection."""
+        self.redis_client = await redis.from_url(
+            settings.REDIS_URL,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        logger.info("✓ Optimizer cache initialized")
+
+    async def close(self):
+        """Close Redis connection."""
+        if self.redis_client:
+            await self.redis_client.close()
+            logger.info("✓ Optimizer cache closed")
+
+    # ── Keys ──
+
+    @property
+    def index_key(self) -> str:
+        """Sorted set of keys scored by last access."""
+        return f"{self.key_prefix}_index"
+
+    @staticmethod
+    def fingerprint(arrays: Iterable[np.ndarray], **params: Any) -> str:
+        """Stable hash of demand arrays plus parameters."""
+        digest = hashlib.sha256()
+        for arr in arrays:
+            arr = np.ascontiguousarray(arr, dtype=np.float64)
+            digest.update(str(arr.shape).encode())
+            digest.update(arr.tobytes())
+        digest.update(json.dumps(params, sort_keys=True, default=_json_default).encode())
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def restore_keys(obj: Any, labels: Iterable[Any]) -> Any:
+        """Map dict keys stringified by the JSON round trip back to their original labels."""
+        mapping = {str(label): label for label in labels if not isinstance(label, str)}
+        if not mapping:
+            return obj
+        if isinstance(obj, dict):
+            return {mapping.get(k, k): OptimizerCache.restore_keys(v, labels) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [OptimizerCache.restore_keys(v, labels) for v in obj]
+        return obj
+
+    # ── Lookup / Store ──
+
+    async def lookup(self, exact_key: str, warm_key: Optional[str] = None) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Return (solution, warm_start).
+
+        An exact hit returns the stored solution. Otherwise, the warm-start
+        entry (if any) is returned so the caller can seed its search.
+        """
+        solution = await self._get(exact_key)
+        if solution is not None:
+            self.hits += 1
+            return solution, None
+        warm = await self._get(warm_key) if warm_key else None
+        if warm is not None:
+            self.warm_starts += 1
+        else:
+            self.misses += 1
+        return None, warm
+
+    async def store(
+        self,
+        exact_key: str,
+        solution: Dict[str, Any],
+        warm_key: Optional[str] = None,
+        warm_start: Optional[Dict[str, Any]] = None
+    ) -> None:
+        await self._put(exact_key, solution)
+        if warm_key and warm_start is not None:
+            await self._put(warm_key, warm_start)
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for the health dashboard."""
+        lookups = self.hits + self.warm_starts + self.misses
+        return {
+            "backend": "redis" if self.redis_client else "disk",
+            "hits": self.hits,
+            "warm_starts": self.warm_starts,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups > 0 else 0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "max_entries": self.max_entries
+        }
+
+    # ── Backends ──
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            if self.redis_client:
+                data = await self.redis_client.get(f"{self.key_prefix}:{key}")
+                if data is None:
+                    return None
+                await self.redis_client.zadd(self.index_key, {key: time.time()})
+                return json.loads(data)
+
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            if not os.path.exists(path):
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)  # mark as recently used
+            return data
+        except Exception as e:
+            logger.warning(f"Optimizer cache read failed: {e}")
+            return None
+
+    async def _put(self, key: str, value: Dict[str, Any]) -> None:
+        blob = json.dumps(_str_keys(value), default=_json_default)
+        try:
+            if self.redis_client:
+                await self.redis_client.setex(f"{self.key_prefix}:{key}", self.ttl_s, blob)
+                await self.redis_client.zadd(self.index_key, {key: time.time()})
+                overflow = await self.redis_client.zcard(self.index_key) - self.max_entries
+                if overflow > 0:
+                    evicted = await self.redis_client.zpopmin(self.index_key, overflow)
+                    for old_key, _ in evicted:
+                        await self.redis_client.delete(f"{self.key_prefix}:{old_key}")
+                    self.evictions += len(evicted)
+                return
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = os.path.join(self.cache_dir, f"{key}.json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(blob)
+            os.replace(tmp, os.path.join(self.cache_dir, f"{key}.json"))
+            self._evict_disk()
+        except Exception as e:
+            logger.warning(f"Optimizer cache write failed: {e}")
+
+    def _evict_disk(self) -> None:
+        entries = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith(".json")
+        ]
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:overflow]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+
+# Global instance
+optimizer_cache = OptimizerCache(
+    max_entries=settings.MCTS_CACHE_MAX_ENTRIES,
+    cache_dir=settings.MCTS_CACHE_DIR,
+    ttl_s=settings.MCTS_CACHE_TTL_S
+)
@@ -0,0 +1,200 @@
+# app/core/policy_search.py
+"""
+Cross-entropy policy search over static (s, Q) parameters.
+
+The MCTS engine plans a sequence of orders and then reports a static
+policy; this engine searches the policy parameters directly. Each
+generation samples a population of parameter vectors from a diagonal
+Gaussian, scores all of them in one batched simulation (the objective
+receives a (population, dims) array and returns (population,) costs), and
+refits the Gaussian to the elite fraction:
+
+    mean ← (1 − α)·mean + α·mean(elites)
+    std  ← (1 − α)·std  + α·std(elites)
+
+Samples are clipped to [lower, upper]. The search stops when every
+dimension's std falls below `tol` × its initial std, when the best cost
+has not improved for `patience` generations, at `max_generations`, or at
+`time_budget_s`.
+
+The objective should evaluate every candidate on the same scenarios
+(common random numbers) so elites are ranked by policy, not by luck.
+
+batched_cross_entropy_search runs many independent problems of the same
+shape (e.g. unrelated SKUs) in lockstep, one batched objective call per
+generation for all of them.
+"""
+
+import time
+import numpy as np
+from typing import Callable, Dict, Any, Optional
+
+
+def cross_entropy_search(
+    objective: Callable[[np.ndarray], np.ndarray],
+    mean: np.ndarray,
+    std: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    population: int = 64,
+    elite_frac: float = 0.2,
+    max_generations: int = 30,
+    smoothing: float = 0.7,
+    tol: float = 0.02,
+    patience: int = 5,
+    time_budget_s: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, Any]:
+    """
+    Minimize `objective` over a box with the cross-entropy method.
+
+    The initial mean is always evaluated, so the result is never worse than
+    the starting point. Returns the best parameters and cost plus
+    generation, evaluation and convergence bookkeeping.
+    """
+    start_time = time.time()
+    rng = rng if rng is not None else np.random.default_rng()
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    mean = np.clip(np.asarray(mean, dtype=float), lower, upper)
+    std = np.maximum(np.asarray(std, dtype=float), 1e-9)
+    initial_std = std.copy()
+    population = max(int(population), 2)
+    n_elite = max(2, int(round(population * elite_frac)))
+
+    best_params = mean.copy()
+    best_cost = float(objective(mean[None, :])[0])
+    history = [best_cost]
+    evaluations = 1
+    stale = 0
+    generations = 0
+    convergence_reason = "max_generations"
+
+    while generations < max_generations:
+        if time_budget_s is not None and time.time() - start_time > time_budget_s:
+            convergence_reason = "time_budget"
+            break
+
+        samples = np.clip(mean + std * rng.standard_normal((population, len(mean))), lower, upper)
+        samples[0] = mean  # keep the incumbent mean in every generation
+        costs = np.asarray(objective(samples), dtype=float)
+        evaluations += population
+        generations += 1
+
+        elites = samples[np.argsort(costs)[:n_elite]]
+        mean = (1.0 - smoothing) * mean + smoothing * elites.mean(axis=0)
+        std = (1.0 - smoothing) * std + smoothing * elites.std(axis=0)
+
+        best = int(np.argmin(costs))
+        if costs[best] < best_cost - 1e-9 * max(abs(best_cost), 1.0):
+            best_cost, best_params = float(costs[best]), samples[best].copy()
+            stale = 0
+        else:
+            stale += 1
+        history.append(best_cost)
+
+        if (std <= tol * initial_std).all():
+            convergence_reason = "converged"
+            break
+        if stale >= patience:
+            convergence_reason = "no_improvement"
+            break
+
+    return {
+        "params": best_params,
+        "cost": best_cost,
+        "mean": mean,
+        "std": std,
+        "generations": generations,
+        "evaluations": evaluations,
+        "history": history,
+        "convergence_reason": convergence_reason,
+        "computation_time_ms": (time.time() - start_time) * 1000
+    }
+
+
+def batched_cross_entropy_search(
+    objective: Callable[[np.ndarray], np.ndarray],
+    mean: np.ndarray,
+    std: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    population: int = 64,
+    elite_frac: float = 0.2,
+    max_generations: int = 30,
+    smoothing: float = 0.7,
+    tol: float = 0.02,
+    patience: int = 5,
+    time_budget_s: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, Any]:
+    """
+    Run B independent cross-entropy searches in lockstep.
+
+    `mean`, `std`, `lower` and `upper` are (B, dims); the objective receives
+    a (population, B, dims) array and returns (population, B) costs, so
+    problem b only ever ranks its own samples. A problem stops updating once
+    it has converged or gone `patience` generations without improving; the
+    batch stops when every problem has, or at the generation / time limits.
+    Returns per-problem params (B, dims) and costs (B,) plus the same
+    bookkeeping as cross_entropy_search.
+    """
+    start_time = time.time()
+    rng = rng if rng is not None else np.random.default_rng()
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    mean = np.clip(np.asarray(mean, dtype=float), lower, upper)
+    std = np.maximum(np.asarray(std, dtype=float), 1e-9)
+    initial_std = std.copy()
+    population = max(int(population), 2)
+    n_elite = max(2, int(round(population * elite_frac)))
+    n_problems = len(mean)
+
+    best_params = mean.copy()
+    best_cost = np.asarray(objective(mean[None]), dtype=float)[0]
+    evaluations = n_problems
+    stale = np.zeros(n_problems, dtype=int)
+    active = np.ones(n_problems, dtype=bool)
+    generations = 0
+    convergence_reason = "max_generations"
+
+    while generations < max_generations:
+        if time_budget_s is not None and time.time() - start_time > time_budget_s:
+            convergence_reason = "time_budget"
+            break
+
+        samples = np.clip(mean + std * rng.standard_normal((population,) + mean.shape), lower, upper)
+        samples[0] = mean
+        costs = np.asarray(objective(samples), dtype=float)
+        evaluations += population * n_problems
+        generations += 1
+
+        order = np.argsort(costs, axis=0)[:n_elite]  # (n_elite, B)
+        elites = np.take_along_axis(samples, order[:, :, None], axis=0)
+        update = active[:, None]
+        mean = np.where(update, (1.0 - smoothing) * mean + smoothing * elites.mean(axis=0), mean)
+        std = np.where(update, (1.0 - smoothing) * std + smoothing * elites.std(axis=0), std)
+
+        best = order[0]
+        gen_cost = costs[best, np.arange(n_problems)]
+        improved = active & (gen_cost < best_cost - 1e-9 * np.maximum(np.abs(best_cost), 1.0))
+        best_cost = np.where(improved, gen_cost, best_cost)
+        best_params[improved] = samples[best[improved], np.flatnonzero(improved)]
+        stale = np.where(improved, 0, stale + 1)
+
+        active &= ~(std <= tol * initial_std).all(axis=1) & (stale < patience)
+        if not active.any():
+            convergence_reason = "converged"
+            break
+
+    return {
+        "params": best_params,
+        "cost": best_cost,
+        "mean": mean,
+        "std": std,
+        "generations": generations,
+        "evaluations": evaluations,
+        "active": int(active.sum()),
+        "convergence_reason": convergence_reason,
+        "computation_time_ms": (time.time() - start_time) * 1000
+    }
@@ -0,0 +1,93 @@
+# app/core/reconciliation.py
+"""
+Forecast reconciliation for SKU → category → total hierarchies.
+
+Forecasting every node of a hierarchy independently gives numbers that do
+not add up: the SKU forecasts of a category rarely sum to the category
+forecast. With the summing matrix S (nodes × SKUs) mapping bottom-level
+series to every node, reconciliation projects the base forecasts ŷ onto
+coherent ones:
+
+    ỹ = S·G·ŷ        G = (S'·W⁻¹·S)⁻¹·S'·W⁻¹
+
+    bottom_up     G keeps the SKU forecasts and sums them upwards
+    ols           W = I
+    mint_shrink   W = in-sample one-step residual covariance, shrunk
+                  towards its diagonal (Schäfer-Strimmer λ), so noisy
+                  nodes are trusted less and correlated errors are shared
+
+Every horizon is reconciled in the same matrix product. Node order is
+total, then categories, then SKUs (see summing_matrix).
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+METHODS = ("bottom_up", "ols", "mint_shrink")
+
+
+def summing_matrix(categories: Optional[List[Any]] = None, n_bottom: Optional[int] = None) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Summing matrix for a total → category → SKU hierarchy.
+
+    `categories` gives each SKU's category (None for a two-level
+    total → SKU hierarchy of `n_bottom` SKUs). Returns S (nodes, SKUs) and
+    the category labels in row order: row 0 is the total, then one row per
+    category, then the identity block for the SKUs.
+    """
+    n_bottom = len(categories) if categories is not None else n_bottom
+    labels = list(dict.fromkeys(categories)) if categories is not None else []
+    rows = [np.ones(n_bottom)]
+    rows += [np.array([c == label for c in categories], dtype=float) for label in labels]
+    return np.vstack(rows + [np.eye(n_bottom)]), labels
+
+
+def _shrunk_covariance(residuals: np.ndarray) -> np.ndarray:
+    """Residual covariance (nodes, nodes) shrunk towards its diagonal"""
+    x = residuals - residuals.mean(axis=1, keepdims=True)
+    n_obs = x.shape[1]
+    cov = x @ x.T / n_obs
+    std = np.sqrt(np.diag(cov))
+    z = x / np.where(std > 0, std, 1.0)[:, None]
+    corr = z @ z.T / n_obs
+    corr_var = n_obs / (n_obs - 1) ** 3 * ((z ** 2) @ (z ** 2).T - n_obs * corr ** 2)
+    off = ~np.eye(len(cov), dtype=bool)
+    denom = float((corr[off] ** 2).sum())
+    lam = float(np.clip(corr_var[off].sum() / denom, 0.0, 1.0)) if denom > 0 else 1.0
+    return lam * np.diag(np.diag(cov)) + (1.0 - lam) * cov
+
+
+def reconcile(
+    base: np.ndarray,
+    S: np.ndarray,
+    method: str = "mint_shrink",
+    residuals: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Reconcile base forecasts (nodes, horizon) over the hierarchy S.
+
+    `residuals` (nodes, T) are the base models' in-sample one-step errors,
+    needed by mint_shrink; time steps where any node has no residual are
+    dropped, and MinT falls back to OLS with fewer than 3 usable steps.
+    Returns the coherent forecasts (nodes, horizon), the method actually
+    used and the largest incoherence of the base forecasts.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown reconciliation method {method!r}; expected one of {METHODS}")
+    n_bottom = S.shape[1]
+    incoherence = float(np.abs(S @ base[-n_bottom:] - base).max())
+
+    if method == "bottom_up":
+        return {"forecast": S @ base[-n_bottom:], "method": method, "incoherence": incoherence}
+
+    W = np.eye(len(S))
+    if method == "mint_shrink":
+        usable = residuals[:, np.isfinite(residuals).all(axis=0)] if residuals is not None else np.empty((len(S), 0))
+        if usable.shape[1] >= 3:
+            W = _shrunk_covariance(usable)
+            W += np.eye(len(W)) * max(float(np.trace(W)) / len(W), 1.0) * 1e-6  # constant series have zero variance
+        else:
+            method = "ols"
+    Winv_S = np.linalg.solve(W, S)
+    G = np.linalg.solve(S.T @ Winv_S, Winv_S.T)
+    return {"forecast": S @ (G @ base), "method": method, "incoherence": incoherence}
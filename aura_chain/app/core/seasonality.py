@@ -0,0 +1,96 @@
+# app/core/seasonality.py
+"""
+Batched FFT seasonality detection.
+
+Series (daily, possibly of different lengths) are grouped by length and
+each group is stacked into one (S, N) matrix and processed together:
+
+    1. Detrend: per-series linear fit, all solved as one batch of 2×2
+       normal equations
+    2. Periodogram: a single rfft over the matrix, power = |X(f)|²
+    3. Classify: the `top_k` strongest spectral peaks (local maxima) of
+       each series; a peak with period in 6–8 days flags weekly
+       seasonality, 350–380 days yearly
+
+Series are never padded, so each is ranked on its own frequency grid and
+its profile does not depend on which other series share the call. Per-SKU
+series from one dataset usually share their dates, so this is one group
+in the common case. Each profile also carries the share of spectral power
+in the weekly and yearly bands and the dominant period, for callers that
+want a graded signal rather than flags.
+"""
+
+import numpy as np
+from typing import Dict, List
+
+WEEKLY_BAND = (6.0, 8.0)
+YEARLY_BAND = (350.0, 380.0)
+MIN_LENGTH = 14  # Two weeks before any seasonality is claimed
+
+
+def _profile_group(values: np.ndarray, top_k: int) -> List[Dict]:
+    """Profiles for a (S, N) matrix of equal-length series."""
+    n_series, n = values.shape
+    empty = {
+        "weekly_seasonality": False, "yearly_seasonality": False,
+        "weekly_strength": 0.0, "yearly_strength": 0.0,
+        "dominant_period": None, "length": n
+    }
+    if n < 2:
+        return [dict(empty) for _ in range(n_series)]
+
+    # Least squares y ≈ a + b·t per series, one batched solve
+    t = np.arange(n, dtype=float)
+    design = np.stack([np.ones(n), t], axis=1)
+    coef = np.linalg.solve(design.T @ design, design.T @ values.T)
+    detrended = values - (design @ coef).T
+
+    power = np.abs(np.fft.rfft(detrended, axis=1)) ** 2
+    power, periods = power[:, 1:], 1.0 / np.fft.rfftfreq(n)[1:]
+
+    # Local maxima of each periodogram, strongest first
+    padded = np.pad(power, ((0, 0), (1, 1)), constant_values=-np.inf)
+    peaks = (power > padded[:, :-2]) & (power >= padded[:, 2:])
+    ranked = np.argsort(np.where(peaks, power, -np.inf), axis=1)[:, ::-1][:, :top_k]
+    top_periods = np.where(np.take_along_axis(peaks, ranked, axis=1), periods[ranked], np.nan)
+
+    total = power.sum(axis=1)
+    total = np.where(total > 0, total, np.inf)
+    long_enough = n >= MIN_LENGTH
+    profile = {}
+    for name, (low, high) in (("weekly", WEEKLY_BAND), ("yearly", YEARLY_BAND)):
+        band = (periods >= low) & (periods <= high)
+        profile[f"{name}_strength"] = power[:, band].sum(axis=1) / total
+        profile[f"{name}_seasonality"] = ((top_periods >= low) & (top_periods <= high)).any(axis=1) & long_enough
+
+    return [
+        {
+            "weekly_seasonality": bool(profile["weekly_seasonality"][i]),
+            "yearly_seasonality": bool(profile["yearly_seasonality"][i]),
+            "weekly_strength": float(profile["weekly_strength"][i]),
+            "yearly_strength": float(profile["yearly_strength"][i]),
+            "dominant_period": float(top_periods[i, 0]) if long_enough and np.isfinite(top_periods[i, 0]) else None,
+            "length": n
+        }
+        for i in range(n_series)
+    ]
+
+
+def detect_seasonality(series: List[np.ndarray], top_k: int = 3) -> List[Dict]:
+    """
+    Classify weekly / yearly seasonality for every series at once.
+
+    Returns one profile per series, in input order, with
+    "weekly_seasonality" and "yearly_seasonality" flags, "weekly_strength"
+    and "yearly_strength" (band share of non-DC power), "dominant_period"
+    (days, None when undefined) and "length".
+    """
+    profiles: List[Dict] = [None] * len(series)
+    by_length: Dict[int, List[int]] = {}
+    for i, values in enumerate(series):
+        by_length.setdefault(len(values), []).append(i)
+    for length, indices in by_length.items():
+        batch = np.vstack([np.asarray(series[i], dtype=float) for i in indices]).reshape(len(indices), length)
+        for i, profile in zip(indices, _profile_group(batch, top_k)):
+            profiles[i] = profile
+    return profiles
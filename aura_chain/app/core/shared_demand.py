@@ -0,0 +1,108 @@
+# app/core/shared_demand.py
+"""
+Shared-memory transport for demand histories sent to MCTS pool workers.
+
+Submitting a search to the ProcessPoolExecutor pickles every argument, so
+multi-year per-SKU histories were re-serialized for every group and every
+root-parallel search. Instead, the request publishes its demand matrix once
+into multiprocessing.shared_memory and sends workers a small DemandRef
+(segment name, shape, row index, scale). Workers copy the one row they need
+and detach immediately; the publisher unlinks the segment when the request
+finishes.
+
+Layout: one row per SKU (n_skus × n_days, C-order), so each SKU's history is
+a contiguous slice of the segment.
+
+Usage:
+    with SharedDemandMatrix(pivoted.values.T, list(pivoted.columns)) as shared:
+        ref = shared.ref("SKU-42", scale=1.1)
+        await loop.run_in_executor(pool, worker, ref, ...)
+
+    # in the worker
+    demand_history = resolve_demand(ref)
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class DemandHandle:
+    """Picklable description of a published demand matrix."""
+    name: str
+    shape: Tuple[int, int]
+    dtype: str = "float64"
+
+
+@dataclass(frozen=True)
+class DemandRef:
+    """One SKU's row in a published demand matrix, optionally rescaled."""
+    handle: DemandHandle
+    row: int
+    scale: float = 1.0
+
+    def load(self) -> np.ndarray:
+        """Attach, copy the row out and detach."""
+        shm = shared_memory.SharedMemory(name=self.handle.name)
+        try:
+            matrix = np.ndarray(self.handle.shape, dtype=self.handle.dtype, buffer=shm.buf)
+            row = np.array(matrix[self.row], dtype=float)
+        finally:
+            shm.close()
+        if self.scale != 1.0:
+            row *= self.scale
+        return row
+
+
+def resolve_demand(demand: Union[np.ndarray, DemandRef, Sequence[float]]) -> np.ndarray:
+    """Return a demand history whether it was sent inline or by reference."""
+    if isinstance(demand, DemandRef):
+        return demand.load()
+    return np.asarray(demand, dtype=float)
+
+
+class SharedDemandMatrix:
+    """
+    Owns one shared-memory segment for the lifetime of a request.
+
+    Rows are SKUs (or a single series), columns are days. Use as a context
+    manager so the segment is unlinked even if the request fails.
+    """
+
+    def __init__(self, matrix: np.ndarray, labels: Optional[List[Any]] = None):
+        matrix = np.ascontiguousarray(np.atleast_2d(matrix), dtype=np.float64)
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(
+            create=True, size=max(matrix.nbytes, 1)
+        )
+        view = np.ndarray(matrix.shape, dtype=np.float64, buffer=self._shm.buf)
+        view[:] = matrix
+        self.handle = DemandHandle(name=self._shm.name, shape=tuple(matrix.shape))
+        self._rows = {label: i for i, label in enumerate(labels)} if labels is not None else {}
+        logger.debug(f"Published demand matrix {matrix.shape} to shared memory {self._shm.name}")
+
+    def ref(self, label: Any = None, row: Optional[int] = None, scale: float = 1.0) -> DemandRef:
+        """Reference a row by label (SKU) or by index."""
+        if row is None:
+            row = self._rows[label] if label is not None else 0
+        return DemandRef(handle=self.handle, row=int(row), scale=float(scale))
+
+    def close(self) -> None:
+        """Detach and unlink the segment (idempotent)."""
+        if self._shm is None:
+            return
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        finally:
+            self._shm = None
+
+    def __enter__(self) -> "SharedDemandMatrix":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from app.config import get_settings
 from app.core.memory import session_manager, memory_manager
 from app.core.streaming import streaming_service
-from app.core.registry import register_all_agents
+from app.core.registry import register_all_agents, agent_registry
 from app.core.artifacts import artifact_store
 from app.core.shared_context import shared_context
 from app.core.rate_limiter import rate_limiter
@@ -14,6 +14,8 @@ from app.core.reasoning_trace import reasoning_trace_store
 from app.core.experiments import experiment_logger
 from app.core.tool_registry import tool_registry, register_default_tools
 from app.core.decision_memory import decision_memory
+from app.core.optimizer_cache import optimizer_cache
+from app.core.forecast_cache import forecast_cache
 from app.api.routes import orchestrator, data, analytics, health, sse, reports
 from app.api.routes import experiments as experiments_routes
 from app.api.routes import decisions as decisions_routes
@@ -37,6 +39,8 @@ async def lifespan(app: FastAPI):
         await experiment_logger.initialize()
         await tool_registry.initialize()
         await decision_memory.initialize()
+        await optimizer_cache.initialize()
+        await forecast_cache.initialize()
         register_all_agents()
         register_default_tools()
         print("✓ All systems initialized")
@@ -58,6 +62,13 @@ async def lifespan(app: FastAPI):
         await experiment_logger.close()
         await tool_registry.close()
         await decision_memory.close()
+        await optimizer_cache.close()
+        await forecast_cache.close()
+        # Agents owning process pools stop their worker processes
+        for name in ("forecaster", "mcts_optimizer"):
+            agent = agent_registry.get_agent(name)
+            if agent is not None:
+                agent.shutdown()
         print("✓ All systems closed")
     except Exception as e:
         print(f"Warning: Cleanup failed: {e}")
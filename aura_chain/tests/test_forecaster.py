@@ -0,0 +1,333 @@
+# tests/test_forecaster.py
+"""
+Unit tests: Forecaster series preparation, pooled Prophet fitting and the fast tier
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+
+
+def _sales_frame(days: int = 60, skus: int = 3, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=days).strftime("%Y-%m-%d")
+    return pd.DataFrame([
+        {"date": d, "sku": f"S{s}", "sales": float(rng.poisson(10 + 5 * s)),
+         "units": float(rng.poisson(4)), "returns": float(rng.poisson(1)), "margin": float(rng.normal(3, 0.5))}
+        for d in dates for s in range(skus)
+    ])
+
+
+# ── Pooled Prophet Fitting ──
+
+class TestPooledForecasting:
+    """Unit tests for ForecasterAgent._forecast_series and _fit_prophet_worker"""
+
+    def test_worker_returns_forecast_payload(self):
+        from app.agents.forecaster import ForecasterAgent, _fit_prophet_worker
+
+        agent = ForecasterAgent.__new__(ForecasterAgent)
+        df = _sales_frame()
+        df["date"] = pd.to_datetime(df["date"])
+        series = agent._prepare_series(df, "date", "sales")
+        result = _fit_prophet_worker(series, 7, {"weekly_seasonality": True})
+
+        assert len(series) == 60  # SKUs summed per day
+        assert len(result["predictions"]) == 7
+        assert result["predictions"][0]["date"] == "2024-03-01"
+        assert {"mape", "trend", "volatility"} <= set(result["metrics"])
+
+    @pytest.mark.asyncio
+    async def test_process_forecasts_every_column_and_sku(self):
+        from app.agents.forecaster import ForecasterAgent
+        from app.agents.base_agent import AgentRequest
+
+        agent = ForecasterAgent()
+        df = _sales_frame()
+        try:
+            with patch.object(ForecasterAgent, "_get_interpretation", AsyncMock(return_value="ok")), \
+                 patch.object(ForecasterAgent, "get_upstream_findings", AsyncMock(return_value=None)), \
+                 patch.object(ForecasterAgent, "publish_findings", AsyncMock()) as publish:
+                response = await agent.process(AgentRequest(
+                    query="forecast demand",
+                    context={"dataset": df.to_dict("records")},
+                    parameters={"periods": 5, "per_sku": True}
+                ))
+            assert response.success, response.error
+            # No longer capped at three columns
+            assert set(response.data["forecasts"]) == {"sales", "units", "returns", "margin"}
+            assert set(response.data["sku_forecasts"]) == {"S0", "S1", "S2"}
+            findings = publish.call_args[0][1]
+            assert {"S0", "S1", "S2", "sales"} <= set(findings["predictions_summary"])
+        finally:
+            agent.shutdown()
+
+    def test_pool_starts_on_first_use_and_shuts_down(self):
+        from app.agents.forecaster import ForecasterAgent
+
+        agent = ForecasterAgent()
+        assert agent._pool is None  # constructing an agent starts no processes
+        pool = agent.pool
+        assert agent.pool is pool
+        agent.shutdown()
+        assert agent._pool is None
+        agent.shutdown()  # idempotent
+
+    @pytest.mark.asyncio
+    async def test_failed_series_are_left_out(self):
+        from app.agents.forecaster import ForecasterAgent
+
+        agent = ForecasterAgent()
+        good = pd.DataFrame({"ds": pd.date_range("2024-01-01", periods=30), "y": np.arange(30.0)})
+        bad = pd.DataFrame({"ds": pd.to_datetime([]), "y": []})
+        try:
+            results = await agent._forecast_series({"good": good, "bad": bad}, periods=3)
+            assert set(results) == {"good"}
+        finally:
+            agent.shutdown()
+
+
+# ── Fitted-model Cache ──
+
+class TestForecastCache:
+    """Unit tests for forecast_cache.ForecastCache and cache-first forecasting"""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_and_evict(self, tmp_path):
+        from app.core.forecast_cache import ForecastCache
+
+        cache = ForecastCache(max_entries=1, cache_dir=str(tmp_path), ttl_s=3600)
+        await cache.put("a", {"forecast": "{}"})
+        assert (await cache.get("a"))["forecast"] == "{}"
+
+        await cache.put("b", {"forecast": "{}"})  # evicts "a"
+        assert await cache.get("a") is None
+        assert cache.evictions == 1
+
+        cache.ttl_s = -1
+        assert await cache.get("b") is None
+        assert not list(tmp_path.iterdir())
+
+    def test_series_key_tracks_data_and_settings(self):
+        from app.core.forecast_cache import ForecastCache
+
+        history = pd.DataFrame({"ds": pd.date_range("2024-01-01", periods=10), "y": np.arange(10.0)})
+        key = ForecastCache.series_key(history, column="sales", periods=30)
+
+        assert key == ForecastCache.series_key(history.copy(), column="sales", periods=30)
+        assert key != ForecastCache.series_key(history, column="sales", periods=14)
+        assert key != ForecastCache.series_key(history.assign(y=history["y"] + 1), column="sales", periods=30)
+
+    @pytest.mark.asyncio
+    async def test_prefit_is_served_to_the_next_request(self, tmp_path):
+        from app.agents.forecaster import ForecasterAgent
+        from app.core.forecast_cache import ForecastCache
+
+        cache = ForecastCache(cache_dir=str(tmp_path))
+        agent = ForecasterAgent()
+        df = _sales_frame(skus=1)
+        try:
+            with patch("app.agents.forecaster.forecast_cache", cache), \
+                 patch("app.agents.forecaster.settings.FORECAST_TIER", "prophet"):
+                assert await agent.prefit(df.to_dict("records"), periods=7) == 4
+                df["date"] = pd.to_datetime(df["date"])
+                series = {"sales": agent._prepare_series(df, "date", "sales")}
+                fitted = await agent._forecast_series(series, 7, use_cache=False)
+                cached = await agent._forecast_series(series, 7)
+
+            assert cache.hits == 1 and cache.stores == 4
+            assert [p["value"] for p in cached["sales"]["predictions"]] == pytest.approx(
+                [p["value"] for p in fitted["sales"]["predictions"]]
+            )
+            assert cached["sales"]["metrics"]["mape"] == pytest.approx(fitted["sales"]["metrics"]["mape"])
+        finally:
+            agent.shutdown()
+
+
+    @pytest.mark.asyncio
+    async def test_prefit_uses_the_locale_a_request_would(self):
+        from app.agents.forecaster import ForecasterAgent, _resolve_locale
+
+        df = _sales_frame(skus=1).assign(country="India")
+        assert _resolve_locale(df) == _resolve_locale(df, "forecast demand") == "IN"
+        assert _resolve_locale(df, "forecast demand in the uk") == "UK"
+        assert _resolve_locale(df.drop(columns="country")) == "US"
+        assert _resolve_locale(df.assign(country="de")) == "DE"
+
+        agent = ForecasterAgent()
+        try:
+            with patch.object(ForecasterAgent, "_forecast_series", AsyncMock(return_value={})) as forecast:
+                await agent.prefit(df.to_dict("records"), periods=7)
+                assert forecast.call_args.kwargs["locale"] == "IN"
+                await agent.prefit(df.to_dict("records"), periods=7, locale="AU")
+                assert forecast.call_args.kwargs["locale"] == "AU"
+        finally:
+            agent.shutdown()
+
+
+# ── Fast Statistical Tier ──
+
+class TestFastForecast:
+    """Unit tests for fast_forecast and the Forecaster's tier selection"""
+
+    def test_batch_picks_a_model_per_series(self):
+        from app.core.fast_forecast import fast_forecast
+
+        rng = np.random.default_rng(0)
+        t = np.arange(120.0)
+        seasonal = 20 + 5 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 0.5, 120)
+        trending = 5 + 0.5 * t + rng.normal(0, 0.5, 120)
+        short = np.array([4.0, 5.0, 6.0, 5.0, 4.0])
+        fits = fast_forecast([seasonal, trending, short], horizon=14)
+
+        assert fits[0]["model"] in ("holt_winters", "seasonal_naive")
+        assert fits[1]["forecast"][-1] == pytest.approx(5 + 0.5 * 133, rel=0.05)
+        assert len(fits[2]["forecast"]) == 14 and fits[2]["season_length"] == 1
+        for fit in fits:
+            assert (fit["lower"] <= fit["forecast"]).all() and (fit["forecast"] <= fit["upper"]).all()
+            assert fit["backtest_mase"] < 1.0
+
+    @pytest.mark.asyncio
+    async def test_escalates_only_what_the_fast_tier_cannot_fit(self):
+        from app.agents.forecaster import ForecasterAgent
+
+        agent = ForecasterAgent()
+        days = pd.date_range("2024-01-01", periods=60)
+        flat = pd.DataFrame({"ds": days, "y": np.random.default_rng(0).poisson(10, 60).astype(float)})
+        # Trend reversal inside the backtest window: worse than naive, so Prophet takes it
+        shifted = pd.DataFrame({"ds": days, "y": np.r_[np.arange(50.0), 50 - 4 * np.arange(1.0, 11)]})
+        try:
+            with patch("app.agents.forecaster.forecast_cache.get", AsyncMock(return_value=None)), \
+                 patch("app.agents.forecaster.forecast_cache.put", AsyncMock()):
+                results = await agent._forecast_series({"flat": flat, "shifted": shifted}, periods=7)
+                forced = await agent._forecast_series({"shifted": shifted}, periods=7, tier="fast")
+
+            assert results["flat"]["metrics"]["model"] != "prophet"
+            assert results["shifted"]["metrics"]["model"] == "prophet"
+            assert forced["shifted"]["metrics"]["model"] != "prophet"
+            assert results["flat"]["predictions"][0]["date"] == "2024-03-01"
+            assert set(results["flat"]) == set(results["shifted"])
+        finally:
+            agent.shutdown()
+
+
+# ── Hierarchical Reconciliation ──
+
+class TestHierarchicalForecasting:
+    """Unit tests for reconciliation and the Forecaster's hierarchical mode"""
+
+    def test_every_method_returns_coherent_forecasts(self):
+        from app.core.reconciliation import reconcile, summing_matrix
+
+        S, labels = summing_matrix(["A", "A", "B"])
+        assert labels == ["A", "B"] and S.shape == (6, 3)
+
+        rng = np.random.default_rng(0)
+        base = rng.uniform(5, 15, (6, 4))
+        residuals = rng.normal(0, 1, (6, 50))
+        for method in ("bottom_up", "ols", "mint_shrink"):
+            result = reconcile(base, S, method, residuals=residuals)
+            forecast = result["forecast"]
+            assert forecast[0] == pytest.approx(forecast[3:].sum(axis=0))
+            assert forecast[1] == pytest.approx(forecast[3] + forecast[4])
+            assert result["method"] == method
+        assert reconcile(base, S, "bottom_up")["forecast"][3:] == pytest.approx(base[3:])
+        assert reconcile(base, S, "mint_shrink")["method"] == "ols"  # no residuals to estimate W
+
+    @pytest.mark.asyncio
+    async def test_process_publishes_reconciled_sku_predictions(self):
+        from app.agents.forecaster import ForecasterAgent
+        from app.agents.base_agent import AgentRequest
+
+        agent = ForecasterAgent()
+        df = _sales_frame(skus=4)
+        df["category"] = df["sku"].map({"S0": "A", "S1": "A", "S2": "B", "S3": "B"})
+        try:
+            with patch.object(ForecasterAgent, "_get_interpretation", AsyncMock(return_value="ok")), \
+                 patch.object(ForecasterAgent, "get_upstream_findings", AsyncMock(return_value=None)), \
+                 patch.object(ForecasterAgent, "publish_findings", AsyncMock()) as publish:
+                response = await agent.process(AgentRequest(
+                    query="forecast demand",
+                    context={"dataset": df.to_dict("records")},
+                    parameters={"periods": 7, "hierarchical": True, "forecast_tier": "fast"}
+                ))
+            assert response.success, response.error
+            data = response.data
+            assert data["metadata"]["sku_column"] == "sku"
+            assert data["hierarchy"]["category_column"] == "category"
+
+            sku_values = {sku: np.array([p["value"] for p in f["predictions"]]) for sku, f in data["sku_forecasts"].items()}
+            category_a = [p["value"] for p in data["hierarchy"]["categories"]["A"]["predictions"]]
+            total = [p["value"] for p in data["hierarchy"]["total"]["predictions"]]
+            assert category_a == pytest.approx(sku_values["S0"] + sku_values["S1"])
+            assert total == pytest.approx(sum(sku_values.values()))
+
+            findings = publish.call_args[0][1]
+            assert findings["sku_predictions"]["S2"] == pytest.approx(list(sku_values["S2"]), abs=1e-3)
+        finally:
+            agent.shutdown()
+
+
+    @pytest.mark.asyncio
+    async def test_weekly_data_falls_back_to_flat_sku_forecasts(self):
+        from app.agents.forecaster import ForecasterAgent
+        from app.agents.base_agent import AgentRequest
+
+        agent = ForecasterAgent()
+        df = _sales_frame(days=180, skus=3)
+        df = df[pd.to_datetime(df["date"]).dt.dayofweek == 0]  # one row per SKU per week
+        try:
+            with patch.object(ForecasterAgent, "_get_interpretation", AsyncMock(return_value="ok")), \
+                 patch.object(ForecasterAgent, "get_upstream_findings", AsyncMock(return_value=None)), \
+                 patch.object(ForecasterAgent, "publish_findings", AsyncMock()) as publish:
+                response = await agent.process(AgentRequest(
+                    query="forecast demand",
+                    context={"dataset": df.to_dict("records")},
+                    parameters={"periods": 4, "hierarchical": True, "forecast_tier": "fast"}
+                ))
+            assert response.success, response.error
+            data = response.data
+            assert "hierarchy" not in data and data["metadata"]["reconciliation"] is None
+            assert set(data["sku_forecasts"]) == {"S0", "S1", "S2"}
+
+            # Not zero-filled into daily data, so the level stays near the weekly sales
+            findings = publish.call_args[0][1]
+            weekly_mean = df.loc[df["sku"] == "S2", "sales"].mean()
+            assert np.mean(findings["sku_predictions"]["S2"]) == pytest.approx(weekly_mean, rel=0.5)
+        finally:
+            agent.shutdown()
+
+
+# ── Batched Seasonality Detection ──
+
+class TestSeasonalityDetection:
+    """Unit tests for seasonality.detect_seasonality"""
+
+    def test_profiles_series_of_different_lengths(self):
+        from app.core.seasonality import detect_seasonality
+
+        rng = np.random.default_rng(0)
+        weekly = 10 + 3 * np.sin(2 * np.pi * np.arange(90) / 7) + rng.normal(0, 0.5, 90)
+        t = np.arange(730)
+        yearly = 50 + 0.05 * t + 10 * np.sin(2 * np.pi * t / 365) + rng.normal(0, 1, 730)
+        noise = rng.normal(10, 1, 200)
+        profiles = detect_seasonality([weekly, yearly, noise, np.array([1.0, 2.0])])
+
+        assert profiles[0]["weekly_seasonality"] and not profiles[0]["yearly_seasonality"]
+        assert profiles[0]["dominant_period"] == pytest.approx(7, abs=0.5)
+        assert profiles[1]["yearly_seasonality"] and not profiles[1]["weekly_seasonality"]
+        assert profiles[0]["weekly_strength"] > 0.5 > profiles[2]["weekly_strength"]
+        assert not profiles[2]["yearly_seasonality"]  # too short to hold a year, despite the padding
+        assert profiles[3]["dominant_period"] is None and profiles[3]["length"] == 2
+
+    def test_flags_do_not_depend_on_the_rest_of_the_batch(self):
+        from app.core.seasonality import detect_seasonality
+
+        rng = np.random.default_rng(3)
+        series = [
+            10 + 1.5 * np.sin(2 * np.pi * np.arange(n) / 7) + rng.normal(0, 2, n)
+            for n in (45, 60, 90, 120, 200)
+        ]
+        alone = [detect_seasonality([s])[0] for s in series]
+        mixed = detect_seasonality(series + [rng.normal(10, 1, 1000)])[:len(series)]
+        assert mixed == alone
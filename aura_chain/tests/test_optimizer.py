@@ -0,0 +1,1221 @@
+# tests/test_optimizer.py
+"""
+Unit tests: Vectorized inventory simulation, MCTS optimizer workers
+"""
+import pytest
+import numpy as np
+
+
+# ── Batch Rollout Engine ──
+
+class TestBatchRolloutEngine:
+    """Unit tests for inventory_sim.BatchRolloutEngine"""
+
+    def _engine(self, demand=(10.0,), horizon=5, actions=(0.0,), max_action=0.0, seed=0):
+        from app.core.inventory_sim import BatchRolloutEngine
+        return BatchRolloutEngine(
+            np.array(demand), holding_cost=1.0, stockout_cost=10.0, horizon=horizon,
+            action_space=list(actions), max_action=max_action,
+            rng=np.random.default_rng(seed)
+        )
+
+    def test_rollout_matches_scalar_transition(self):
+        from app.agents.mcts_optimizer import InventoryState
+
+        engine = self._engine()
+        stock, pipeline, day, cost = engine.empty_state(3)
+        stock[:] = 25.0
+        totals = engine.rollout(stock, pipeline, day, cost)
+
+        state = InventoryState(current_stock=25.0, day=0)
+        for _ in range(5):
+            state = state.transition(0.0, 10.0, 1.0, 10.0)
+
+        np.testing.assert_allclose(totals, state.total_cost)
+
+    def test_rows_past_horizon_are_untouched(self):
+        engine = self._engine()
+        stock, pipeline, day, cost = engine.empty_state(2)
+        stock[:] = 25.0
+        day[:] = [5, 3]
+        cost[:] = [7.0, 0.0]
+
+        totals = engine.rollout(stock, pipeline, day, cost)
+
+        assert totals[0] == 7.0
+        assert totals[1] == 15.0 + 5.0  # days 3 and 4 only
+        assert cost[0] == 7.0  # inputs are not modified
+
+    def test_pipeline_arrivals_are_received(self):
+        from app.core.inventory_sim import ArrivalPipeline
+
+        engine = self._engine(demand=(0.0,), horizon=3)
+        stock, _, day, cost = engine.empty_state(1)
+        arrivals = ArrivalPipeline()
+        arrivals.schedule(day=0, lead_time=2, qty=4.0)
+
+        totals = engine.rollout(stock, arrivals.slots[None, :], day, cost)
+
+        # Nothing on hand for days 0-1, 4 units held on day 2
+        assert totals[0] == pytest.approx(4.0)
+
+    def test_truncated_rollout_adds_leaf_value(self):
+        from app.core.inventory_sim import BatchRolloutEngine, ScenarioBank
+
+        history = np.array([4.0, 10.0, 16.0])
+        bank = ScenarioBank.for_single_sku(history, horizon=30, n_scenarios=8)
+        seen = {}
+
+        def leaf_value(stock, in_transit, days_remaining):
+            seen["days"] = days_remaining.tolist()
+            return days_remaining * 100.0
+
+        def engine(horizon, **kwargs):
+            return BatchRolloutEngine(
+                history, 1.0, 10.0, horizon, [0.0, 10.0], 20.0,
+                rng=np.random.default_rng(5), bank=bank, **kwargs
+            )
+
+        truncated = engine(30, rollout_depth=7, leaf_value=leaf_value)
+        short = engine(7)
+        stock, pipeline, day, cost = truncated.empty_state(3)
+        stock[:] = 20.0
+        day[:] = [0, 2, 26]
+        scenarios = np.array([0, 3, 5])
+
+        totals = truncated.rollout(stock, pipeline, day, cost, scenarios)
+        simulated = short.rollout(stock, pipeline, np.zeros(3, dtype=np.int64), cost, scenarios)
+
+        assert seen["days"] == [23, 21, 0]
+        assert totals[0] == pytest.approx(simulated[0] + 2300.0)  # first 7 days simulated, rest from the leaf
+        assert totals[2] < 100.0 * 4 * 16.0  # the last 4 days are simulated, no leaf value
+
+
+# ── Arrival Pipeline ──
+
+class TestArrivalPipeline:
+    """Unit tests for inventory_sim.ArrivalPipeline"""
+
+    def test_ring_buffer_receives_on_arrival_day(self):
+        from app.core.inventory_sim import ArrivalPipeline
+
+        pipeline = ArrivalPipeline(width=4)
+        pipeline.schedule(day=5, lead_time=3, qty=2.0)
+        pipeline.schedule(day=6, lead_time=0, qty=1.0)
+
+        assert pipeline.receive(5) == 0.0
+        assert pipeline.receive(6) == 1.0
+        assert pipeline.in_transit() == 2.0
+        assert pipeline.receive(7) == 0.0
+        assert pipeline.receive(8) == 2.0
+        assert pipeline.in_transit() == 0.0
+
+    def test_copy_is_independent(self):
+        from app.core.inventory_sim import ArrivalPipeline
+
+        pipeline = ArrivalPipeline(n_items=2)
+        pipeline.schedule(day=0, lead_time=1, qty=np.array([1.0, 3.0]))
+        clone = pipeline.copy()
+        clone.receive(1)
+
+        np.testing.assert_array_equal(pipeline.in_transit(), [1.0, 3.0])
+        np.testing.assert_array_equal(clone.in_transit(), [0.0, 0.0])
+
+    def test_rejects_lead_time_wider_than_buffer(self):
+        from app.core.inventory_sim import ArrivalPipeline
+
+        with pytest.raises(ValueError):
+            ArrivalPipeline(width=3).schedule(day=0, lead_time=3, qty=1.0)
+
+
+# ── Scenario Bank ──
+
+class TestScenarioBank:
+    """Unit tests for inventory_sim.ScenarioBank"""
+
+    def test_draws_depend_only_on_seed_and_sku(self):
+        from app.core.inventory_sim import ScenarioBank
+
+        history = np.arange(1.0, 21.0)
+        full = ScenarioBank({"A": history, "B": history * 2}, horizon=7, n_scenarios=16, seed=3)
+        group = ScenarioBank({"B": history * 2}, horizon=7, n_scenarios=16, seed=3)
+
+        assert full.demand("A").shape == (16, 7)
+        np.testing.assert_array_equal(full.demand("B"), group.demand("B"))
+        np.testing.assert_array_equal(full.lead_times("B", 1, 3), group.lead_times("B", 1, 3))
+        assert set(np.unique(full.demand("A"))) <= set(history)
+
+    def test_lead_times_map_quantiles_to_range(self):
+        from app.core.inventory_sim import ScenarioBank
+
+        bank = ScenarioBank.for_single_sku(np.ones(5), horizon=50, n_scenarios=40)
+        single = bank.lead_times()
+        joint = bank.lead_times(low=1, high=3)
+
+        assert single.min() == 0 and single.max() == 3
+        assert joint.min() == 1 and joint.max() == 3
+        assert (joint >= single).all()  # same quantiles, shifted range
+
+    def test_engine_follows_scenario_rows(self):
+        from app.core.inventory_sim import BatchRolloutEngine, ScenarioBank
+
+        bank = ScenarioBank.for_single_sku(np.array([0.0, 5.0, 10.0]), horizon=4, n_scenarios=8)
+        engine = BatchRolloutEngine(
+            np.array([0.0, 5.0, 10.0]), 1.0, 10.0, 4, [0.0], 0.0,
+            rng=np.random.default_rng(0), bank=bank
+        )
+        stock, pipeline, day, cost = engine.empty_state(2)
+        stock[:] = 12.0
+        first = engine.rollout(stock, pipeline, day, cost, np.array([3, 3]))
+        again = engine.rollout(stock, pipeline, day, cost, np.array([3, 5]))
+
+        assert first[0] == first[1] == again[0]
+
+    def test_baseline_and_optimized_share_scenarios(self):
+        from app.core.inventory_sim import ScenarioBank, evaluate_policy
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        bank = ScenarioBank.for_single_sku(demand, horizon=10, n_scenarios=32)
+
+        baseline = evaluate_policy(bank, 20.0, 2.0, 20.0, 10, -np.inf, 0.0).mean()
+        never_orders = evaluate_policy(bank, 20.0, 2.0, 20.0, 10, -1.0, 50.0).mean()
+        optimized = evaluate_policy(bank, 20.0, 2.0, 20.0, 10, 15.0, 10.0).mean()
+
+        # A policy that never triggers sees exactly the baseline's demand paths
+        assert never_orders == pytest.approx(baseline)
+        assert optimized < baseline
+
+    def test_evaluation_bank_is_not_the_search_bank(self):
+        from app.agents.mcts_optimizer import _evaluate_group_solution
+        from app.config import get_settings
+        from app.core.inventory_sim import ScenarioBank, evaluate_joint_policy
+
+        eval_seed = get_settings().MCTS_EVAL_SEED
+        demands = {"A": np.random.default_rng(4).poisson(8, 60).astype(float)}
+        search = ScenarioBank(demands, horizon=10, n_scenarios=256, seed=42)
+        evaluation = ScenarioBank(demands, horizon=10, n_scenarios=500, seed=eval_seed)
+        assert eval_seed != 42
+        assert not np.array_equal(search.demand("A"), evaluation.demand("A")[:256])
+
+        # Search-time scenarios never reach the reported costs
+        solution = {"reorder_points": {"A": 8.0}, "order_quantities": {"A": 12.0}}
+        result = _evaluate_group_solution(solution, {"A": 10.0}, demands, {"A": 1.0}, {"A": 10.0}, 10, 500)
+        expected = evaluate_joint_policy(evaluation, ["A"], [10.0], [1.0], [10.0], 10, [8.0], [12.0])
+        assert result["optimized_cost"] == pytest.approx(float(expected.mean()))
+
+
+# ── Batched Policy Evaluation ──
+
+class TestPolicyEvaluation:
+    """Unit tests for inventory_sim.evaluate_policy / evaluate_joint_policy"""
+
+    def test_single_sku_matches_scalar_transition(self):
+        from app.agents.mcts_optimizer import InventoryState
+        from app.core.inventory_sim import ScenarioBank, evaluate_policy
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        bank = ScenarioBank.for_single_sku(demand, horizon=12, n_scenarios=6)
+        costs = evaluate_policy(bank, 20.0, 2.0, 20.0, 12, reorder_point=12.0, order_quantity=15.0)
+
+        for s in range(6):
+            state = InventoryState(current_stock=20.0, day=0)
+            for t in range(12):
+                qty = 15.0 if state.current_stock <= 12.0 else 0.0
+                state = state.transition(qty, bank.demand()[s, t], 2.0, 20.0, int(bank.lead_times()[s, t]))
+            assert costs[s] == pytest.approx(state.total_cost)
+
+    def test_joint_policy_matches_scalar_transition(self):
+        from app.agents.mcts_optimizer import _joint_policy_costs
+        from app.core.inventory_sim import ScenarioBank
+
+        rng = np.random.default_rng(2)
+        demands = {"A": rng.poisson(8, 40).astype(float), "B": rng.poisson(3, 40).astype(float)}
+        args = ({"A": 10.0, "B": 4.0}, demands, {"A": 1.0, "B": 2.0}, {"A": 10.0, "B": 30.0}, 8)
+        policy = ({"A": 9.0, "B": 4.0}, {"A": 16.0, "B": 6.0})
+        bank = ScenarioBank(demands, horizon=8, n_scenarios=5)
+
+        # Scalar reference: one scenario at a time through MultiInventoryState
+        from app.agents.mcts_optimizer import MultiInventoryState
+        lead = bank.lead_times("A", 1, 3)
+        expected = []
+        for s in range(5):
+            state = MultiInventoryState(sku_stocks=dict(args[0]), day=0)
+            for t in range(8):
+                in_transit = state.pipeline.in_transit()
+                trigger = state.sku_stocks["A"] + in_transit[0] <= 9.0 or state.sku_stocks["B"] + in_transit[1] <= 4.0
+                qtys = policy[1] if trigger else {"A": 0.0, "B": 0.0}
+                demand_t = {sku: bank.demand(sku)[s, t] for sku in ("A", "B")}
+                state = state.transition(qtys, demand_t, args[2], args[3], int(lead[s, t]))
+            expected.append(state.total_cost)
+
+        costs = _joint_policy_costs(bank, args[0], args[2], args[3], 8, *policy)
+        np.testing.assert_allclose(costs, expected)
+
+    def test_population_matches_individual_policies(self):
+        from app.core.inventory_sim import ScenarioBank, evaluate_policy, evaluate_joint_policy
+
+        rng = np.random.default_rng(3)
+        single = ScenarioBank.for_single_sku(rng.poisson(10, 60).astype(float), horizon=12, n_scenarios=20)
+        rps, qs = np.array([-np.inf, 8.0, 15.0]), np.array([0.0, 12.0, 20.0])
+        population = evaluate_policy(single, 20.0, 2.0, 20.0, 12, rps, qs)
+        assert population.shape == (3, 20)
+        for i in range(3):
+            np.testing.assert_allclose(population[i], evaluate_policy(single, 20.0, 2.0, 20.0, 12, rps[i], qs[i]))
+
+        demands = {"A": rng.poisson(8, 40).astype(float), "B": rng.poisson(3, 40).astype(float)}
+        joint = ScenarioBank(demands, horizon=10, n_scenarios=15)
+        args = (joint, ["A", "B"], [10.0, 4.0], [1.0, 2.0], [10.0, 30.0], 10)
+        rp, q = np.array([[9.0, 4.0], [5.0, 2.0]]), np.array([[16.0, 6.0], [8.0, 3.0]])
+        population = evaluate_joint_policy(*args, rp, q)
+        assert population.shape == (2, 15)
+        for i in range(2):
+            np.testing.assert_allclose(population[i], evaluate_joint_policy(*args, rp[i], q[i]))
+
+    def test_summaries_report_paired_savings(self):
+        from app.agents.mcts_optimizer import _evaluate_policies_worker
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        evaluation = _evaluate_policies_worker(5.0, demand, 2.0, 20.0, 20, 15.0, 12.0, replications=500)
+
+        savings = evaluation["savings"]
+        assert savings["replications"] == 500
+        assert savings["mean"] == pytest.approx(evaluation["baseline"]["mean"] - evaluation["optimized"]["mean"])
+        assert savings["mean"] > 3 * savings["std_error"] > 0
+        assert evaluation["optimized"]["p5"] <= evaluation["optimized"]["p50"] <= evaluation["optimized"]["p95"]
+
+
+# ── Policy Pre-solver ──
+
+class TestPolicyPresolver:
+    """Unit tests for policy_presolver.presolve / presolve_catalog"""
+
+    def test_catalog_matches_per_sku_solves(self):
+        from app.core.policy_presolver import presolve, presolve_catalog
+
+        rng = np.random.default_rng(0)
+        matrix = rng.poisson([[4.0], [20.0], [60.0]], (3, 120)).astype(float)
+        catalog = presolve_catalog(matrix, [1.0, 5.0, 2.0], [30.0, 50.0, 4.0])
+
+        for i, (h, p) in enumerate([(1.0, 30.0), (5.0, 50.0), (2.0, 4.0)]):
+            single = presolve(matrix[i], h, p)
+            assert catalog.reorder_point[i] == pytest.approx(single.reorder_point[0])
+            assert catalog.order_quantity[i] == pytest.approx(single.order_quantity[0])
+        # Higher critical ratio → more protection
+        assert catalog.safety_stock[1] > 0.0 and catalog.critical_ratio[1] > catalog.critical_ratio[2]
+
+    def test_policy_is_near_best_grid_policy(self):
+        from app.core.inventory_sim import ScenarioBank, evaluate_policy
+        from app.core.policy_presolver import presolve
+
+        demand = np.maximum(np.random.default_rng(1).normal(10, 3, 365), 0)
+        bank = ScenarioBank.for_single_sku(demand, horizon=30, n_scenarios=1000)
+        policy = presolve(demand, 5.0, 50.0)
+        cost = evaluate_policy(bank, 20.0, 5.0, 50.0, 30, policy.reorder_point[0], policy.order_quantity[0]).mean()
+        grid = min(
+            evaluate_policy(bank, 20.0, 5.0, 50.0, 30, s, q).mean()
+            for s in np.linspace(0, 40, 17) for q in np.linspace(2, 30, 15)
+        )
+        assert cost <= grid * 1.1
+        assert cost < evaluate_policy(bank, 20.0, 5.0, 50.0, 30, 15.0, 10.0).mean()  # old mean × 1.5 heuristic
+
+    def test_candidate_actions_and_cost_to_go(self):
+        from app.core.policy_presolver import presolve
+
+        policy = presolve(np.random.default_rng(2).poisson(10, 200).astype(float), 2.0, 20.0)
+        actions = policy.candidate_actions()[0]
+        assert actions[0] == 0.0 and len(actions) == 11
+        assert actions[1] <= policy.order_quantity[0] <= actions[-1]
+        assert actions[-1] - actions[1] == pytest.approx(4 * policy.std_demand[0])
+
+        stock = np.array([0.0, policy.base_stock[0], 5 * policy.base_stock[0]])
+        value = policy.cost_to_go(stock, 0.0, 30)
+        assert value[1] < value[0] and value[1] < value[2]
+        assert value[1] == pytest.approx(30 * policy.daily_cost[0])
+        assert policy.cost_to_go(stock, 0.0, 0).tolist() == [0.0, 0.0, 0.0]
+
+
+# ── Cross-entropy Policy Search ──
+
+class TestPolicySearch:
+    """Unit tests for policy_search.cross_entropy_search and the CEM engine"""
+
+    def test_minimizes_quadratic(self):
+        from app.core.policy_search import cross_entropy_search
+
+        target = np.array([3.0, -2.0])
+        result = cross_entropy_search(
+            lambda x: ((x - target) ** 2).sum(axis=1),
+            mean=[0.0, 0.0], std=[5.0, 5.0], lower=[-10.0, -10.0], upper=[10.0, 10.0],
+            max_generations=50, rng=np.random.default_rng(0)
+        )
+        np.testing.assert_allclose(result["params"], target, atol=0.1)
+        assert result["history"] == sorted(result["history"], reverse=True)
+        assert result["evaluations"] == 1 + 64 * result["generations"]
+
+    def test_cem_engine_matches_mcts_schema(self):
+        from app.agents.mcts_optimizer import _cem_worker, _mcts_worker
+        from app.core.inventory_sim import ScenarioBank, evaluate_policy
+        from app.core.policy_presolver import presolve
+
+        demand = np.random.default_rng(5).poisson(10, 120).astype(float)
+        cem = _cem_worker(20.0, demand, 2.0, 20.0, 30)
+        mcts = _mcts_worker(20.0, demand, 2.0, 20.0, 30, iterations=50)
+
+        assert cem["engine"] == "cem"
+        for key in ("reorder_point", "order_quantity", "safety_stock", "expected_cost",
+                    "explored_states", "rollouts", "computation_time_ms", "convergence_reason"):
+            assert key in mcts and key in cem
+
+        # Never worse than its pre-solved starting point on the search scenarios
+        bank = ScenarioBank.for_single_sku(demand, 30, 256, 42)
+        policy = presolve(demand, 2.0, 20.0)
+        start = evaluate_policy(bank, 20.0, 2.0, 20.0, 30, policy.reorder_point[0], policy.order_quantity[0]).mean()
+        assert cem["expected_cost"] <= start + 1e-9
+
+    def test_group_worker_cem_engine(self):
+        from app.agents.mcts_optimizer import _multi_sku_group_worker
+
+        rng = np.random.default_rng(6)
+        demands = {"A": rng.poisson(8, 60).astype(float), "B": rng.poisson(3, 60).astype(float)}
+        result = _multi_sku_group_worker(
+            {"A": 10.0, "B": 5.0}, demands, {"A": 2.0, "B": 2.0}, {"A": 20.0, "B": 20.0},
+            horizon=15, iterations=50, eval_replications=200, engine="cem"
+        )
+
+        assert result["solution"]["engine"] == "cem"
+        assert set(result["solution"]["reorder_points"]) == {"A", "B"}
+        assert result["optimized_cost"] < result["baseline_cost"]
+
+
+# ── Echelon Simulator ──
+
+class TestEchelonSimulator:
+    """Unit tests for inventory_sim.EchelonSimulator"""
+
+    def test_orders_when_position_hits_reorder_point(self):
+        from app.core.inventory_sim import EchelonSimulator
+
+        sim = EchelonSimulator(np.random.default_rng(0))
+        # Start with 15 on hand; demand 5/day; reorder 10 once the position drops below 5
+        orders = sim.simulate(np.full((3, 6), 5.0), reorder_point=4.0, order_quantity=10.0, lead_mean=1)
+
+        np.testing.assert_array_equal(orders[:, :2], 0.0)
+        np.testing.assert_array_equal(orders[:, 2], 10.0)  # 15 - 3 * 5 = 0 on day 2
+        assert orders.shape == (3, 6)
+
+    def test_rows_use_their_own_policy(self):
+        from app.core.inventory_sim import EchelonSimulator
+
+        sim = EchelonSimulator(np.random.default_rng(0))
+        orders = sim.simulate(
+            np.full((2, 20), 4.0), reorder_point=np.array([-1.0, 8.0]),
+            order_quantity=np.array([5.0, 12.0]), lead_mean=np.array([2, 4])
+        )
+
+        assert orders[0].sum() == 0.0
+        assert set(np.unique(orders[1])) == {0.0, 12.0}
+
+    def test_chain_feeds_each_tier_the_orders_below(self):
+        from app.core.inventory_sim import EchelonSimulator
+
+        demand = np.random.default_rng(4).poisson(10, (5, 40)).astype(float)
+        policies = np.array([[12.0, 14.0, 16.0], [-1.0, 14.0, 16.0]])
+        chain = EchelonSimulator(np.random.default_rng(1)).simulate_chain(
+            demand, policies, np.array([[15.0, 20.0, 25.0], [15.0, 20.0, 25.0]]), [2, 2, 3], 1.0, 10.0
+        )
+
+        assert chain["orders"].shape == (3, 2, 5, 40)
+        assert chain["cost"].shape == (2, 5)
+        # Tier 0 matches a stand-alone simulation on the same lead-time draws
+        alone = EchelonSimulator(np.random.default_rng(1)).simulate(demand, 12.0, 15.0, 2)
+        np.testing.assert_array_equal(chain["orders"][0, 0], alone)
+        # A retailer that never orders starves every tier above it
+        assert chain["orders"][:, 1].sum() == 0.0
+        np.testing.assert_allclose(chain["cost"], chain["tier_costs"].sum(axis=0))
+
+    def test_bullwhip_metrics_report_confidence_intervals(self):
+        from app.agents.mcts_optimizer import _echelon_worker
+
+        demand = np.random.default_rng(2).poisson(20, 120).astype(float)
+        metrics = _echelon_worker(
+            demand, {"reorder_point": 30.0, "order_quantity": 40.0}, replications=50
+        )
+
+        assert metrics["replications"] == 50
+        assert set(metrics["tiers"]) == {"retailer", "distributor", "wholesaler", "manufacturer"}
+        for tier in metrics["tiers"].values():
+            lo, hi = tier["before_ci"]
+            assert lo <= tier["before"] <= hi
+            lo, hi = tier["after_ci"]
+            assert lo <= tier["after"] <= hi
+            assert set(tier["policy"]) == {"reorder_point", "order_quantity"}
+        # The searched chain is never costlier than the naive one it is compared against
+        assert metrics["chain_cost"]["after"] <= metrics["chain_cost"]["before"]
+
+    def test_bullwhip_without_orders_reports_no_improvement(self):
+        from app.agents.mcts_optimizer import _echelon_worker
+
+        for demand in (np.zeros(30), np.array([])):
+            metrics = _echelon_worker(demand, {}, replications=10, time_budget_s=0.1)
+            assert metrics["before"] == 0.0
+            assert metrics["improvement_percentage"] == 0.0
+
+
+# ── Array-backed Tree ──
+
+class TestTreeStore:
+    """Unit tests for mcts_tree.TreeStore"""
+
+    def test_expansion_advances_untried_cursor(self):
+        from app.core.mcts_tree import TreeStore, ROOT
+
+        tree = TreeStore(n_base_actions=2)
+        assert not tree.is_fully_expanded(ROOT)
+
+        first = tree.add_child(ROOT, tree.next_untried_action(ROOT))
+        second = tree.add_child(ROOT, tree.next_untried_action(ROOT))
+
+        assert tree.is_fully_expanded(ROOT)
+        assert list(tree.children(ROOT)) == [second, first]
+        assert tree.parent[first] == ROOT
+        assert tree.action[second] == 1
+
+    def test_widened_action_does_not_touch_cursor(self):
+        from app.core.mcts_tree import TreeStore, ROOT
+
+        tree = TreeStore(n_base_actions=1)
+        tree.add_child(ROOT, 0)
+        tree.add_child(ROOT, 5)
+
+        assert tree.next_untried[ROOT] == 1
+        assert tree.n_children[ROOT] == 2
+
+    def test_grows_geometrically(self):
+        from app.core.mcts_tree import TreeStore, ROOT
+
+        tree = TreeStore(n_base_actions=1, capacity=4)
+        node = ROOT
+        for _ in range(10):
+            node = tree.add_child(node, 0)
+
+        assert len(tree) == 11
+        assert tree.capacity == 16
+        assert tree.path_to_root(node)[-1] == ROOT
+
+    def test_best_child_prefers_unvisited_then_ucb(self):
+        from app.core.mcts_tree import TreeStore, ROOT
+
+        tree = TreeStore(n_base_actions=3)
+        a, b, c = (tree.add_child(ROOT, i) for i in range(3))
+        tree.backpropagate([[ROOT, a], [ROOT, b]], np.array([0.9, 0.1]))
+
+        assert tree.best_child(ROOT) == c
+
+        tree.backpropagate([[ROOT, c]], np.array([0.1]))
+        assert tree.best_child(ROOT) == a
+        assert tree.visits[ROOT] == 3
+        assert tree.total_reward[ROOT] == pytest.approx(1.1)
+
+
+    def test_merge_root_stats_sums_and_reports_agreement(self):
+        from app.core.mcts_tree import merge_root_stats
+
+        merged = merge_root_stats([
+            {"actions": [0.0, 5.0], "visits": [10, 30], "total_reward": [5.0, 24.0]},
+            {"actions": [0.0, 5.0, 7.5], "visits": [25, 20, 1], "total_reward": [15.0, 16.0, 0.5]},
+            {"actions": [], "visits": [], "total_reward": []},
+        ])
+
+        assert merged["best_action"] == 5.0
+        assert merged["visits"] == [35, 50, 1]
+        assert merged["agreement"] == pytest.approx(0.5)
+
+
+# ── Transposition Table ──
+
+class TestTranspositionTable:
+    """Unit tests for mcts_tree.TranspositionTable"""
+
+    def test_equivalent_states_share_key(self):
+        from app.core.mcts_tree import TranspositionTable
+
+        table = TranspositionTable(max_entries=8, quantum=2.0)
+        a = table.state_key(3, 4.5, np.array([0.0, 1.0, 3.9, 0.0]))
+        b = table.state_key(3, 5.9, np.array([0.0, 1.5, 2.0, 0.0]))
+        c = table.state_key(4, 5.9, np.array([0.0, 1.5, 2.0, 0.0]))
+
+        assert a == b
+        assert a != c
+
+    def test_lookup_merges_richer_statistics(self):
+        from app.core.mcts_tree import TranspositionTable
+
+        table = TranspositionTable(max_entries=8)
+        key = table.state_key(0, 10.0, np.zeros(4))
+        table.update([(key, 0), (key, 1)], 0.8)
+        table.update([(key, 0)], 0.4)
+
+        visits, rewards = table.lookup(key, np.array([0, 1, 2]), np.array([1, 5, 0]), np.array([0.1, 2.0, 0.0]))
+
+        np.testing.assert_array_equal(visits, [2, 5, 0])
+        np.testing.assert_allclose(rewards, [1.2, 2.0, 0.0])
+        assert table.hits == 2 and table.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        from app.core.mcts_tree import TranspositionTable
+
+        table = TranspositionTable(max_entries=2)
+        table.update([("s", 0)], 1.0)
+        table.update([("s", 1)], 1.0)
+        table.lookup("s", np.array([0]), np.zeros(1), np.zeros(1))  # touch (s, 0)
+        table.update([("s", 2)], 1.0)
+
+        assert len(table) == 2
+        assert table.evictions == 1
+        visits, _ = table.lookup("s", np.array([0, 1]), np.zeros(2), np.zeros(2))
+        np.testing.assert_array_equal(visits, [1, 0])
+
+    def test_worker_reports_table_usage(self):
+        from app.agents.mcts_optimizer import _mcts_worker
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        result = _mcts_worker(20.0, demand, 2.0, 20.0, horizon=10, iterations=300, seed=7, transposition_entries=5000)
+
+        assert result["transpositions"]["entries"] > 0
+        assert result["transpositions"]["hits"] > 0
+        assert _mcts_worker(20.0, demand, 2.0, 20.0, 10, 50)["transpositions"] is None
+
+
+# ── MCTS Workers ──
+
+class TestMCTSWorker:
+    """Unit tests for the single-SKU MCTS worker"""
+
+    def test_worker_returns_action_from_batched_search(self):
+        from app.agents.mcts_optimizer import _mcts_worker
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        result = _mcts_worker(20.0, demand, 2.0, 20.0, horizon=10, iterations=100, seed=7)
+
+        assert 0.0 <= result["order_quantity"] <= float(np.mean(demand)) * 3 + 1e-9
+        assert result["rollouts"] > 0
+        assert result["expected_cost"] >= 0.0
+
+    def test_root_parallel_merge_combines_worker_statistics(self):
+        from app.agents.mcts_optimizer import _mcts_worker, _merge_root_parallel
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        results = [_mcts_worker(20.0, demand, 2.0, 20.0, 10, 100, seed=s) for s in (1, 2, 3)]
+        merged = _merge_root_parallel(results)
+
+        assert merged["parallel_searches"] == 3
+        assert 0.0 < merged["search_agreement"] <= 1.0
+        assert merged["rollouts"] == sum(r["rollouts"] for r in results)
+        assert merged["order_quantity"] in merged["root_stats"]["actions"]
+
+    def test_multi_sku_worker_returns_quantity_per_sku(self):
+        from app.agents.mcts_optimizer import _multi_sku_mcts_worker
+
+        rng = np.random.default_rng(2)
+        demands = {"A": rng.poisson(10, 30).astype(float), "B": rng.poisson(5, 30).astype(float)}
+        result = _multi_sku_mcts_worker(
+            {"A": 20.0, "B": 10.0}, demands, {"A": 1.0, "B": 1.0}, {"A": 10.0, "B": 10.0},
+            horizon=5, iterations=50, seed=3
+        )
+
+        assert set(result["order_quantities"]) == {"A", "B"}
+        assert result["tree_nodes"] > 1
+
+    def test_factored_search_covers_large_groups(self):
+        from app.agents.mcts_optimizer import _multi_sku_mcts_worker
+        from app.core.policy_presolver import presolve
+
+        rng = np.random.default_rng(3)
+        skus = [f"S{i}" for i in range(8)]  # 3^8 = 6561 joint combinations
+        demands = {sku: rng.poisson(5 + i, 30).astype(float) for i, sku in enumerate(skus)}
+        result = _multi_sku_mcts_worker(
+            {sku: 5.0 for sku in skus}, demands,
+            {sku: 1.0 for sku in skus}, {sku: 10.0 for sku in skus},
+            horizon=5, iterations=100, seed=3
+        )
+
+        assert set(result["order_quantities"]) == set(skus)
+        # One node per sub-decision: the tree grows with group size, not the joint product
+        assert result["tree_nodes"] <= result["explored_states"] + 1
+        for sku in skus:
+            unit = float(presolve(demands[sku], 1.0, 10.0, lead_low=1, lead_high=3).order_quantity[0])
+            assert 0.0 <= result["order_quantities"][sku] <= 2.0 * unit + 1e-9
+
+    def test_truncated_multi_sku_rollouts(self):
+        from app.agents.mcts_optimizer import _multi_sku_mcts_worker
+
+        rng = np.random.default_rng(6)
+        demands = {"A": rng.poisson(8, 60).astype(float), "B": rng.poisson(3, 60).astype(float)}
+        args = ({"A": 10.0, "B": 5.0}, demands, {"A": 2.0, "B": 2.0}, {"A": 20.0, "B": 20.0})
+        full = _multi_sku_mcts_worker(*args, horizon=120, iterations=100, seed=1, time_budget_s=10.0)
+        truncated = _multi_sku_mcts_worker(
+            *args, horizon=120, iterations=100, seed=1, time_budget_s=10.0, rollout_depth=10
+        )
+
+        assert set(truncated["order_quantities"]) == {"A", "B"}
+        assert truncated["explored_states"] > 0
+        assert truncated["computation_time_ms"] < full["computation_time_ms"]
+
+    def test_presolved_groups_match_worker_shape(self):
+        from app.agents.mcts_optimizer import _presolved_group_results, _multi_sku_group_worker
+
+        rng = np.random.default_rng(4)
+        groups = [
+            {
+                "stocks": {"A": 10.0, "B": 4.0},
+                "demands": {"A": rng.poisson(6, 40).astype(float), "B": rng.poisson(2, 40).astype(float)},
+                "holding_costs": {"A": 1.0, "B": 1.0},
+                "stockout_costs": {"A": 10.0, "B": 10.0}
+            },
+            {
+                "stocks": {"C": 30.0},
+                "demands": {"C": rng.poisson(15, 40).astype(float)},
+                "holding_costs": {"C": 2.0},
+                "stockout_costs": {"C": 20.0}
+            }
+        ]
+        results = _presolved_group_results(groups, horizon=10, eval_replications=200)
+        searched = _multi_sku_group_worker(
+            groups[0]["stocks"], groups[0]["demands"], groups[0]["holding_costs"], groups[0]["stockout_costs"],
+            horizon=10, iterations=50, time_budget_s=2.0, eval_replications=200
+        )
+
+        assert len(results) == 2
+        assert set(results[0]) == set(searched)
+        assert set(results[0]["solution"]["order_quantities"]) == {"A", "B"}
+        assert set(results[1]["solution"]["reorder_points"]) == {"C"}
+        for result in results:
+            assert result["optimized_cost"] < result["baseline_cost"]
+
+    def test_group_worker_evaluates_costs_in_worker(self):
+        from app.agents.mcts_optimizer import _multi_sku_group_worker
+
+        rng = np.random.default_rng(4)
+        demands = {"A": rng.poisson(8, 30).astype(float), "B": rng.poisson(4, 30).astype(float)}
+        result = _multi_sku_group_worker(
+            {"A": 16.0, "B": 8.0}, demands, {"A": 1.0, "B": 1.0}, {"A": 10.0, "B": 10.0},
+            horizon=5, iterations=20, seed=5
+        )
+
+        assert set(result) == {"solution", "baseline_cost", "optimized_cost", "evaluation"}
+        assert result["baseline_cost"] >= 0.0
+        assert result["evaluation"]["savings"]["mean"] == pytest.approx(result["baseline_cost"] - result["optimized_cost"])
+
+
+# ── Anytime Search ──
+
+class TestAnytimeSearch:
+    """Unit tests for the anytime budget and progress channel"""
+
+    def test_worker_streams_best_action_through_channel(self):
+        import queue
+        from app.agents.mcts_optimizer import _mcts_worker
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        channel = queue.Queue()
+        result = _mcts_worker(
+            20.0, demand, 2.0, 20.0, horizon=10, iterations=400, seed=7,
+            progress=channel, progress_every=64, search_id=2
+        )
+
+        updates = []
+        while not channel.empty():
+            updates.append(channel.get_nowait())
+        assert len(updates) >= 2
+        assert all(u["search"] == 2 for u in updates)
+        assert updates[-1]["iterations"] > updates[0]["iterations"]
+        assert updates[-1]["best_action"] in updates[-1]["root_visits"]["actions"]
+        assert result["convergence_reason"] in ("confidence_threshold", "iteration_budget")
+
+    def test_zero_budget_stops_immediately(self):
+        from app.agents.mcts_optimizer import _multi_sku_mcts_worker
+
+        demands = {"A": np.full(20, 5.0), "B": np.full(20, 3.0)}
+        result = _multi_sku_mcts_worker(
+            {"A": 5.0, "B": 3.0}, demands, {"A": 1.0, "B": 1.0}, {"A": 10.0, "B": 10.0},
+            horizon=5, iterations=1000, time_budget_s=0.0
+        )
+
+        assert result["explored_states"] == 0
+
+    def test_shutdown_stops_pool_and_progress_manager(self):
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        agent = MCTSOptimizerAgent()
+        pool = agent._pool
+        agent._progress_channel()
+        manager = agent._progress_manager
+        agent.shutdown(wait=True)
+
+        assert agent._pool is None and agent._progress_manager is None
+        assert pool._shutdown_thread
+        assert not manager._process.is_alive()
+        agent.shutdown()  # idempotent
+
+    @pytest.mark.asyncio
+    async def test_relay_publishes_every_update(self):
+        import asyncio
+        import queue
+        from unittest.mock import AsyncMock, patch
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        agent = MCTSOptimizerAgent.__new__(MCTSOptimizerAgent)
+        agent.name = "MCTSOptimizer"
+        channel = queue.Queue()
+        for i in range(3):
+            channel.put({"search": 0, "iterations": 100 * i, "elapsed_ms": 500.0 * i})
+        done = asyncio.Event()
+        done.set()
+
+        with patch("app.agents.mcts_optimizer.streaming_service.publish_agent_progress", new_callable=AsyncMock) as publish:
+            relayed = await agent._relay_progress(channel, "s1", 1.0, done)
+
+        assert relayed == 3
+        assert publish.await_args_list[-1].args[2] == pytest.approx(90.0)
+
+
+# ── Optimizer Cache ──
+
+class TestOptimizerCache:
+    """Unit tests for optimizer_cache.OptimizerCache (disk backend)"""
+
+    def test_fingerprint_tracks_data_and_parameters(self):
+        from app.core.optimizer_cache import OptimizerCache
+
+        demand = np.arange(10, dtype=float)
+        key = OptimizerCache.fingerprint([demand], horizon=30, holding_cost=5)
+
+        assert key == OptimizerCache.fingerprint([demand.copy()], holding_cost=5, horizon=30)
+        assert key != OptimizerCache.fingerprint([demand], horizon=31, holding_cost=5)
+        assert key != OptimizerCache.fingerprint([demand + 1], horizon=30, holding_cost=5)
+
+    @pytest.mark.asyncio
+    async def test_exact_hit_warm_start_and_miss(self, tmp_path):
+        from app.core.optimizer_cache import OptimizerCache
+
+        cache = OptimizerCache(max_entries=8, cache_dir=str(tmp_path))
+        await cache.store("exact", {"order_quantity": np.float64(12.5)}, "warm", {"root_stats": {"actions": [1.0]}})
+
+        assert await cache.lookup("exact", "warm") == ({"order_quantity": 12.5}, None)
+        assert await cache.lookup("other", "warm") == (None, {"root_stats": {"actions": [1.0]}})
+        assert await cache.lookup("other", "cold") == (None, None)
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["warm_starts"], stats["misses"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_disk_backend_evicts_least_recently_used(self, tmp_path):
+        import os
+        from app.core.optimizer_cache import OptimizerCache
+
+        cache = OptimizerCache(max_entries=2, cache_dir=str(tmp_path))
+        await cache.store("a", {"v": 1})
+        await cache.store("b", {"v": 2})
+        os.utime(tmp_path / "a.json", (1, 1))
+        await cache.store("c", {"v": 3})
+
+        assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_group_cache_hit_keeps_integer_sku_labels(self, tmp_path):
+        from unittest.mock import patch
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+        from app.core.optimizer_cache import OptimizerCache
+
+        cache = OptimizerCache(cache_dir=str(tmp_path))
+        agent = MCTSOptimizerAgent()
+        group = {
+            "stocks": {104: 10.0, 205: 4.0},
+            "demands": {104: np.full(20, 5.0), 205: np.full(20, 2.0)},
+            "holding_costs": {104: 1.0, 205: 1.0}, "stockout_costs": {104: 10.0, 205: 10.0},
+            "cache_key": "int-skus"
+        }
+        try:
+            with patch("app.agents.mcts_optimizer.optimizer_cache", cache):
+                [fresh] = await agent._run_group_searches([group], horizon=5, iterations=10)
+                [cached] = await agent._run_group_searches([group], horizon=5, iterations=10)
+        finally:
+            agent.shutdown()
+
+        assert cache.hits == 1
+        assert set(cached["solution"]["order_quantities"]) == {104, 205}
+        assert cached["solution"]["order_quantities"][104] == pytest.approx(fresh["solution"]["order_quantities"][104])
+
+    def test_seed_root_warm_starts_search(self):
+        from app.agents.mcts_optimizer import _mcts_worker
+        from app.core.mcts_tree import TreeStore, ROOT, seed_root
+
+        tree = TreeStore(n_base_actions=2)
+        table = [0.0, 5.0]
+        prior = {"actions": [5.0, 7.5], "visits": [30, 10], "total_reward": [24.0, 5.0]}
+        seeded = seed_root(tree, table, prior, max_visits=20)
+
+        assert seeded == 20 and tree.visits[ROOT] == 20
+        assert table == [0.0, 5.0, 7.5]
+        assert tree.mean_reward(tree.children(ROOT))[0] == pytest.approx(0.5)  # 7.5, newest first
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        cold = _mcts_worker(20.0, demand, 2.0, 20.0, 10, 100, seed=7)
+        warm = _mcts_worker(20.0, demand, 2.0, 20.0, 12, 100, seed=7, warm_start=cold["root_stats"])
+        assert 0 < warm["warm_start_visits"] <= 50
+
+    @pytest.mark.asyncio
+    async def test_root_parallel_counts_the_prior_once(self):
+        from unittest.mock import AsyncMock, patch
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent, _mcts_worker
+
+        demand = np.random.default_rng(1).poisson(10, 60).astype(float)
+        prior = _mcts_worker(20.0, demand, 2.0, 20.0, 10, 200, seed=7)["root_stats"]
+        agent = MCTSOptimizerAgent()
+        try:
+            with patch("app.agents.mcts_optimizer.optimizer_cache.lookup", AsyncMock(return_value=(None, {"root_stats": prior}))), \
+                 patch("app.agents.mcts_optimizer.optimizer_cache.store", AsyncMock()):
+                result = await agent._run_mcts(20.0, demand, 2.0, 20.0, 10, 100, parallel_searches=3)
+        finally:
+            agent.shutdown()
+
+        assert result["cache"] == "warm_start" and result["warm_start_visits"] > 0
+        assert sum(result["root_stats"]["visits"]) == result["rollouts"] + result["warm_start_visits"]
+
+
+# ── Shared-memory Demand Transport ──
+
+class TestSharedDemandMatrix:
+    """Unit tests for shared_demand.SharedDemandMatrix"""
+
+    def test_ref_round_trips_scaled_row(self):
+        import pickle
+        from app.core.shared_demand import SharedDemandMatrix, resolve_demand
+
+        matrix = np.arange(12, dtype=float).reshape(3, 4)
+        with SharedDemandMatrix(matrix, ["A", "B", "C"]) as shared:
+            ref = pickle.loads(pickle.dumps(shared.ref("B", scale=2.0)))
+            np.testing.assert_array_equal(resolve_demand(ref), matrix[1] * 2.0)
+            np.testing.assert_array_equal(resolve_demand(matrix[2]), matrix[2])
+
+    def test_segment_is_unlinked_on_exit(self):
+        from multiprocessing import shared_memory
+        from app.core.shared_demand import SharedDemandMatrix
+
+        with SharedDemandMatrix(np.ones(5)) as shared:
+            name = shared.handle.name
+        shared.close()  # idempotent
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+# ── SKU Co-occurrence Mining ──
+
+class TestCooccurrenceMiner:
+    """Unit tests for cooccurrence.mine_associations"""
+
+    @staticmethod
+    def _reference(df, min_support=0.1):
+        """The per-transaction pair loop the sparse miner replaced."""
+        import itertools
+        from collections import defaultdict
+        transactions = df.groupby("date")["sku"].apply(set).tolist()
+        item_counts, pair_counts = defaultdict(int), defaultdict(int)
+        for tx in transactions:
+            for item in tx:
+                item_counts[item] += 1
+            for a, b in itertools.combinations(sorted(tx), 2):
+                pair_counts[(a, b)] += 1
+        n = len(transactions)
+        rules = {}
+        for (a, b), count in pair_counts.items():
+            if count / n >= min_support:
+                rules[(a, b)] = (count / n, count / item_counts[a], (count / n) / ((item_counts[a] / n) * (item_counts[b] / n)))
+        return rules
+
+    def _sample(self, n_rows=3000, n_skus=40, n_days=200):
+        import pandas as pd
+        rng = np.random.default_rng(0)
+        return pd.DataFrame({
+            "date": rng.integers(0, n_days, n_rows),
+            "sku": [f"SKU-{k:03d}" for k in rng.zipf(1.5, n_rows) % n_skus]
+        })
+
+    def test_matches_pair_loop(self):
+        from app.core.cooccurrence import mine_associations
+
+        df = self._sample()
+        rules = mine_associations(df["date"], df["sku"], min_support=0.1)
+        expected = self._reference(df)
+
+        assert {(r["antecedent"][0], r["consequent"][0]) for r in rules} == set(expected)
+        for r in rules:
+            support, confidence, lift = expected[(r["antecedent"][0], r["consequent"][0])]
+            assert r["support"] == pytest.approx(support)
+            assert r["confidence"] == pytest.approx(confidence)
+            assert r["lift"] == pytest.approx(lift)
+        lifts = [r["lift"] for r in rules]
+        assert lifts == sorted(lifts, reverse=True)
+
+    def test_top_k_and_lift_filter(self):
+        from app.core.cooccurrence import mine_associations
+
+        df = self._sample()
+        rules = mine_associations(df["date"], df["sku"], min_support=0.05)
+        top = mine_associations(df["date"], df["sku"], min_support=0.05, top_k=5)
+        assert len(rules) > 5
+        assert [r["lift"] for r in top] == pytest.approx([r["lift"] for r in rules[:5]])
+
+        floor = rules[len(rules) // 2]["lift"]
+        lifted = mine_associations(df["date"], df["sku"], min_support=0.05, min_lift=floor)
+        assert lifted and all(r["lift"] >= floor for r in lifted)
+
+    def test_missing_values_and_empty_input(self):
+        import pandas as pd
+        from app.core.cooccurrence import mine_associations
+
+        df = pd.DataFrame({"date": [1, 1, 2, 2, None], "sku": ["A", "B", "A", None, "B"]})
+        rules = mine_associations(df["date"], df["sku"], min_support=0.1)
+        assert rules == [{"antecedent": ["A"], "consequent": ["B"], "support": 0.5, "confidence": 0.5, "lift": 1.0}]
+        assert mine_associations(pd.Series([], dtype=float), pd.Series([], dtype=object)) == []
+
+
+# ── Group Scheduler ──
+
+class TestGroupScheduler:
+    """Unit tests for MCTSOptimizerAgent._run_group_searches"""
+
+    @pytest.mark.asyncio
+    async def test_groups_past_deadline_come_back_empty(self):
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        agent = MCTSOptimizerAgent()
+        group = {
+            "stocks": {"A": 10.0}, "demands": {"A": np.full(20, 5.0)},
+            "holding_costs": {"A": 1.0}, "stockout_costs": {"A": 10.0}
+        }
+        try:
+            results = await agent._run_group_searches([group, group], horizon=5, iterations=10, deadline_s=0.0)
+            assert results == [None, None]
+
+            results = await agent._run_group_searches([group, group], horizon=5, iterations=10, deadline_s=60.0)
+            assert all(r is not None and "baseline_cost" in r for r in results)
+        finally:
+            agent.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_running_search_stops_at_the_deadline(self):
+        import time
+        from unittest.mock import patch
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        with patch("app.agents.mcts_optimizer.settings.MCTS_POOL_WORKERS", 1):
+            agent = MCTSOptimizerAgent()
+        rng = np.random.default_rng(0)
+        group = {
+            "stocks": {"A": 10.0, "B": 5.0}, "demands": {"A": rng.poisson(8, 60).astype(float), "B": rng.poisson(4, 60).astype(float)},
+            "holding_costs": {"A": 1.0, "B": 1.0}, "stockout_costs": {"A": 10.0, "B": 10.0}
+        }
+        try:
+            await agent._run_group_searches(
+                [group], horizon=30, iterations=10 ** 7, deadline_s=0.5, time_budget_s=30.0, use_cache=False
+            )
+            # The only worker must be free long before the 30s search budget runs out
+            start = time.time()
+            agent._pool.submit(int).result()
+            assert time.time() - start < 10.0
+        finally:
+            agent.shutdown()
+
+
+# ── What-if Sweep ──
+
+class TestParameterSweep:
+    """Unit tests for the optimizer's sweep mode"""
+
+    def test_sweep_worker_covers_grid(self):
+        from app.agents.mcts_optimizer import _sweep_worker
+
+        demand = np.random.default_rng(7).poisson(10, 120).astype(float)
+        points = [(2.0, 20.0, 15), (2.0, 40.0, 15), (2.0, 20.0, 45)]
+        rows = _sweep_worker(points, 20.0, demand, eval_replications=300)
+
+        assert [(r["holding_cost"], r["stockout_cost"], r["horizon"]) for r in rows] == points
+        assert all(r["optimized_cost"] < r["baseline_cost"] for r in rows)
+        # Same bank for every point: doubling the stockout cost raises the baseline, a longer horizon too
+        assert rows[1]["baseline_cost"] > rows[0]["baseline_cost"]
+        assert rows[2]["baseline_cost"] > rows[0]["baseline_cost"]
+        assert rows[1]["reorder_point"] > rows[0]["reorder_point"]
+
+    def test_group_sweep_matches_quick_mode(self):
+        from app.agents.mcts_optimizer import _group_sweep_worker, _presolved_group_results
+
+        rng = np.random.default_rng(8)
+        groups = [
+            {"stocks": {"A": 10.0, "B": 4.0}, "demands": {"A": rng.poisson(6, 40).astype(float), "B": rng.poisson(2, 40).astype(float)}},
+            {"stocks": {"C": 30.0}, "demands": {"C": rng.poisson(15, 40).astype(float)}}
+        ]
+        [row] = _group_sweep_worker([(1.0, 10.0, 12)], groups, eval_replications=200)
+        priced = [
+            dict(g, holding_costs={sku: 1.0 for sku in g["stocks"]}, stockout_costs={sku: 10.0 for sku in g["stocks"]})
+            for g in groups
+        ]
+        quick = _presolved_group_results(priced, horizon=12, eval_replications=200)
+
+        assert row["baseline_cost"] == pytest.approx(sum(r["baseline_cost"] for r in quick))
+        assert row["optimized_cost"] == pytest.approx(sum(r["optimized_cost"] for r in quick))
+
+    @pytest.mark.asyncio
+    async def test_sweep_mode_returns_cost_surface(self):
+        import pandas as pd
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+        from app.agents.base_agent import AgentRequest
+
+        demand = np.random.default_rng(9).poisson(10, 40)
+        df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=40).astype(str), "sales": demand})
+        agent = MCTSOptimizerAgent()
+        try:
+            response = await agent.process(AgentRequest(
+                query="what if",
+                context={"dataset": df.to_dict("records")},
+                parameters={
+                    "mode": "sweep", "eval_replications": 200,
+                    "sweep": {"holding_cost": [1, 2], "stockout_cost": [10, 20, 40], "horizon": [10]}
+                }
+            ))
+            assert response.success, response.error
+            sweep = response.data["sweep"]
+            assert len(sweep["rows"]) == 6
+            assert sweep["columns"][:3] == ["holding_cost", "stockout_cost", "horizon"]
+            assert sweep["rows"][0][:3] == [1.0, 10.0, 10]
+            assert agent.evaluate_output(response.data, None) == (1.0, [])  # no reasoning retry
+
+            too_big = await agent.process(AgentRequest(
+                query="what if",
+                context={"dataset": df.to_dict("records")},
+                parameters={"mode": "sweep", "sweep": {"horizon": list(range(1, 1000))}}
+            ))
+            assert not too_big.success
+        finally:
+            agent.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_multi_sku_sweep_rejects_cem_engine(self):
+        import pandas as pd
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+        from app.agents.base_agent import AgentRequest
+
+        rng = np.random.default_rng(9)
+        dates = pd.date_range("2024-01-01", periods=30).astype(str)
+        df = pd.DataFrame([{"date": d, "sku": sku, "sales": float(rng.poisson(5))} for d in dates for sku in ("A", "B")])
+        agent = MCTSOptimizerAgent()
+        try:
+            response = await agent.process(AgentRequest(
+                query="what if",
+                context={"dataset": df.to_dict("records")},
+                parameters={"mode": "sweep", "engine": "cem", "sweep": {"holding_cost": [1, 2]}}
+            ))
+            assert not response.success
+            assert "cem" in response.error and "single-SKU" in response.error
+        finally:
+            agent.shutdown()
+
+
+# ── Singleton Batch ──
+
+class TestSingletonBatch:
+    """Unit tests for the independent batch path for unassociated SKUs"""
+
+    def test_independent_evaluation_matches_singleton_groups(self):
+        from app.core.inventory_sim import ScenarioBank, evaluate_joint_policy, evaluate_independent_policies
+
+        rng = np.random.default_rng(10)
+        demands = {"A": rng.poisson(8, 60).astype(float), "B": rng.poisson(3, 60).astype(float)}
+        bank = ScenarioBank(demands, 20, 300, seed=3)
+        costs = evaluate_independent_policies(bank, ["A", "B"], [15, 5], [1, 2], [10, 30], 20, [12, 4], [20, 6])
+
+        assert costs.shape == (300, 2)
+        for j, (sku, stock, h, p, s, q) in enumerate([("A", 15, 1, 10, 12, 20), ("B", 5, 2, 30, 4, 6)]):
+            alone = ScenarioBank({sku: demands[sku]}, 20, 300, seed=3)
+            np.testing.assert_array_equal(costs[:, j], evaluate_joint_policy(alone, [sku], [stock], [h], [p], 20, [s], [q]))
+
+    def test_batched_search_solves_each_problem(self):
+        from app.core.policy_search import batched_cross_entropy_search
+
+        targets = np.array([[1.0, 5.0], [8.0, 2.0], [4.0, 4.0]])
+        result = batched_cross_entropy_search(
+            lambda x: ((x - targets) ** 2).sum(axis=2),
+            mean=np.zeros((3, 2)), std=np.full((3, 2), 4.0),
+            lower=np.zeros((3, 2)), upper=np.full((3, 2), 10.0),
+            max_generations=60, rng=np.random.default_rng(0)
+        )
+        np.testing.assert_allclose(result["params"], targets, atol=0.2)
+        assert result["cost"].shape == (3,)
+
+    def test_form_groups_keeps_unassociated_skus_alone(self):
+        import pandas as pd
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        df = pd.DataFrame({"sku": ["A", "B", "C", "D", "E"]})
+        rules = [
+            {"antecedent": ["A"], "consequent": ["B"], "lift": 1.5},
+            {"antecedent": ["C"], "consequent": ["D"], "lift": 1.0}
+        ]
+        agent = MCTSOptimizerAgent.__new__(MCTSOptimizerAgent)
+
+        assert agent._form_sku_groups(df, "sku", rules) == [["A", "B"], ["C", "D"], ["E"]]
+        assert agent._form_sku_groups(df, "sku", rules, pair_remaining=False, min_lift=1.1) == [
+            ["A", "B"], ["C"], ["D"], ["E"]
+        ]
+
+    def test_batch_worker_returns_group_shaped_results(self):
+        from app.agents.mcts_optimizer import _singleton_batch_worker, _presolved_group_results
+
+        rng = np.random.default_rng(11)
+        skus = [f"S{i}" for i in range(5)]
+        inputs = {
+            "sku_stocks": {sku: 10.0 for sku in skus},
+            "sku_demands": {sku: rng.poisson(4 + i, 50).astype(float) for i, sku in enumerate(skus)},
+            "holding_costs": {sku: 1.0 for sku in skus},
+            "stockout_costs": {sku: 20.0 for sku in skus}
+        }
+        quick = _singleton_batch_worker(**inputs, horizon=15, eval_replications=200, search=False, chunk_size=2)
+        singletons = [
+            {"stocks": {sku: 10.0}, "demands": {sku: inputs["sku_demands"][sku]},
+             "holding_costs": {sku: 1.0}, "stockout_costs": {sku: 20.0}}
+            for sku in skus
+        ]
+        reference = _presolved_group_results(singletons, horizon=15, eval_replications=200)
+
+        assert [list(r["solution"]["order_quantities"]) for r in quick] == [[sku] for sku in skus]
+        for batched, alone in zip(quick, reference):
+            assert batched["baseline_cost"] == pytest.approx(alone["baseline_cost"])
+            assert batched["optimized_cost"] == pytest.approx(alone["optimized_cost"])
+
+        searched = _singleton_batch_worker(**inputs, horizon=15, eval_replications=200, time_budget_s=10.0)
+        assert sum(r["optimized_cost"] for r in searched) <= sum(r["optimized_cost"] for r in quick) * 1.05
+
+
+# ── Forecast-driven Demand ──
+
+class TestForecastDemand:
+    """Unit tests for MCTSOptimizerAgent._forecast_demand_matrix"""
+
+    def test_follows_per_sku_forecasts(self):
+        import pandas as pd
+        from app.agents.mcts_optimizer import MCTSOptimizerAgent
+
+        rng = np.random.default_rng(5)
+        pivoted = pd.DataFrame({101: rng.poisson(10, 60).astype(float), 102: rng.poisson(3, 60).astype(float)})
+        agent = MCTSOptimizerAgent.__new__(MCTSOptimizerAgent)
+
+        demand = agent._forecast_demand_matrix(pivoted, {"101": [20.0] * 14, "102": [1.0] * 14})
+        assert list(demand.columns) == [101, 102] and len(demand) == 14
+        assert demand[101].mean() == pytest.approx(20.0)
+        assert demand[101].std() == pytest.approx(pivoted[101].values[-14:].std(ddof=1))
+        assert (demand[102] >= 0).all()
+
+        # Without a forecast for every SKU the history is used unchanged
+        assert agent._forecast_demand_matrix(pivoted, {"101": [20.0] * 14}) is pivoted
+        assert agent._forecast_demand_matrix(pivoted, {}) is pivoted